@@ -0,0 +1,5 @@
+"""
+Benchmarks for the Expressora Python server.
+Run from backend/python, e.g. `python -m benchmarks.bench_lexicon` or
+`python -m benchmarks.load_test`; load test results go to benchmarks/results/.
+"""
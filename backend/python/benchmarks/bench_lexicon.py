@@ -0,0 +1,77 @@
+"""
+Microbenchmark for the compiled lexicon used by the local translators.
+
+Measures single-gloss lookups over the full label set, phrase segmentation and
+GrammarEngine sentences at growing sequence lengths (cost per gloss should stay
+flat), and compares against the previous approach of rebuilding a word map on
+every call.
+
+Usage (from backend/python):
+    python -m benchmarks.bench_lexicon [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server")
+sys.path.insert(0, SERVER_DIR)
+
+from lexicon import load_lexicon  # noqa: E402
+from grammar_engine import GrammarEngine  # noqa: E402
+
+LABELS_PATH = os.path.join(SERVER_DIR, "models", "labels_v11.json")
+
+
+def rebuilt_word_map_translation(glosses):
+    """Baseline: the old per-call dict build (40 entries) followed by a word-for-word lookup."""
+    word_map = {w: w.upper() for w in (
+        "hello thank you yes no please sorry goodbye how what where when why who name nice meet i love "
+        "friend family home school work food water help stop go come see hear know think feel happy sad "
+        "angry tired"
+    ).split()}
+    return " ".join(word_map.get(g.lower(), g) for g in glosses)
+
+
+def best_time(fn, number: int, repeat: int) -> float:
+    """Best seconds per call over `repeat` runs of `number` calls."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lexicon microbenchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per measurement (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the gloss sequences")
+    args = parser.parse_args()
+
+    with open(LABELS_PATH) as f:
+        labels = json.load(f)
+    lexicon = load_lexicon()
+    engine = GrammarEngine(lexicon)
+    rng = random.Random(args.seed)
+
+    missing = [label for label in labels if label not in lexicon]
+    print(f"Lexicon: {len(lexicon)} glosses, {lexicon.phrase_count} phrases; "
+          f"labels covered: {len(labels) - len(missing)}/{len(labels)}")
+    if missing:
+        print(f"  missing: {', '.join(missing)}")
+
+    upper_labels = [label.upper() for label in labels]
+    per_lookup = best_time(lambda: [lexicon.lookup(g) for g in upper_labels], 200, args.repeat) / len(labels)
+    print(f"\nlookup: {per_lookup * 1e9:.0f} ns/gloss")
+
+    print(f"\n{'glosses':>8} {'to_filipino':>14} {'per gloss':>10} {'grammar':>12} {'per gloss':>10} {'rebuilt map':>12}")
+    for length in (1, 7, 50, 500):
+        sequence = [rng.choice(upper_labels) for _ in range(length)]
+        number = max(1, 20000 // length)
+        fil = best_time(lambda: lexicon.to_filipino(sequence), number, args.repeat)
+        grammar = best_time(lambda: engine.generate_sentence(sequence, "/question"), number, args.repeat)
+        baseline = best_time(lambda: rebuilt_word_map_translation(sequence), number, args.repeat)
+        print(f"{length:>8} {fil * 1e6:>11.1f} us {fil / length * 1e6:>7.2f} us "
+              f"{grammar * 1e6:>9.1f} us {grammar / length * 1e6:>7.2f} us {baseline * 1e6:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
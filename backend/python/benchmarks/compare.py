@@ -0,0 +1,71 @@
+"""
+Compare load test results across runs (e.g. before and after a change).
+
+Prints every numeric result side by side, one column per file, with the change
+of the last file relative to the first.
+
+Usage (from backend/python):
+    python -m benchmarks.compare benchmarks/results/load-A.json benchmarks/results/load-B.json
+"""
+import argparse
+import json
+import os
+from typing import Dict
+
+
+def flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves of a nested dict as {"a.b.c": value}."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def column_name(report: dict, path: str) -> str:
+    """Label, commit or file name of a run."""
+    git = report.get("git", {})
+    if report.get("label"):
+        return report["label"]
+    if git.get("commit"):
+        return git["commit"] + ("*" if git.get("dirty") else "")
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare load test JSON results")
+    parser.add_argument("files", nargs="+", help="Result files, baseline first")
+    args = parser.parse_args()
+
+    reports = []
+    for path in args.files:
+        with open(path) as f:
+            reports.append(json.load(f))
+    columns = [flatten(report["results"]) for report in reports]
+    names = [column_name(report, path) for report, path in zip(reports, args.files)]
+
+    keys = []
+    for column in columns:
+        keys.extend(key for key in column if key not in keys)
+    width = max(len(key) for key in keys) + 2
+
+    print(f"{'':<{width}}" + "".join(f"{name[:14]:>16}" for name in names) + (f"{'change':>10}" if len(columns) > 1 else ""))
+    for key in keys:
+        values = [column.get(key) for column in columns]
+        line = f"{key:<{width}}" + "".join(f"{'-' if v is None else f'{v:g}':>16}" for v in values)
+        first, last = values[0], values[-1]
+        if len(columns) > 1 and first and last is not None:
+            line += f"{(last - first) / abs(first) * 100:>+9.1f}%"
+        print(line)
+
+    configs = [report.get("config", {}) for report in reports]
+    differing = sorted(k for k in set().union(*configs) if len({json.dumps(c.get(k)) for c in configs}) > 1)
+    if differing:
+        print("\nConfig differs: " + ", ".join(differing))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Synthetic MediaPipe Holistic landmark frames for load tests.
+Each SyntheticSigner produces the same layout the Android app sends: two 21-point
+hands (left then right, 126 floats), 468 face points (1404 floats) and optionally
+33 pose points. Hands move through the signing space with finger curl, then rest
+below the frame long enough to trigger HANDS_DOWN, so streams exercise every
+server path (validation, classification, tone, hands-down) the way a signer does.
+"""
+import math
+import os
+import sys
+from typing import List
+
+import numpy as np
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server")
+sys.path.insert(0, SERVER_DIR)
+
+import expressora_pb2  # noqa: E402
+from landmark_codec import ENCODING_REPEATED, encode_frame  # noqa: E402
+
+HAND_LANDMARKS = 21
+FACE_LANDMARKS = 468
+POSE_LANDMARKS = 33
+
+# Hand template in hand-local units (wrist at the origin, fingers pointing up = -y).
+# Landmark order follows MediaPipe: wrist, then thumb, index, middle, ring, pinky (4 joints each).
+_FINGER_BASES = [(-0.35, -0.25), (-0.2, -0.9), (0.0, -0.95), (0.2, -0.9), (0.38, -0.8)]
+_FINGER_DIRECTIONS = [(-0.8, -0.6), (-0.1, -1.0), (0.0, -1.0), (0.1, -1.0), (0.25, -1.0)]
+_SEGMENT_LENGTHS = [0.3, 0.25, 0.2]
+HAND_SIZE = 0.09  # Wrist to middle fingertip is ~2x this, well above the 0.06 ghost-hand span
+
+# Face landmarks the tone heuristics read, placed relative to the face center
+_FACE_FEATURES = {
+    33: (-0.045, -0.02), 263: (0.045, -0.02),    # Eye outer corners
+    159: (-0.03, -0.03), 386: (0.03, -0.03),     # Upper eyelids
+    105: (-0.03, -0.055), 334: (0.03, -0.055),   # Brow middles
+    13: (0.0, 0.055), 14: (0.0, 0.06),           # Inner lips
+}
+
+
+def _hand_template() -> np.ndarray:
+    """21 x 2 hand landmarks of an open hand in hand-local units."""
+    points = [(0.0, 0.0)]
+    for (bx, by), (dx, dy) in zip(_FINGER_BASES, _FINGER_DIRECTIONS):
+        x, y = bx, by
+        points.append((x, y))
+        for length in _SEGMENT_LENGTHS:
+            x, y = x + dx * length, y + dy * length
+            points.append((x, y))
+    return np.array(points, dtype=np.float32)
+
+
+class SyntheticSigner:
+    """
+    Landmark generator for one simulated signer.
+
+    A cycle is `sign_seconds` of signing followed by `rest_seconds` with the hands
+    lowered (wrists below y = 0.9); the default 2 s rest is longer than the
+    server's 1.5 s hands-down threshold. Different seeds give different hand
+    paths, face shapes and cycle phases.
+    """
+
+    def __init__(self, seed: int = 0, sign_seconds: float = 4.0, rest_seconds: float = 2.0,
+                 include_pose: bool = True):
+        """
+        Args:
+            seed: Random seed for this signer
+            sign_seconds: Seconds of signing per cycle
+            rest_seconds: Seconds with hands down per cycle (0 = never rest)
+            include_pose: Send the 33 pose points (the current app sends none)
+        """
+        rng = np.random.default_rng(seed)
+        self.sign_seconds = sign_seconds
+        self.rest_seconds = rest_seconds
+        self.include_pose = include_pose
+        self._rng = rng
+        self._phase = rng.uniform(0.0, sign_seconds + rest_seconds)
+        self._speed = rng.uniform(0.7, 1.3, size=4)
+        self._hand = _hand_template()
+
+        # Face mesh: points scattered inside an ellipse, feature points at fixed offsets
+        self._face_center = np.array([0.5 + rng.normal(0, 0.02), 0.28 + rng.normal(0, 0.02)], dtype=np.float32)
+        angle = rng.uniform(0, 2 * math.pi, FACE_LANDMARKS)
+        radius = np.sqrt(rng.uniform(0, 1, FACE_LANDMARKS))
+        face = np.zeros((FACE_LANDMARKS, 3), dtype=np.float32)
+        face[:, 0] = radius * np.cos(angle) * 0.075
+        face[:, 1] = radius * np.sin(angle) * 0.1
+        face[:, 2] = rng.normal(0, 0.01, FACE_LANDMARKS)
+        for index, (dx, dy) in _FACE_FEATURES.items():
+            face[index, :2] = (dx, dy)
+        self._face_offsets = face
+
+    def _hand_points(self, center_x: float, center_y: float, rotation: float, curl: float,
+                     mirror: bool) -> np.ndarray:
+        """63 floats for one hand with its wrist at (center_x, center_y)."""
+        points = self._hand.copy()
+        # Curl pulls the finger joints back toward the palm
+        points[1:, 1] *= 1.0 - 0.45 * curl
+        if mirror:
+            points[:, 0] = -points[:, 0]
+        cos_r, sin_r = math.cos(rotation), math.sin(rotation)
+        x = points[:, 0] * cos_r - points[:, 1] * sin_r
+        y = points[:, 0] * sin_r + points[:, 1] * cos_r
+        hand = np.empty((HAND_LANDMARKS, 3), dtype=np.float32)
+        hand[:, 0] = center_x + x * HAND_SIZE
+        hand[:, 1] = center_y + y * HAND_SIZE
+        hand[:, 2] = -0.02 * np.arange(HAND_LANDMARKS) / HAND_LANDMARKS
+        hand += self._rng.normal(0, 0.002, hand.shape).astype(np.float32)
+        return hand.reshape(-1)
+
+    def landmarks(self, t: float):
+        """
+        Landmarks at time t (seconds).
+
+        Returns:
+            Tuple of (hands, face, pose) flat float32 arrays; pose is empty without include_pose
+        """
+        cycle = self.sign_seconds + self.rest_seconds
+        position = (t + self._phase) % cycle if cycle > 0 else 0.0
+        resting = position >= self.sign_seconds
+        s = self._speed
+
+        if resting:
+            wrists = [(0.38, 0.95), (0.62, 0.96)]
+            rotation, curl = 0.2, 0.6
+        else:
+            wrists = [
+                (0.4 + 0.08 * math.sin(s[0] * t), 0.6 + 0.1 * math.sin(s[1] * t * 1.3)),
+                (0.6 + 0.08 * math.sin(s[2] * t + 1.0), 0.6 + 0.1 * math.cos(s[3] * t)),
+            ]
+            rotation = 0.3 * math.sin(t * 2.0)
+            curl = 0.5 + 0.5 * math.sin(t * 3.0 * s[0])
+        hands = np.concatenate([
+            self._hand_points(wrists[0][0], wrists[0][1], rotation, curl, mirror=False),
+            self._hand_points(wrists[1][0], wrists[1][1], -rotation, curl, mirror=True),
+        ])
+
+        head = self._face_center + np.array([0.005 * math.sin(t), 0.004 * math.sin(1.7 * t)], dtype=np.float32)
+        face = self._face_offsets.copy()
+        face[:, :2] += head
+        # Brows and mouth move a little so the tone heuristics see changing ratios
+        face[[105, 334], 1] -= 0.008 * max(0.0, math.sin(0.9 * t))
+        face[14, 1] += 0.01 * max(0.0, math.sin(1.3 * t))
+        face[:, :2] += self._rng.normal(0, 0.0008, (FACE_LANDMARKS, 2)).astype(np.float32)
+
+        pose = np.zeros(0, dtype=np.float32)
+        if self.include_pose:
+            pose_points = np.zeros((POSE_LANDMARKS, 3), dtype=np.float32)
+            pose_points[:11, :2] = head                            # Face landmarks
+            pose_points[11, :2], pose_points[12, :2] = (0.4, 0.55), (0.6, 0.55)  # Shoulders
+            pose_points[15, :2], pose_points[16, :2] = wrists[0], wrists[1]       # Wrists
+            pose_points[13, :2] = (pose_points[11, :2] + pose_points[15, :2]) / 2  # Elbows
+            pose_points[14, :2] = (pose_points[12, :2] + pose_points[16, :2]) / 2
+            pose_points[17:23, :2] = np.repeat(pose_points[15:17, :2], 3, axis=0)  # Finger points
+            pose_points[23, :2], pose_points[24, :2] = (0.43, 0.9), (0.57, 0.9)  # Hips
+            pose_points[25:, :2] = np.tile([[0.45, 1.1], [0.55, 1.1]], (4, 1))    # Legs (off frame)
+            pose = pose_points.reshape(-1)
+        return hands, face.reshape(-1), pose
+
+    def frame(self, t: float, timestamp_ms: int = 0,
+              encoding: str = ENCODING_REPEATED) -> expressora_pb2.LandmarkFrame:
+        """
+        Build the LandmarkFrame for time t.
+
+        Args:
+            t: Seconds since the signer started
+            timestamp_ms: Value of LandmarkFrame.timestamp
+            encoding: "repeated" or a packed encoding ("f32", "f16", "i16")
+        """
+        hands, face, pose = self.landmarks(t)
+        if encoding == ENCODING_REPEATED:
+            return expressora_pb2.LandmarkFrame(
+                hands=hands.tolist(), face=face.tolist(), pose=pose.tolist(), timestamp=timestamp_ms
+            )
+        return expressora_pb2.LandmarkFrame(packed=encode_frame(hands, face, pose, encoding), timestamp=timestamp_ms)
+
+    def cycle_frames(self, fps: float, encoding: str = ENCODING_REPEATED) -> List[expressora_pb2.LandmarkFrame]:
+        """
+        Precompute one full sign/rest cycle at the given frame rate.
+
+        Load tests replay the cycle and only set each frame's timestamp, so the
+        client spends its CPU on sending rather than on generating landmarks.
+        """
+        count = max(1, int(round((self.sign_seconds + self.rest_seconds) * fps)))
+        return [self.frame(i / fps, encoding=encoding) for i in range(count)]
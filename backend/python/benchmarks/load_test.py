@@ -0,0 +1,509 @@
+"""
+End-to-end load test for the gRPC server.
+
+Starts the server in a subprocess (benchmarks.server_process: the regular CLI with
+a stand-in Gemini model), drives N concurrent synthetic landmark streams at a fixed
+frame rate, translates each gloss run with TranslateSequence the way the app does,
+and samples the server's CPU and RSS. Results are printed and saved as JSON so runs
+can be compared across commits with benchmarks.compare.
+
+Latencies:
+- frame: scheduled capture time -> write() returned. Includes the client falling
+  behind its schedule and writes waiting for HTTP/2 flow control.
+- event: capture time of the frame that produced the event (echoed back in
+  RecognitionEvent.timing) -> event received, both on the client's clock.
+  Servers without EventTiming fall back to the newest frame written, a lower bound.
+- server: frame received -> event handed to gRPC, from the echoed server times.
+- translate: TranslateSequence round trip.
+
+Usage (from backend/python):
+    python -m benchmarks.load_test --streams 20 --fps 30 --duration 30
+    python -m benchmarks.load_test --frames-per-message 4 --encoding f16 --server-arg=--gemini-rpm=0
+    python -m benchmarks.load_test --target 192.168.1.10:50051 --server-pid 4242
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import signal
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import grpc
+import numpy as np
+
+from benchmarks.frames import SERVER_DIR, SyntheticSigner
+
+import expressora_pb2  # noqa: E402
+import expressora_pb2_grpc  # noqa: E402
+from landmark_codec import ENCODING_REPEATED, FRAME_ENCODING_METADATA_KEY, SUPPORTED_ENCODINGS  # noqa: E402
+from session import AUTO_TRANSLATE_METADATA_KEY, SESSION_ID_METADATA_KEY  # noqa: E402
+from flow_control import FLOW_CONTROL_METADATA_KEY  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(SERVER_DIR)
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+RESULT_FORMAT_VERSION = 1
+
+MAX_GLOSSES = 7         # The app translates after 7 glosses or on hands-down
+SAMPLE_INTERVAL = 0.5   # Seconds between CPU/RSS samples
+PERCENTILES = (50, 90, 95, 99)
+
+Type = expressora_pb2.RecognitionEvent.Type
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    """Count, mean, percentiles and max of latencies, in milliseconds."""
+    if not seconds:
+        return {"count": 0}
+    values = np.asarray(seconds) * 1000.0
+    summary = {"count": int(values.size), "mean": round(float(values.mean()), 3)}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{p}"] = round(float(value), 3)
+    summary["max"] = round(float(values.max()), 3)
+    return summary
+
+
+class ProcessSampler:
+    """
+    Periodic CPU time and RSS samples of one process, read from /proc (Linux).
+    On other platforms sample() returns None and the summary is empty.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.samples = []  # (monotonic time, cpu seconds, rss bytes)
+
+    def sample(self) -> Optional[tuple]:
+        """Take one sample; None if the process is gone or /proc is unavailable."""
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{self.pid}/statm") as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            return None
+        # Fields after "(comm)": state is [0], utime [11], stime [12]
+        cpu = (int(fields[11]) + int(fields[12])) / self._ticks
+        sample = (time.monotonic(), cpu, rss_pages * self._page_size)
+        self.samples.append(sample)
+        return sample
+
+    async def run(self, interval: float = SAMPLE_INTERVAL):
+        """Sample until cancelled."""
+        while self.sample() is not None:
+            await asyncio.sleep(interval)
+
+    def summary(self, since: float = 0.0) -> dict:
+        """CPU percent (of one core) and RSS over the samples taken after `since`."""
+        samples = [s for s in self.samples if s[0] >= since]
+        if len(samples) < 2:
+            return {}
+        rates = [(b[1] - a[1]) / (b[0] - a[0]) * 100.0 for a, b in zip(samples, samples[1:]) if b[0] > a[0]]
+        first, last = samples[0], samples[-1]
+        mb = 1024.0 * 1024.0
+        return {
+            "cpu_percent_mean": round((last[1] - first[1]) / (last[0] - first[0]) * 100.0, 1),
+            "cpu_percent_max": round(max(rates), 1) if rates else 0.0,
+            "rss_mb_start": round(first[2] / mb, 1),
+            "rss_mb_peak": round(max(s[2] for s in samples) / mb, 1),
+            "rss_mb_end": round(last[2] / mb, 1),
+        }
+
+
+class LoadResults:
+    """Measurements shared by all simulated streams (all on the client's event loop)."""
+
+    def __init__(self):
+        self.frame_latencies: List[float] = []
+        self.event_latencies: List[float] = []
+        self.server_latencies: List[float] = []
+        self.translate_latencies: List[float] = []
+        self.frames_sent = 0
+        self.messages_sent = 0
+        self.events = Counter()
+        self.sources = Counter()
+        self.errors = Counter()
+        self.streams_completed = 0
+        self.frames_withheld = 0  # Not sent because of FLOW_CONTROL advice
+        self.flow_advice = Counter()  # FLOW_CONTROL events by level name
+        self.last_write = 0.0  # time.monotonic() of the last write on any stream
+
+
+class _StreamState:
+    __slots__ = ("newest_capture", "flow_control")
+
+    def __init__(self):
+        self.newest_capture: Optional[float] = None  # Scheduled time of the newest frame written
+        self.flow_control = None  # Latest FlowControl advice (with --flow-control)
+
+
+async def _translate(stub, glosses: List[str], tone: str, session_id: str,
+                     args, results: LoadResults):
+    """TranslateSequence for one gloss run, as the app sends it after a sentence."""
+    request = expressora_pb2.GlossSequence(glosses=glosses, dominant_tone=tone, session_id=session_id)
+    started = time.monotonic()
+    try:
+        result = await stub.TranslateSequence(request, timeout=args.translate_timeout)
+    except grpc.aio.AioRpcError as e:
+        results.errors[f"TranslateSequence:{e.code().name}"] += 1
+        return
+    results.translate_latencies.append(time.monotonic() - started)
+    results.sources[result.source] += 1
+
+
+async def _read_events(call, stub, args, results: LoadResults, state: _StreamState):
+    """Consume a stream's events, recording latencies and translating gloss runs."""
+    metadata = await call.initial_metadata()
+    session_id = (metadata.get(SESSION_ID_METADATA_KEY) if metadata else None) or ""
+    glosses: List[str] = []
+    tone = "/neutral"
+    translations = []
+
+    def flush():
+        nonlocal glosses
+        if args.translate and glosses:
+            translations.append(asyncio.create_task(_translate(stub, glosses, tone, session_id, args, results)))
+        glosses = []
+
+    try:
+        async for event in call:
+            now = time.monotonic()
+            results.events[Type.Name(event.type)] += 1
+            if event.type == Type.TRANSLATION:
+                results.sources[event.translation.source] += 1
+                continue
+            if event.type == Type.FLOW_CONTROL:
+                state.flow_control = event.flow_control
+                results.flow_advice[event.label] += 1
+                continue
+            timing = event.timing if event.HasField("timing") else None
+            if timing is not None and timing.frame_timestamp:
+                results.event_latencies.append(time.time() - timing.frame_timestamp / 1000.0)
+                results.server_latencies.append((timing.sent - timing.server_receive) / 1000.0)
+            elif state.newest_capture is not None:
+                results.event_latencies.append(now - state.newest_capture)
+            if event.type == Type.GLOSS:
+                if not glosses or glosses[-1] != event.label:
+                    glosses.append(event.label)
+                if len(glosses) >= MAX_GLOSSES:
+                    flush()
+            elif event.type == Type.TONE:
+                tone = event.label
+            elif event.type == Type.HANDS_DOWN:
+                flush()
+    except grpc.aio.AioRpcError:
+        pass  # Recorded from the call status in run_stream
+    flush()
+    await asyncio.gather(*translations)
+
+
+async def run_stream(stub, index: int, args, results: LoadResults, start: float, wall_start: float):
+    """
+    One simulated signer: send frames at args.fps from `start` for args.duration seconds.
+
+    Args:
+        stub: TranslationService stub
+        index: Stream number (seeds the signer)
+        args: Parsed command line
+        results: Shared measurements
+        start: time.monotonic() of the first frame
+        wall_start: time.time() matching `start`, for LandmarkFrame.timestamp
+    """
+    signer = SyntheticSigner(seed=args.seed + index, include_pose=args.pose)
+    cycle = signer.cycle_frames(args.fps, args.encoding)
+
+    metadata = []
+    if args.encoding != ENCODING_REPEATED:
+        metadata.append((FRAME_ENCODING_METADATA_KEY, args.encoding))
+    if args.auto_translate:
+        metadata.append((AUTO_TRANSLATE_METADATA_KEY, "1"))
+    if args.flow_control:
+        metadata.append((FLOW_CONTROL_METADATA_KEY, "1"))
+    batched = args.frames_per_message > 1
+    rpc = stub.StreamLandmarkBatches if batched else stub.StreamLandmarks
+    call = rpc(metadata=metadata)
+
+    state = _StreamState()
+    reader = asyncio.create_task(_read_events(call, stub, args, results, state))
+    interval = 1.0 / args.fps
+    total = int(args.duration * args.fps)
+    pending = []  # (scheduled time, frame) not yet written
+    credit = 0.0  # Frames allowed by the FLOW_CONTROL target rate
+    try:
+        for k in range(total):
+            scheduled = start + k * interval
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            advice = state.flow_control
+            if advice is not None and 0 < advice.target_fps < args.fps:
+                # Like the app's adaptive frame processor: send only target_fps of the captured frames
+                credit += advice.target_fps / args.fps
+                send = credit >= 1.0
+                credit -= 1.0 if send else 0.0
+            else:
+                send = True
+            if send:
+                frame = expressora_pb2.LandmarkFrame()
+                frame.CopyFrom(cycle[k % len(cycle)])
+                frame.timestamp = int((wall_start + k * interval) * 1000)
+                if advice is not None and args.encoding == ENCODING_REPEATED:
+                    # Packed frames would need re-encoding; they keep every group
+                    if not advice.send_pose:
+                        frame.ClearField("pose")
+                    if not advice.send_face:
+                        frame.ClearField("face")
+                pending.append((scheduled, frame))
+            else:
+                results.frames_withheld += 1
+            if not pending or (len(pending) < args.frames_per_message and k + 1 < total):
+                continue
+
+            if batched:
+                await call.write(expressora_pb2.LandmarkBatch(frames=[f for _, f in pending]))
+            else:
+                await call.write(pending[-1][1])
+            now = time.monotonic()
+            results.frame_latencies.extend(now - s for s, _ in pending)
+            results.frames_sent += len(pending)
+            results.messages_sent += 1
+            state.newest_capture = pending[-1][0]
+            results.last_write = max(results.last_write, now)
+            pending = []
+        await call.done_writing()
+    except (grpc.aio.AioRpcError, grpc.aio.UsageError):
+        pass  # The call already ended; its status is recorded below
+    await reader
+
+    code = await call.code()
+    if code == grpc.StatusCode.OK:
+        results.streams_completed += 1
+    else:
+        results.errors[f"Stream:{code.name}"] += 1
+
+
+async def run_load(args, address: str, server_pid: Optional[int]) -> dict:
+    """Drive the streams against `address` and return the result summary."""
+    results = LoadResults()
+    server_sampler = ProcessSampler(server_pid) if server_pid else None
+    client_sampler = ProcessSampler(os.getpid())
+
+    async with grpc.aio.insecure_channel(address) as channel:
+        await asyncio.wait_for(channel.channel_ready(), args.startup_timeout)
+        stub = expressora_pb2_grpc.TranslationServiceStub(channel)
+
+        samplers = [s for s in (server_sampler, client_sampler) if s is not None]
+        tasks = [asyncio.create_task(s.run()) for s in samplers]
+        await asyncio.sleep(SAMPLE_INTERVAL * 2)  # Idle baseline
+
+        load_start = time.monotonic()
+        wall_start = time.time()
+        stagger = args.ramp_up / args.streams if args.streams > 1 else 0.0
+        await asyncio.gather(*(
+            run_stream(stub, i, args, results, load_start + i * stagger, wall_start + i * stagger)
+            for i in range(args.streams)
+        ))
+        elapsed = time.monotonic() - load_start
+        for sampler in samplers:
+            sampler.sample()
+        for task in tasks:
+            task.cancel()
+
+    idle = {}
+    if server_sampler is not None:
+        before = [s for s in server_sampler.samples if s[0] < load_start]
+        if before:
+            idle = {"rss_mb_idle": round(before[-1][2] / (1024.0 * 1024.0), 1)}
+    # Throughput over the sending window; elapsed also covers draining events and translations
+    sending = max(results.last_write - load_start, 1e-9)
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "sending_s": round(sending, 3),
+        "streams_completed": results.streams_completed,
+        "frames_sent": results.frames_sent,
+        "messages_sent": results.messages_sent,
+        "frames_per_second": round(results.frames_sent / sending, 2),
+        "target_frames_per_second": round(args.streams * args.fps, 2),
+        "events": dict(results.events),
+        "events_per_second": round(sum(results.events.values()) / elapsed, 2),
+        "flow_control": {"advice": dict(results.flow_advice), "frames_withheld": results.frames_withheld},
+        "frame_latency_ms": latency_summary(results.frame_latencies),
+        "event_latency_ms": latency_summary(results.event_latencies),
+        "server_latency_ms": latency_summary(results.server_latencies),
+        "translate_latency_ms": latency_summary(results.translate_latencies),
+        "translation_sources": dict(results.sources),
+        "errors": dict(results.errors),
+        "server": {**idle, **server_sampler.summary(since=load_start)} if server_sampler else {},
+        "client": client_sampler.summary(since=load_start),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(args) -> subprocess.Popen:
+    """Launch benchmarks.server_process on args.port; its log goes to args.server_log."""
+    command = [
+        sys.executable, "-m", "benchmarks.server_process",
+        "--gemini-latency-ms", str(args.gemini_latency_ms),
+        "--gemini-jitter-ms", str(args.gemini_jitter_ms),
+        "--gemini-failure-rate", str(args.gemini_failure_rate),
+        "--", "--host", "127.0.0.1", "--port", str(args.port), "--classifier", args.classifier,
+    ] + args.server_arg
+    log = open(args.server_log, "ab") if args.server_log else subprocess.DEVNULL
+    try:
+        return subprocess.Popen(command, cwd=BACKEND_DIR, stdout=log, stderr=subprocess.STDOUT)
+    finally:
+        if log is not subprocess.DEVNULL:
+            log.close()
+
+
+def stop_server(process: subprocess.Popen, timeout: float = 15.0):
+    """SIGINT (the server logs its stats on shutdown), then kill if it hangs."""
+    if process.poll() is None:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def git_info() -> dict:
+    """Commit of the benchmarked tree and whether it had local changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    return {"commit": commit, "dirty": bool(status.strip())}
+
+
+def print_summary(report: dict):
+    config, results = report["config"], report["results"]
+    rpc = "StreamLandmarkBatches" if config["frames_per_message"] > 1 else "StreamLandmarks"
+    print(f"\nLoad test: {config['streams']} streams x {config['fps']:g} fps for {config['duration']:g} s "
+          f"({rpc}, {config['encoding']}, {config['classifier']} classifier)")
+    print(f"frames/s   {results['frames_per_second']:.1f} sent (target {results['target_frames_per_second']:.1f}), "
+          f"{results['streams_completed']}/{config['streams']} streams completed")
+    events = ", ".join(f"{name} {count}" for name, count in sorted(results["events"].items()))
+    print(f"events     {sum(results['events'].values())} ({events or 'none'}), {results['events_per_second']:.1f}/s")
+    flow = results["flow_control"]
+    if config["flow_control"]:
+        advice = ", ".join(f"{level} {count}" for level, count in sorted(flow["advice"].items()))
+        print(f"flow       {advice or 'no advice'}; {flow['frames_withheld']} frames withheld")
+
+    print(f"\n{'latency (ms)':<14}{'count':>8}" + "".join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'max':>10}")
+    for name in ("frame", "event", "server", "translate"):
+        summary = results[f"{name}_latency_ms"]
+        if summary["count"]:
+            print(f"{name:<14}{summary['count']:>8}" + "".join(f"{summary[f'p{p}']:>10.1f}" for p in PERCENTILES)
+                  + f"{summary['max']:>10.1f}")
+    if results["translation_sources"]:
+        print("\nsources    " + ", ".join(f"{s}: {n}" for s, n in results["translation_sources"].items()))
+    if results["errors"]:
+        print("errors     " + ", ".join(f"{e}: {n}" for e, n in results["errors"].items()))
+    for role in ("server", "client"):
+        usage = results[role]
+        if usage:
+            idle = f" (idle {usage['rss_mb_idle']:.0f} MB)" if "rss_mb_idle" in usage else ""
+            print(f"{role:<10} cpu {usage['cpu_percent_mean']:.0f}% mean / {usage['cpu_percent_max']:.0f}% max, "
+                  f"rss {usage['rss_mb_peak']:.0f} MB peak{idle}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expressora gRPC load test")
+    parser.add_argument("--streams", type=int, default=10, help="Concurrent landmark streams")
+    parser.add_argument("--fps", type=float, default=30.0, help="Frames per second per stream")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds each stream sends frames")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="Seconds over which stream starts are spread")
+    parser.add_argument("--frames-per-message", type=int, default=1,
+                        help="Frames per message; >1 uses StreamLandmarkBatches")
+    parser.add_argument("--encoding", choices=SUPPORTED_ENCODINGS, default=ENCODING_REPEATED,
+                        help="Frame encoding (packed encodings are requested via metadata)")
+    parser.add_argument("--no-pose", dest="pose", action="store_false", help="Send no pose points (like the app)")
+    parser.add_argument("--no-translate", dest="translate", action="store_false",
+                        help="Don't call TranslateSequence after each gloss run")
+    parser.add_argument("--auto-translate", action="store_true", help="Request TRANSLATION events on the streams")
+    parser.add_argument("--flow-control", action="store_true",
+                        help="Request FLOW_CONTROL events and follow them (lower rate, drop pose/face)")
+    parser.add_argument("--translate-timeout", type=float, default=5.0, help="TranslateSequence deadline (seconds)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic signers")
+
+    server = parser.add_argument_group("server")
+    server.add_argument("--target", type=str, default=None,
+                        help="host:port of a running server instead of starting one")
+    server.add_argument("--server-pid", type=int, default=None,
+                        help="With --target: PID of the server process, for CPU/RSS sampling")
+    server.add_argument("--port", type=int, default=0, help="Port for the local server (0 = any free port)")
+    server.add_argument("--classifier", choices=("tflite", "mock"), default="mock",
+                        help="Classifier of the local server")
+    server.add_argument("--gemini-latency-ms", type=float, default=400.0, help="Stand-in Gemini mean latency")
+    server.add_argument("--gemini-jitter-ms", type=float, default=100.0, help="Stand-in Gemini latency std dev")
+    server.add_argument("--gemini-failure-rate", type=float, default=0.0, help="Fraction of stand-in calls failing")
+    server.add_argument("--server-arg", action="append", default=[],
+                        help="Extra expressora_server flag, e.g. --server-arg=--gemini-rpm=0 (repeatable)")
+    server.add_argument("--server-log", type=str, default=None, help="File for the local server's log")
+    server.add_argument("--startup-timeout", type=float, default=120.0, help="Seconds to wait for the server")
+
+    parser.add_argument("--label", type=str, default="", help="Free-form label stored with the results")
+    parser.add_argument("--output", type=str, default=None,
+                        help="JSON result file (default: benchmarks/results/load-<time>-<commit>.json)")
+    args = parser.parse_args()
+    if args.streams < 1 or args.fps <= 0 or args.duration <= 0 or args.frames_per_message < 1:
+        parser.error("--streams, --fps, --duration and --frames-per-message must be positive")
+
+    started_at = datetime.datetime.now()
+    process = None
+    if args.target:
+        address, server_pid = args.target, args.server_pid
+    else:
+        args.port = args.port or _free_port()
+        address = f"127.0.0.1:{args.port}"
+        process = start_server(args)
+        server_pid = process.pid
+    try:
+        results = asyncio.run(run_load(args, address, server_pid))
+    except asyncio.TimeoutError:
+        sys.exit(f"Server at {address} did not become ready within {args.startup_timeout:g}s")
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    report = {
+        "benchmark": "load_test",
+        "version": RESULT_FORMAT_VERSION,
+        "label": args.label,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "git": git_info(),
+        "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "label")},
+        "results": results,
+    }
+    print_summary(report)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        commit = report["git"].get("commit", "nogit") + ("-dirty" if report["git"].get("dirty") else "")
+        output = os.path.join(RESULTS_DIR, f"load-{started_at:%Y%m%d-%H%M%S}-{commit}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+
+if __name__ == "__main__":
+    main()
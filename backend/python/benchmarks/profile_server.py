@@ -0,0 +1,75 @@
+"""
+Profile a running server with the Profile RPC.
+
+The server (started with --profile-dir) samples its thread stacks for the
+requested time and returns them as folded stacks. This saves them locally and
+prints the functions with the most samples at the top of the stack ("self") and
+anywhere on it ("total").
+
+Usage (from backend/python):
+    python -m benchmarks.profile_server --target localhost:50051 --seconds 10
+    python -m benchmarks.profile_server --session s3-0123456789abcdef --output slow-stream.folded
+
+Render a flamegraph with flamegraph.pl (`flamegraph.pl out.folded > out.svg`) or
+load the file into https://www.speedscope.app.
+"""
+import argparse
+from collections import Counter
+
+import grpc
+
+from benchmarks.frames import SERVER_DIR  # noqa: F401 - puts server/ on sys.path
+
+import expressora_pb2  # noqa: E402
+import expressora_pb2_grpc  # noqa: E402
+
+
+def top_functions(folded: str, limit: int = 15):
+    """(self, total) sample counts per function, most self samples first."""
+    self_counts, total_counts = Counter(), Counter()
+    for line in folded.splitlines():
+        stack, _, count = line.rpartition(" ")
+        frames = stack.split(";")[1:]  # Drop the thread root
+        if not frames:
+            continue
+        count = int(count)
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+    return [(name, n, total_counts[name]) for name, n in self_counts.most_common(limit)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sample a running Expressora server's stacks")
+    parser.add_argument("--target", default="localhost:50051", help="Server address")
+    parser.add_argument("--seconds", type=float, default=10.0, help="How long to sample")
+    parser.add_argument("--session", default="", help="Only this stream's event-loop work (x-expressora-session-id)")
+    parser.add_argument("--interval-ms", type=float, default=0.0, help="Sampling interval (default: server's, 10 ms)")
+    parser.add_argument("--output", default="profile.folded", help="Local file for the folded stacks")
+    parser.add_argument("--top", type=int, default=15, help="Functions to list")
+    args = parser.parse_args()
+
+    with grpc.insecure_channel(args.target) as channel:
+        stub = expressora_pb2_grpc.TranslationServiceStub(channel)
+        request = expressora_pb2.ProfileRequest(
+            duration_seconds=args.seconds, session_id=args.session, interval_ms=args.interval_ms
+        )
+        try:
+            response = stub.Profile(request, timeout=args.seconds + 30.0)
+        except grpc.RpcError as e:
+            raise SystemExit(f"Profile failed: {e.code().name}: {e.details()}")
+
+    with open(args.output, "w") as f:
+        f.write(response.folded)
+    print(f"{response.samples} samples; saved to {args.output} (server copy: {response.path})")
+
+    rows = top_functions(response.folded, args.top)
+    if rows:
+        width = max(len(name) for name, _, _ in rows) + 2
+        print(f"\n{'function':<{width}}{'self':>8}{'total':>8}")
+        for name, self_count, total in rows:
+            print(f"{name:<{width}}{self_count:>8}{total:>8}")
+
+
+if __name__ == "__main__":
+    main()
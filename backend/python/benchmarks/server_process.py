@@ -0,0 +1,37 @@
+"""
+Server process for load tests.
+Runs the regular expressora_server CLI with Gemini replaced by StandInGemini, so
+every server flag works as in production and no API key or network is needed.
+
+Usage (from backend/python):
+    python -m benchmarks.server_process [--gemini-latency-ms 400] -- --port 50051 --classifier mock
+
+Stop it with SIGINT to get the server's shutdown stats in its log.
+"""
+import argparse
+import os
+import runpy
+import sys
+
+from benchmarks.stand_in import SERVER_DIR, StandInGemini, install_stand_in
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expressora server with a stand-in Gemini model")
+    parser.add_argument("--gemini-latency-ms", type=float, default=400.0, help="Mean stand-in response time")
+    parser.add_argument("--gemini-jitter-ms", type=float, default=100.0, help="Standard deviation of the response time")
+    parser.add_argument("--gemini-failure-rate", type=float, default=0.0, help="Fraction of stand-in calls that fail")
+    args, server_args = parser.parse_known_args()
+    if server_args[:1] == ["--"]:
+        server_args = server_args[1:]
+
+    install_stand_in(StandInGemini(
+        latency_ms=args.gemini_latency_ms, jitter_ms=args.gemini_jitter_ms, failure_rate=args.gemini_failure_rate
+    ))
+    server_script = os.path.join(SERVER_DIR, "expressora_server.py")
+    sys.argv = [server_script] + server_args
+    runpy.run_path(server_script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Offline stand-in for the Gemini model used during load tests.
+It answers TranslationService prompts (single, numbered batch and streamed) after
+a configurable latency, so benchmarks exercise the real cache, breaker, dispatcher
+and fallback code without network access or API quota.
+"""
+import os
+import re
+import sys
+import threading
+import time
+import types
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server")
+sys.path.insert(0, SERVER_DIR)
+
+from lexicon import load_lexicon  # noqa: E402
+
+# "Glosses: A B\nTone: /x" (single prompt) and "3. Glosses: A B | Tone: /x" (batched prompt)
+_SINGLE = re.compile(r"^Glosses: (.*)\nTone: (\S*)", re.MULTILINE)
+_NUMBERED = re.compile(r"^(\d+)\. Glosses: (.*?) \| Tone: (\S*)$", re.MULTILINE)
+
+
+class _Response:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StandInGemini:
+    """
+    Drop-in for genai.GenerativeModel.generate_content().
+
+    Latency is drawn from a normal distribution around latency_ms (never below
+    zero). Streamed responses spread the same latency over `chunks` pieces.
+    """
+
+    def __init__(self, latency_ms: float = 400.0, jitter_ms: float = 100.0,
+                 chunks: int = 4, failure_rate: float = 0.0, seed: int = 0):
+        """
+        Args:
+            latency_ms: Mean response time
+            jitter_ms: Standard deviation of the response time
+            chunks: Pieces a streamed response is split into
+            failure_rate: Fraction of calls that raise, to exercise retries and the breaker
+            seed: Random seed
+        """
+        self.latency = max(0.0, latency_ms) / 1000.0
+        self.jitter = max(0.0, jitter_ms) / 1000.0
+        self.chunks = max(1, chunks)
+        self.failure_rate = failure_rate
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._lexicon = load_lexicon()
+        self.calls = 0
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.calls += 1
+            delay = self._rng.normal(self.latency, self.jitter) if self.jitter else self.latency
+            failed = self._rng.random() < self.failure_rate
+        if failed:
+            time.sleep(max(0.0, delay) / 2)
+            raise RuntimeError("Stand-in Gemini failure")
+        return max(0.0, delay)
+
+    def _sentence(self, glosses: str, tone: str) -> str:
+        words = glosses.split()
+        english = " ".join(self._lexicon.to_english(words))
+        filipino = " ".join(self._lexicon.to_filipino(words))
+        mark = "?" if tone == "/question" else "!" if tone == "/exclamation" else "."
+        return f"English: {english[:1].upper()}{english[1:]}{mark} | Filipino: {filipino[:1].upper()}{filipino[1:]}{mark}"
+
+    def _answer(self, prompt: str) -> str:
+        numbered = _NUMBERED.findall(prompt)
+        if numbered:
+            return "\n".join(f"{n}. {self._sentence(glosses, tone)}" for n, glosses, tone in numbered)
+        match = _SINGLE.search(prompt)
+        if match is None:
+            return "English: ... | Filipino: ..."
+        return self._sentence(match.group(1), match.group(2))
+
+    def generate_content(self, prompt: str, stream: bool = False, request_options: Optional[dict] = None):
+        """Answer after the simulated latency; with stream=True, return an iterator of chunks."""
+        delay = self._delay()
+        timeout = (request_options or {}).get("timeout")
+        text = self._answer(prompt)
+        if stream:
+            return self._stream(text, delay, timeout)
+        if timeout is not None and delay > timeout:
+            time.sleep(max(0.0, timeout))
+            raise TimeoutError("Stand-in Gemini request timed out")
+        time.sleep(delay)
+        return _Response(text)
+
+    def _stream(self, text: str, delay: float, timeout: Optional[float]) -> Iterator[_Response]:
+        step = max(1, -(-len(text) // self.chunks))
+        pieces: List[str] = [text[i:i + step] for i in range(0, len(text), step)]
+        started = time.monotonic()
+        for piece in pieces:
+            time.sleep(delay / len(pieces))
+            if timeout is not None and time.monotonic() - started > timeout:
+                raise TimeoutError("Stand-in Gemini stream timed out")
+            yield _Response(piece)
+
+
+def install_stand_in(model: StandInGemini):
+    """
+    Route TranslationService's Gemini calls to `model`.
+
+    Must run before TranslationService is constructed (it creates the model in __init__).
+    """
+    import translation_service
+
+    os.environ.setdefault("GOOGLE_API_KEY", "stand-in")
+    translation_service.genai = types.SimpleNamespace(
+        configure=lambda **kwargs: None,
+        GenerativeModel=lambda name: model,
+    )
@@ -0,0 +1,116 @@
+"""
+Circuit breaker for the Gemini translation path.
+After repeated failures the breaker opens and callers skip the cloud call
+immediately; after a cool-down a single probe call decides whether to close it.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"        # Calls go through; failures are counted
+OPEN = "open"            # Calls are rejected until recovery_timeout has passed
+HALF_OPEN = "half_open"  # One probe call is allowed; its outcome closes or re-opens the breaker
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker. Thread-safe.
+
+    Usage:
+        if not breaker.allow_request():
+            raise CircuitOpenError(...)
+        try:
+            result = call()
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(self, name: str = "circuit", failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        """
+        Args:
+            name: Name used in log messages
+            failure_threshold: Consecutive failures that open the breaker
+            recovery_timeout: Seconds the breaker stays open before a probe is allowed
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # Stats
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker whose cool-down has passed reports half-open."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go through now (claims the probe slot when half-open)."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = HALF_OPEN
+                logger.info(f"Circuit '{self.name}' half-open: probing")
+            # HALF_OPEN: a single probe at a time
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        """Report a successful call; closes the breaker."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed: call succeeded")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Report a failed call; opens the breaker at the threshold or when a probe fails."""
+        with self._lock:
+            self._failures += 1
+            probe_failed = self._state == HALF_OPEN
+            self._probe_in_flight = False
+            if probe_failed or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+                logger.warning(f"Circuit '{self.name}' open after {self._failures} failure(s); "
+                               f"skipping calls for {self.recovery_timeout:g}s")
+
+    def release(self):
+        """Give up an allowed call without an outcome (caller went away); frees the probe slot."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        """Counters for logging and monitoring."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
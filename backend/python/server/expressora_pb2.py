@@ -14,23 +14,47 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x65xpressora.proto\x12\nexpressora\"M\n\rLandmarkFrame\x12\r\n\x05hands\x18\x01 \x03(\x02\x12\x0c\n\x04\x66\x61\x63\x65\x18\x02 \x03(\x02\x12\x0c\n\x04pose\x18\x03 \x03(\x02\x12\x11\n\ttimestamp\x18\x04 \x01(\x03\"\x93\x01\n\x10RecognitionEvent\x12/\n\x04type\x18\x01 \x01(\x0e\x32!.expressora.RecognitionEvent.Type\x12\r\n\x05label\x18\x02 \x01(\t\x12\x12\n\nconfidence\x18\x03 \x01(\x02\"+\n\x04Type\x12\t\n\x05GLOSS\x10\x00\x12\x08\n\x04TONE\x10\x01\x12\x0e\n\nHANDS_DOWN\x10\x02\"7\n\rGlossSequence\x12\x0f\n\x07glosses\x18\x01 \x03(\t\x12\x15\n\rdominant_tone\x18\x02 \x01(\t\"^\n\x11TranslationResult\x12\x10\n\x08sentence\x18\x01 \x01(\t\x12\x19\n\x11sentence_filipino\x18\x02 \x01(\t\x12\x0c\n\x04tone\x18\x03 \x01(\t\x12\x0e\n\x06source\x18\x04 \x01(\t2\xb3\x01\n\x12TranslationService\x12N\n\x0fStreamLandmarks\x12\x19.expressora.LandmarkFrame\x1a\x1c.expressora.RecognitionEvent(\x01\x30\x01\x12M\n\x11TranslateSequence\x12\x19.expressora.GlossSequence\x1a\x1d.expressora.TranslationResultb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x65xpressora.proto\x12\nexpressora\"]\n\rLandmarkFrame\x12\r\n\x05hands\x18\x01 \x03(\x02\x12\x0c\n\x04\x66\x61\x63\x65\x18\x02 \x03(\x02\x12\x0c\n\x04pose\x18\x03 \x03(\x02\x12\x11\n\ttimestamp\x18\x04 \x01(\x03\x12\x0e\n\x06packed\x18\x05 \x01(\x0c\":\n\rLandmarkBatch\x12)\n\x06\x66rames\x18\x01 \x03(\x0b\x32\x19.expressora.LandmarkFrame\"\xc2\x02\n\x10RecognitionEvent\x12/\n\x04type\x18\x01 \x01(\x0e\x32!.expressora.RecognitionEvent.Type\x12\r\n\x05label\x18\x02 \x01(\t\x12\x12\n\nconfidence\x18\x03 \x01(\x02\x12\x32\n\x0btranslation\x18\x04 \x01(\x0b\x32\x1d.expressora.TranslationResult\x12\'\n\x06timing\x18\x05 \x01(\x0b\x32\x17.expressora.EventTiming\x12-\n\x0c\x66low_control\x18\x06 \x01(\x0b\x32\x17.expressora.FlowControl\"N\n\x04Type\x12\t\n\x05GLOSS\x10\x00\x12\x08\n\x04TONE\x10\x01\x12\x0e\n\nHANDS_DOWN\x10\x02\x12\x0f\n\x0bTRANSLATION\x10\x03\x12\x10\n\x0c\x46LOW_CONTROL\x10\x04\"f\n\x0b\x46lowControl\x12\x12\n\ntarget_fps\x18\x01 \x01(\x02\x12\x11\n\tsend_face\x18\x02 \x01(\x08\x12\x11\n\tsend_pose\x18\x03 \x01(\x08\x12\r\n\x05level\x18\x04 \x01(\x05\x12\x0e\n\x06reason\x18\x05 \x01(\t\"q\n\x0b\x45ventTiming\x12\x17\n\x0f\x66rame_timestamp\x18\x01 \x01(\x03\x12\x16\n\x0eserver_receive\x18\x02 \x01(\x01\x12\x11\n\tvalidated\x18\x03 \x01(\x01\x12\x10\n\x08inferred\x18\x04 \x01(\x01\x12\x0c\n\x04sent\x18\x05 \x01(\x01\"K\n\rGlossSequence\x12\x0f\n\x07glosses\x18\x01 \x03(\t\x12\x15\n\rdominant_tone\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x04 \x01(\t\"m\n\x11TranslationResult\x12\x10\n\x08sentence\x18\x01 \x01(\t\x12\x19\n\x11sentence_filipino\x18\x02 \x01(\t\x12\x0c\n\x04tone\x18\x03 \x01(\t\x12\x0e\n\x06source\x18\x04 \x01(\t\x12\r\n\x05\x66inal\x18\x05 \x01(\x08\"B\n\x12GlossSequenceBatch\x12,\n\tsequences\x18\x01 \x03(\x0b\x32\x19.expressora.GlossSequence\"H\n\x16TranslationResultBatch\x12.\n\x07results\x18\x01 \x03(\x0b\x32\x1d.expressora.TranslationResult\"\x1e\n\x0cStatsRequest\x12\x0e\n\x06prefix\x18\x01 \x01(\t\"\x90\x01\n\x0cMetricSample\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x34\n\x06labels\x18\x02 \x03(\x0b\x32$.expressora.MetricSample.LabelsEntry\x12\r\n\x05value\x18\x03 \x01(\x01\x1a-\n\x0bLabelsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"S\n\rStatsResponse\x12)\n\x07samples\x18\x01 \x03(\x0b\x32\x18.expressora.MetricSample\x12\x17\n\x0fprometheus_text\x18\x02 \x01(\t\"S\n\x0eProfileRequest\x12\x18\n\x10\x64uration_seconds\x18\x01 \x01(\x01\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x13\n\x0binterval_ms\x18\x03 \x01(\x01\"@\n\x0fProfileResponse\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0f\n\x07samples\x18\x02 \x01(\x05\x12\x0e\n\x06\x66olded\x18\x03 \x01(\t2\xbf\x04\n\x12TranslationService\x12N\n\x0fStreamLandmarks\x12\x19.expressora.LandmarkFrame\x1a\x1c.expressora.RecognitionEvent(\x01\x30\x01\x12T\n\x15StreamLandmarkBatches\x12\x19.expressora.LandmarkBatch\x1a\x1c.expressora.RecognitionEvent(\x01\x30\x01\x12M\n\x11TranslateSequence\x12\x19.expressora.GlossSequence\x1a\x1d.expressora.TranslationResult\x12U\n\x17TranslateSequenceStream\x12\x19.expressora.GlossSequence\x1a\x1d.expressora.TranslationResult0\x01\x12X\n\x12TranslateSequences\x12\x1e.expressora.GlossSequenceBatch\x1a\".expressora.TranslationResultBatch\x12?\n\x08GetStats\x12\x18.expressora.StatsRequest\x1a\x19.expressora.StatsResponse\x12\x42\n\x07Profile\x12\x1a.expressora.ProfileRequest\x1a\x1b.expressora.ProfileResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'expressora_pb2', _globals)
 if _descriptor._USE_C_DESCRIPTORS == False:
   DESCRIPTOR._options = None
+  _globals['_METRICSAMPLE_LABELSENTRY']._options = None
+  _globals['_METRICSAMPLE_LABELSENTRY']._serialized_options = b'8\001'
   _globals['_LANDMARKFRAME']._serialized_start=32
-  _globals['_LANDMARKFRAME']._serialized_end=109
-  _globals['_RECOGNITIONEVENT']._serialized_start=112
-  _globals['_RECOGNITIONEVENT']._serialized_end=259
-  _globals['_RECOGNITIONEVENT_TYPE']._serialized_start=216
-  _globals['_RECOGNITIONEVENT_TYPE']._serialized_end=259
-  _globals['_GLOSSSEQUENCE']._serialized_start=261
-  _globals['_GLOSSSEQUENCE']._serialized_end=316
-  _globals['_TRANSLATIONRESULT']._serialized_start=318
-  _globals['_TRANSLATIONRESULT']._serialized_end=412
-  _globals['_TRANSLATIONSERVICE']._serialized_start=415
-  _globals['_TRANSLATIONSERVICE']._serialized_end=594
+  _globals['_LANDMARKFRAME']._serialized_end=125
+  _globals['_LANDMARKBATCH']._serialized_start=127
+  _globals['_LANDMARKBATCH']._serialized_end=185
+  _globals['_RECOGNITIONEVENT']._serialized_start=188
+  _globals['_RECOGNITIONEVENT']._serialized_end=510
+  _globals['_RECOGNITIONEVENT_TYPE']._serialized_start=432
+  _globals['_RECOGNITIONEVENT_TYPE']._serialized_end=510
+  _globals['_FLOWCONTROL']._serialized_start=512
+  _globals['_FLOWCONTROL']._serialized_end=614
+  _globals['_EVENTTIMING']._serialized_start=616
+  _globals['_EVENTTIMING']._serialized_end=729
+  _globals['_GLOSSSEQUENCE']._serialized_start=731
+  _globals['_GLOSSSEQUENCE']._serialized_end=806
+  _globals['_TRANSLATIONRESULT']._serialized_start=808
+  _globals['_TRANSLATIONRESULT']._serialized_end=917
+  _globals['_GLOSSSEQUENCEBATCH']._serialized_start=919
+  _globals['_GLOSSSEQUENCEBATCH']._serialized_end=985
+  _globals['_TRANSLATIONRESULTBATCH']._serialized_start=987
+  _globals['_TRANSLATIONRESULTBATCH']._serialized_end=1059
+  _globals['_STATSREQUEST']._serialized_start=1061
+  _globals['_STATSREQUEST']._serialized_end=1091
+  _globals['_METRICSAMPLE']._serialized_start=1094
+  _globals['_METRICSAMPLE']._serialized_end=1238
+  _globals['_METRICSAMPLE_LABELSENTRY']._serialized_start=1193
+  _globals['_METRICSAMPLE_LABELSENTRY']._serialized_end=1238
+  _globals['_STATSRESPONSE']._serialized_start=1240
+  _globals['_STATSRESPONSE']._serialized_end=1323
+  _globals['_PROFILEREQUEST']._serialized_start=1325
+  _globals['_PROFILEREQUEST']._serialized_end=1408
+  _globals['_PROFILERESPONSE']._serialized_start=1410
+  _globals['_PROFILERESPONSE']._serialized_end=1474
+  _globals['_TRANSLATIONSERVICE']._serialized_start=1477
+  _globals['_TRANSLATIONSERVICE']._serialized_end=2052
 # @@protoc_insertion_point(module_scope)
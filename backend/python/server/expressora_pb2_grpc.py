@@ -20,11 +20,36 @@ class TranslationServiceStub(object):
                 request_serializer=expressora__pb2.LandmarkFrame.SerializeToString,
                 response_deserializer=expressora__pb2.RecognitionEvent.FromString,
                 )
+        self.StreamLandmarkBatches = channel.stream_stream(
+                '/expressora.TranslationService/StreamLandmarkBatches',
+                request_serializer=expressora__pb2.LandmarkBatch.SerializeToString,
+                response_deserializer=expressora__pb2.RecognitionEvent.FromString,
+                )
         self.TranslateSequence = channel.unary_unary(
                 '/expressora.TranslationService/TranslateSequence',
                 request_serializer=expressora__pb2.GlossSequence.SerializeToString,
                 response_deserializer=expressora__pb2.TranslationResult.FromString,
                 )
+        self.TranslateSequenceStream = channel.unary_stream(
+                '/expressora.TranslationService/TranslateSequenceStream',
+                request_serializer=expressora__pb2.GlossSequence.SerializeToString,
+                response_deserializer=expressora__pb2.TranslationResult.FromString,
+                )
+        self.TranslateSequences = channel.unary_unary(
+                '/expressora.TranslationService/TranslateSequences',
+                request_serializer=expressora__pb2.GlossSequenceBatch.SerializeToString,
+                response_deserializer=expressora__pb2.TranslationResultBatch.FromString,
+                )
+        self.GetStats = channel.unary_unary(
+                '/expressora.TranslationService/GetStats',
+                request_serializer=expressora__pb2.StatsRequest.SerializeToString,
+                response_deserializer=expressora__pb2.StatsResponse.FromString,
+                )
+        self.Profile = channel.unary_unary(
+                '/expressora.TranslationService/Profile',
+                request_serializer=expressora__pb2.ProfileRequest.SerializeToString,
+                response_deserializer=expressora__pb2.ProfileResponse.FromString,
+                )
 
 
 class TranslationServiceServicer(object):
@@ -38,6 +63,14 @@ class TranslationServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamLandmarkBatches(self, request_iterator, context):
+        """1b. Streaming with N frames per message: same events as StreamLandmarks,
+        fewer messages and server wakeups at the cost of a few ms of latency.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def TranslateSequence(self, request, context):
         """2. Unary: Client sends the final list to get the sentence.
         """
@@ -45,6 +78,38 @@ class TranslationServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def TranslateSequenceStream(self, request, context):
+        """2b. Server streaming: a local draft within milliseconds, then Gemini's answer
+        as it is generated; the last message has final = true.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TranslateSequences(self, request, context):
+        """3. Unary batch: many sequences in one call (history re-translation, QA jobs).
+        Results come back in request order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetStats(self, request, context):
+        """4. Unary: server metrics (per-stage latency histograms, counters, gauges),
+        the same samples the optional Prometheus endpoint serves.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Profile(self, request, context):
+        """5. Unary: sample the server's stacks for a while (optionally only one stream's
+        event-loop work) and return them as folded stacks. Needs --profile-dir.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_TranslationServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -53,11 +118,36 @@ def add_TranslationServiceServicer_to_server(servicer, server):
                     request_deserializer=expressora__pb2.LandmarkFrame.FromString,
                     response_serializer=expressora__pb2.RecognitionEvent.SerializeToString,
             ),
+            'StreamLandmarkBatches': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamLandmarkBatches,
+                    request_deserializer=expressora__pb2.LandmarkBatch.FromString,
+                    response_serializer=expressora__pb2.RecognitionEvent.SerializeToString,
+            ),
             'TranslateSequence': grpc.unary_unary_rpc_method_handler(
                     servicer.TranslateSequence,
                     request_deserializer=expressora__pb2.GlossSequence.FromString,
                     response_serializer=expressora__pb2.TranslationResult.SerializeToString,
             ),
+            'TranslateSequenceStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.TranslateSequenceStream,
+                    request_deserializer=expressora__pb2.GlossSequence.FromString,
+                    response_serializer=expressora__pb2.TranslationResult.SerializeToString,
+            ),
+            'TranslateSequences': grpc.unary_unary_rpc_method_handler(
+                    servicer.TranslateSequences,
+                    request_deserializer=expressora__pb2.GlossSequenceBatch.FromString,
+                    response_serializer=expressora__pb2.TranslationResultBatch.SerializeToString,
+            ),
+            'GetStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetStats,
+                    request_deserializer=expressora__pb2.StatsRequest.FromString,
+                    response_serializer=expressora__pb2.StatsResponse.SerializeToString,
+            ),
+            'Profile': grpc.unary_unary_rpc_method_handler(
+                    servicer.Profile,
+                    request_deserializer=expressora__pb2.ProfileRequest.FromString,
+                    response_serializer=expressora__pb2.ProfileResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'expressora.TranslationService', rpc_method_handlers)
@@ -86,6 +176,23 @@ class TranslationService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def StreamLandmarkBatches(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/expressora.TranslationService/StreamLandmarkBatches',
+            expressora__pb2.LandmarkBatch.SerializeToString,
+            expressora__pb2.RecognitionEvent.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def TranslateSequence(request,
             target,
@@ -102,3 +209,71 @@ class TranslationService(object):
             expressora__pb2.TranslationResult.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def TranslateSequenceStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/expressora.TranslationService/TranslateSequenceStream',
+            expressora__pb2.GlossSequence.SerializeToString,
+            expressora__pb2.TranslationResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def TranslateSequences(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/expressora.TranslationService/TranslateSequences',
+            expressora__pb2.GlossSequenceBatch.SerializeToString,
+            expressora__pb2.TranslationResultBatch.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/expressora.TranslationService/GetStats',
+            expressora__pb2.StatsRequest.SerializeToString,
+            expressora__pb2.StatsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Profile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/expressora.TranslationService/Profile',
+            expressora__pb2.ProfileRequest.SerializeToString,
+            expressora__pb2.ProfileResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
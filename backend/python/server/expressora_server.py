@@ -1,15 +1,20 @@
 """
 Expressora gRPC Server for landmark streaming architecture.
 Handles bidirectional streaming of landmarks and returns translation events.
+
+Runs on grpc.aio: each stream is a coroutine on the event loop, so idle or slow
+signers no longer pin a server thread. Blocking classifier and translator calls
+are pushed to bounded thread pools.
 """
 import argparse
+import asyncio
 import logging
 import time
 import sys
 import os
 from concurrent import futures
+from typing import List, Optional
 import grpc
-import numpy as np
 
 # Add server directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,10 +24,30 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import expressora_pb2
 import expressora_pb2_grpc
 
-from landmark_buffer import HandsDownDetector
 from mock_classifier import MockClassifier
-from grammar_engine import GrammarEngine
-from translation_service import TranslationService
+from tflite_classifier import TFLiteClassifier
+from inference_scheduler import InferenceScheduler
+from frame_validation import FrameValidation, decode_landmarks
+from landmark_codec import (
+    FrameDecodeError, SUPPORTED_ENCODINGS, FRAME_ENCODING_METADATA_KEY,
+    FRAME_ENCODINGS_KEY, negotiate_encoding,
+)
+from translation_service import (
+    TranslationService, SOURCE_LOCAL, SOURCE_CACHE, DEFAULT_BREAKER_FAILURE_THRESHOLD, DEFAULT_BREAKER_RECOVERY_TIMEOUT,
+)
+from offline_translator import load_offline_translator, DEFAULT_WEIGHTS_PATH
+from gemini_dispatcher import DEFAULT_GEMINI_RPM, DEFAULT_MAX_PROMPT_BATCH
+from translation_cache import TranslationCache, DEFAULT_MAX_ENTRIES, DEFAULT_TTL, make_key
+from session import SessionRegistry, SessionLimitError, SESSION_ID_METADATA_KEY, AUTO_TRANSLATE_METADATA_KEY
+from landmark_buffer import LandmarkBuffer
+from frame_queue import (
+    FrameQueue, DROP_REASONS, DEFAULT_FRAME_QUEUE_SIZE, DEFAULT_MAX_FRAME_AGE_MS, DEFAULT_FRAME_SKIP,
+)
+from speculative_translation import PrefixSpeculator, DEFAULT_MAX_IN_FLIGHT
+from metrics import ServerMetrics, MetricsHttpServer
+from frame_tracing import FrameTrace, FrameTracer, DEFAULT_TRACE_SAMPLE_EVERY, capture_to_server_ms
+from flow_control import FlowController, FlowState, FLOW_CONTROL_METADATA_KEY, LEVEL_NAMES, DEFAULT_LATENCY_BUDGET_MS
+from stack_profiler import Profiler, ProfileInProgressError, DEFAULT_INTERVAL_MS, DEFAULT_PROFILE_SECONDS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,6 +55,35 @@ logger = logging.getLogger(__name__)
 # Confidence threshold for accepting gloss predictions
 CONFIDENCE_THRESHOLD = 0.90  # 90% confidence required
 
+# Default sizes for the blocking-work thread pools
+DEFAULT_CLASSIFIER_WORKERS = 4
+DEFAULT_TRANSLATOR_WORKERS = 8
+
+# Cross-stream micro-batching defaults
+DEFAULT_MAX_BATCH_SIZE = 16
+DEFAULT_MAX_BATCH_WAIT_MS = 5.0
+
+# Classifier backends selectable with --classifier
+CLASSIFIER_CHOICES = ("tflite", "mock")
+
+# Translation cache defaults (size 0 disables the cache)
+DEFAULT_TRANSLATION_CACHE_SIZE = DEFAULT_MAX_ENTRIES
+DEFAULT_TRANSLATION_CACHE_TTL = DEFAULT_TTL
+
+# TranslateSequences limits
+MAX_BATCH_SEQUENCES = 1000               # Sequences accepted per call
+DEFAULT_BATCH_TRANSLATE_CONCURRENCY = 4  # Uncached sequences translated at once per call
+
+# Session registry defaults
+DEFAULT_MAX_SESSIONS = 500
+DEFAULT_SESSION_IDLE_TIMEOUT = 60.0  # seconds without frames before eviction
+
+# Prometheus endpoint defaults (port 0 disables it; GetStats is always available)
+DEFAULT_METRICS_PORT = 0
+DEFAULT_METRICS_HOST = "127.0.0.1"
+
+EVENT_TYPE_NAMES = {value: name for name, value in expressora_pb2.RecognitionEvent.Type.items()}
+
 
 class ExpressoraTranslationServicer(expressora_pb2_grpc.TranslationServiceServicer):
     """
@@ -37,249 +91,739 @@ class ExpressoraTranslationServicer(expressora_pb2_grpc.TranslationServiceServic
     Handles bidirectional streaming of landmarks and returns translation events.
     """
     
-    def __init__(self):
-        self.classifier = MockClassifier(processing_delay=0.05)
-        self.translator = TranslationService()  # Hybrid translation (Gemini + Offline fallback)
-        self.hands_down_detector = HandsDownDetector(threshold_y=0.9, duration_threshold=1.5)
+    def __init__(self, classifier_workers: int = DEFAULT_CLASSIFIER_WORKERS,
+                 translator_workers: int = DEFAULT_TRANSLATOR_WORKERS,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 session_idle_timeout: float = DEFAULT_SESSION_IDLE_TIMEOUT,
+                 classifier: str = "tflite",
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_batch_wait_ms: float = DEFAULT_MAX_BATCH_WAIT_MS,
+                 translation_cache_size: int = DEFAULT_TRANSLATION_CACHE_SIZE,
+                 translation_cache_ttl: float = DEFAULT_TRANSLATION_CACHE_TTL,
+                 translation_cache_db: str = None,
+                 gemini_failure_threshold: int = DEFAULT_BREAKER_FAILURE_THRESHOLD,
+                 gemini_recovery_timeout: float = DEFAULT_BREAKER_RECOVERY_TIMEOUT,
+                 translation_hedge_ms: float = 0.0,
+                 translation_model: str = DEFAULT_WEIGHTS_PATH,
+                 batch_translate_concurrency: int = DEFAULT_BATCH_TRANSLATE_CONCURRENCY,
+                 gemini_rpm: float = DEFAULT_GEMINI_RPM,
+                 gemini_max_prompt_batch: int = DEFAULT_MAX_PROMPT_BATCH,
+                 speculative_translation: bool = False,
+                 trace_file: str = None,
+                 trace_sample_every: int = DEFAULT_TRACE_SAMPLE_EVERY,
+                 profile_dir: str = None,
+                 frame_queue_size: int = DEFAULT_FRAME_QUEUE_SIZE,
+                 max_frame_age_ms: float = DEFAULT_MAX_FRAME_AGE_MS,
+                 frame_skip: int = DEFAULT_FRAME_SKIP,
+                 flow_latency_budget_ms: float = DEFAULT_LATENCY_BUDGET_MS):
+        """
+        Args:
+            classifier_workers: Threads available for blocking classify_hands/classify_face calls
+            translator_workers: Threads available for blocking TranslationService calls
+            max_sessions: Maximum number of concurrently open landmark streams
+            session_idle_timeout: Seconds without frames before a stream is evicted
+            classifier: Gesture classifier backend ("tflite" or "mock")
+            max_batch_size: Maximum frames per batched classify_hands call
+            max_batch_wait_ms: Maximum time a frame waits for others to join its batch
+            translation_cache_size: Translations kept in memory (0 disables caching)
+            translation_cache_ttl: Seconds a cached translation stays valid in memory
+            translation_cache_db: Optional SQLite file for a persistent cache tier
+            gemini_failure_threshold: Consecutive Gemini failures that open the circuit breaker
+            gemini_recovery_timeout: Seconds the breaker skips Gemini before probing it again
+            translation_hedge_ms: Hedged translation budget for Gemini (0 = wait for Gemini)
+            translation_model: T5 weights (.npz) for offline translation; local rules if missing
+            batch_translate_concurrency: Uncached sequences a TranslateSequences call translates at once
+            gemini_rpm: Gemini requests per minute; requests queued meanwhile share a prompt (0 = unlimited)
+            gemini_max_prompt_batch: Maximum gloss sequences packed into one Gemini prompt
+            speculative_translation: Translate each stream's gloss prefix in the background from
+                the cache or offline model (never spends Gemini quota)
+            trace_file: Chrome trace-event JSON file for sampled frame traces (None = off)
+            trace_sample_every: Trace every N-th frame of each stream
+            profile_dir: Directory for Profile RPC output (None disables the RPC)
+            frame_queue_size: Messages queued per stream before the oldest is dropped
+            max_frame_age_ms: Queued frames older than this are dropped (0 = no limit)
+            frame_skip: While frames are queued, drop every k-th arrival (0 = off)
+            flow_latency_budget_ms: classify_hands latency at which FLOW_CONTROL advises slowing down
+        """
+        self.classifier = self._create_classifier(classifier)
+        
+        # Repeated phrases are served from the cache instead of a Gemini round trip
+        self.translation_cache = None
+        if translation_cache_size > 0:
+            self.translation_cache = TranslationCache(
+                max_entries=translation_cache_size, ttl=translation_cache_ttl, db_path=translation_cache_db
+            )
+        # Hybrid translation (Gemini + Offline fallback)
+        self.translator = TranslationService(
+            cache=self.translation_cache,
+            breaker_failure_threshold=gemini_failure_threshold,
+            breaker_recovery_timeout=gemini_recovery_timeout,
+            hedge_budget_ms=translation_hedge_ms,
+            offline_translator=load_offline_translator(translation_model),
+            gemini_rpm=gemini_rpm,
+            gemini_max_prompt_batch=gemini_max_prompt_batch,
+        )
+        self._batch_translate_concurrency = max(1, batch_translate_concurrency)
+        # Streams translate their gloss prefix ahead of the TranslateSequence call on their
+        # own small pool, from the cache or offline model only, so speculation never holds
+        # translator threads or Gemini quota that real requests are waiting for
+        self.speculator = None
+        self._speculation_executor = None
+        if speculative_translation:
+            self._speculation_executor = futures.ThreadPoolExecutor(
+                max_workers=DEFAULT_MAX_IN_FLIGHT, thread_name_prefix="speculation"
+            )
+            self.speculator = PrefixSpeculator(
+                self._translate_speculative, max_in_flight=DEFAULT_MAX_IN_FLIGHT, usable=self._speculation_usable,
+            )
         
-        # Step 2: Multi-Frame Validation - Track recent detections for temporal consistency
-        self._recent_gloss_detections = []  # Buffer for recent detections
+        # Bounded executors: the event loop never blocks on model or cloud calls,
+        # and a burst of streams cannot spawn unbounded threads.
+        self._classifier_executor = futures.ThreadPoolExecutor(
+            max_workers=classifier_workers, thread_name_prefix="classifier"
+        )
+        self._translator_executor = futures.ThreadPoolExecutor(
+            max_workers=translator_workers, thread_name_prefix="translator"
+        )
+        
+        # classify_hands requests from all streams are batched into one classifier call
+        self.scheduler = InferenceScheduler(
+            self.classifier, self._classifier_executor,
+            max_batch_size=max_batch_size, max_wait_ms=max_batch_wait_ms,
+        )
+        
+        # Per-stream state (hands-down timer, validation buffer, tone tracking) lives in
+        # Session objects so concurrent streams never share mutable state.
+        self.sessions = SessionRegistry(max_sessions=max_sessions, idle_timeout=session_idle_timeout)
+        
+        # Step 2: Multi-Frame Validation - Require N consistent frames per stream
         self._min_consistent_frames = 2  # Require 2 frames for stability (reduced from 3 for better responsiveness)
         
+        # Latest-wins frame queue per stream: stale frames are dropped when processing falls behind
+        self._frame_queue_size = max(1, frame_queue_size)
+        self._max_frame_age_ms = max_frame_age_ms
+        self._frame_skip = frame_skip
+        # FLOW_CONTROL advice for opted-in streams, from queue depth, drops and inference latency
+        self.flow_controller = FlowController(
+            queue_size=self._frame_queue_size, latency_budget_ms=flow_latency_budget_ms,
+            face_optional=not getattr(self.classifier, "uses_face_features", True),
+        )
+        
         # Motion detection removed - client-side only (if client sends data, assume motion is happening)
         
-        # TONE event optimization - trigger only after gloss registration
-        self._last_tone_event = None
-        self._last_gloss_yielded = False  # Track if a GLOSS was just yielded
+        # Sampled per-frame latency traces (EventTiming is echoed on every frame event regardless)
+        self.tracer = FrameTracer(trace_file, trace_sample_every) if trace_file else None
+        # On-demand stack sampling (Profile RPC); idle until a profile is requested
+        self.profiler = Profiler(profile_dir) if profile_dir else None
+        
+        # Per-stage latencies and counters, read by GetStats and the optional /metrics endpoint
+        self.metrics = ServerMetrics()
+        self._register_metric_collectors()
+        self._frames_dropped = {reason: self.metrics.frames_dropped.labels(reason) for reason in DROP_REASONS}
     
-    def _calculate_hand_span(self, hand_chunk):
+    def _register_metric_collectors(self):
+        """Export the components' stats() counters next to the servicer's own metrics."""
+        registry = self.metrics.registry
+        self.metrics.active_streams.set_function(lambda: len(self.sessions))
+        registry.add_collector("inference", self.scheduler.stats)
+        registry.add_collector("flow_control", self.flow_controller.stats)
+        registry.add_collector("translation_fallbacks", self.translator.fallback_stats)
+        registry.add_collector("translation_coalescing", self.translator.single_flight.stats)
+        registry.add_collector("gemini_breaker", self.translator.breaker.stats)
+        if self.translator.dispatcher is not None:
+            registry.add_collector("gemini_dispatcher", self.translator.dispatcher.stats)
+        if self.speculator is not None:
+            registry.add_collector("speculative_translation", self.speculator.stats)
+        if self.translator.hedge_budget > 0:
+            registry.add_collector("hedged_translation", self.translator.hedge_stats)
+        if self.translation_cache is not None:
+            registry.add_collector("translation_cache", self.translation_cache.stats)
+        if self.tracer is not None:
+            registry.add_collector("frame_tracing", self.tracer.stats)
+    
+    @staticmethod
+    def _create_classifier(kind: str):
         """
-        Calculate hand span: Euclidean distance from wrist to middle finger tip.
-        
-        Args:
-            hand_chunk: List of 63 floats representing one hand [x,y,z, x,y,z...]
-                       Wrist is at indices 0-2, Middle finger tip is at indices 36-38
-        
-        Returns:
-            Span value (normalized 0.0-1.0). Returns 0.0 if chunk is invalid.
+        Create the gesture classifier.
+        Falls back to MockClassifier if the TFLite model or runtime is unavailable.
         """
-        if len(hand_chunk) < 39:
-            return 0.0
-        wrist = np.array(hand_chunk[0:3])
-        mid_tip = np.array(hand_chunk[36:39])
-        return np.linalg.norm(wrist - mid_tip)
+        if kind == "tflite":
+            try:
+                return TFLiteClassifier()
+            except Exception as e:
+                logger.warning(f"Failed to load TFLite classifier: {e}. Using MockClassifier.")
+        return MockClassifier(processing_delay=0.05)
+    
+    async def _run_classifier(self, fn, *args):
+        """Run a blocking classifier call on the classifier thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._classifier_executor, fn, *args)
+    
+    async def _run_translator(self, fn, *args):
+        """Run a blocking translator call on the translator thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._translator_executor, fn, *args)
+    
+    async def _translate_speculative(self, glosses, tone):
+        """Background translation of a stream's gloss prefix (cache or offline only, own pool)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._speculation_executor, self.translator.translate_offline, glosses, tone
+        )
+    
+    def _speculation_usable(self, result) -> bool:
+        """A speculative result answers a request only if translate() would not call Gemini for it."""
+        return result[3] == SOURCE_CACHE or not self.translator.gemini_usable
+    
+    @staticmethod
+    def _deadline(context) -> Optional[float]:
+        """Absolute time.monotonic() deadline of the RPC, or None if the client set none."""
+        remaining = context.time_remaining()
+        return time.monotonic() + remaining if remaining is not None else None
+    
+    def shutdown(self):
+        """Release the executor threads (pending work is allowed to finish)."""
+        self._classifier_executor.shutdown(wait=False)
+        self._translator_executor.shutdown(wait=False)
+        if self._speculation_executor is not None:
+            self._speculation_executor.shutdown(wait=False)
+        logger.info(f"Stage latency stats: {self.metrics.stage_summary()}")
+        logger.info(f"Inference scheduler stats: {self.scheduler.stats()}")
+        logger.info(f"Translation fallback stats: {self.translator.fallback_stats()}")
+        logger.info(f"Translation coalescing stats: {self.translator.single_flight.stats()}")
+        logger.info(f"Gemini circuit breaker stats: {self.translator.breaker.stats()}")
+        if self.translator.dispatcher is not None:
+            logger.info(f"Gemini dispatcher stats: {self.translator.dispatcher.stats()}")
+        if self.speculator is not None:
+            logger.info(f"Speculative translation stats: {self.speculator.stats()}")
+        if self.translator.hedge_budget > 0:
+            logger.info(f"Hedged translation stats: {self.translator.hedge_stats()}")
+        self.translator.close()
+        if self.translation_cache is not None:
+            logger.info(f"Translation cache stats: {self.translation_cache.stats()}")
+            self.translation_cache.close()
+        if self.tracer is not None:
+            self.tracer.close()
 
-    def StreamLandmarks(self, request_iterator, context):
+    async def StreamLandmarks(self, request_iterator, context):
         """
         Stateless bidirectional streaming RPC handler.
         
         Receives: stream of LandmarkFrame
         Returns: stream of RecognitionEvent (GLOSS, TONE, or HANDS_DOWN events)
         
-        This method is stateless - it does not buffer glosses or auto-translate.
-        The client manages the gloss list and triggers translation separately.
+        By default the server does not buffer glosses or auto-translate: the client
+        manages the gloss list and triggers translation separately. Clients that send
+        x-expressora-auto-translate: 1 also receive TRANSLATION events (see _auto_translate_step).
+        Per-stream detection state is kept in a Session registered for the call.
+        """
+        async for event in self._stream_events(request_iterator, context, batched=False):
+            yield event
+    
+    async def StreamLandmarkBatches(self, request_iterator, context):
         """
-        logger.info("🟢 New landmark stream started - waiting for frames...")
+        Bidirectional streaming RPC handler for multi-frame batches.
         
-        # Reset hands-down detector for new stream
-        self.hands_down_detector.reset()
+        Receives: stream of LandmarkBatch (N timestamped frames per message)
+        Returns: stream of RecognitionEvent, the same events StreamLandmarks would emit
+        
+        Each batch is processed as one unit: all frames are validated, their
+        classification requests reach the scheduler together, and events are
+        emitted in frame order. Clients trade a few milliseconds of latency for
+        far fewer messages and handler wakeups.
+        """
+        async for event in self._stream_events(request_iterator, context, batched=True):
+            yield event
+    
+    async def _stream_events(self, request_iterator, context, batched: bool):
+        """
+        Shared session handling for StreamLandmarks and StreamLandmarkBatches.
         
+        Args:
+            request_iterator: Incoming LandmarkFrame or LandmarkBatch messages
+            context: gRPC servicer context
+            batched: True if messages are LandmarkBatch
+        """
         try:
-            frame_count = 0
-            for landmark_frame in request_iterator:
-                if frame_count == 0:
-                    logger.info("✅ First landmark frame received!")
-                frame_count += 1
-                current_time = time.time()
-                
-                # Log frame reception for debugging
-                hand_count = len(landmark_frame.hands) // 63 if landmark_frame.hands else 0
-                face_count = len(landmark_frame.face) // 3 if landmark_frame.face else 0
-                pose_count = len(landmark_frame.pose) // 3 if landmark_frame.pose else 0
-                
-                if frame_count <= 5 or frame_count % 30 == 0:
-                    logger.info(f"📥 Received frame #{frame_count}: hands={hand_count}, face={face_count}, pose={pose_count}")
-                
-                # Extract hand landmarks for hands-down detection
-                hand_landmarks = list(landmark_frame.hands) if landmark_frame.hands else []
-                hand_count = len(hand_landmarks) // 63 if hand_landmarks else 0  # 21 landmarks * 3 coordinates per hand
+            session = self.sessions.open(peer=context.peer())
+        except SessionLimitError as e:
+            logger.warning(f"🚫 Rejecting landmark stream: {e}")
+            self.metrics.streams_rejected.inc()
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        self.metrics.streams_started.inc()
+        session.task = asyncio.current_task()
+        session.classifier_window = self.classifier.create_window()
+        
+        # Frame encoding negotiation: advertise the packed encodings and confirm the
+        # client's choice. Clients that send no metadata keep the repeated fields.
+        metadata = dict(context.invocation_metadata() or ())
+        session.frame_encoding = negotiate_encoding(metadata.get(FRAME_ENCODING_METADATA_KEY, ""))
+        # Opt-in: buffer validated glosses and push TRANSLATION events on this stream
+        auto_translate = metadata.get(AUTO_TRANSLATE_METADATA_KEY, "").strip().lower() in ("1", "true", "on")
+        if auto_translate:
+            session.gloss_buffer = LandmarkBuffer()
+        # Opt-in: FLOW_CONTROL events asking the client to lower its frame rate under load
+        flow_control = metadata.get(FLOW_CONTROL_METADATA_KEY, "").strip().lower() in ("1", "true", "on")
+        if flow_control:
+            session.flow = FlowState()
+        await context.send_initial_metadata((
+            (FRAME_ENCODINGS_KEY, ",".join(SUPPORTED_ENCODINGS)),
+            (FRAME_ENCODING_METADATA_KEY, session.frame_encoding),
+            (SESSION_ID_METADATA_KEY, session.session_id),
+            (AUTO_TRANSLATE_METADATA_KEY, "1" if auto_translate else "0"),
+            (FLOW_CONTROL_METADATA_KEY, "1" if flow_control else "0"),
+        ))
+        
+        logger.info(f"🟢 New landmark stream started (session {session.session_id}, "
+                    f"encoding={session.frame_encoding}, batched={batched}, auto_translate={auto_translate}, "
+                    f"flow_control={flow_control}, {len(self.sessions)} active) - waiting for frames...")
+        
+        rpc = "StreamLandmarkBatches" if batched else "StreamLandmarks"
+        message_seconds = self.metrics.message[rpc]
+        emit_seconds = self.metrics.stage["emit"]
+        # Frames are read off the stream by their own task, so a slow classifier drops
+        # old frames from the queue instead of letting them pile up in gRPC's buffers
+        session.frame_queue = FrameQueue(
+            max_messages=self._frame_queue_size, max_age_ms=self._max_frame_age_ms,
+            skip_every=self._frame_skip, on_drop=self._count_drop,
+        )
+        receiver = asyncio.create_task(
+            self._receive_frames(session, request_iterator, batched, self.metrics.frames_received[rpc])
+        )
+        try:
+            while True:
+                queued = await session.frame_queue.take()
+                if not queued:
+                    break
                 
-                # Check hands-down detection (informational only, no action)
-                hands_down = self.hands_down_detector.check(hand_landmarks, current_time)
-                if hands_down:
-                    # Yield HANDS_DOWN event (informational only)
-                    hands_down_event = expressora_pb2.RecognitionEvent(
-                        type=expressora_pb2.RecognitionEvent.Type.HANDS_DOWN,
-                        label="hands_down",
-                        confidence=1.0
+                started = time.perf_counter()
+                events = await self._process_frames(session, queued)
+                events += self._finished_translations(session)
+                if session.flow is not None:
+                    # Backlog in messages, so a client sending large batches is not mistaken for a slow server
+                    advice = self.flow_controller.update(
+                        session.flow, session.frame_queue.last_taken, session.frame_queue.dropped
                     )
-                    logger.info("👋 HANDS_DOWN event detected (informational only)")
-                    yield hands_down_event
-                    self.hands_down_detector.reset()  # Reset after yielding
-                
-                # Step 1: Hand Presence Validation - Validate that hand landmarks actually exist before processing GLOSS events
-                if hand_count == 0:
-                    # No hands detected, skip GLOSS classification
-                    # Still process TONE events (face detection)
-                    if frame_count <= 5 or frame_count % 30 == 0:
-                        logger.debug("⚠️ No hands detected, skipping GLOSS classification")
-                    pass
-                else:
-                    # Additional validation: Check landmark quality
-                    # Ensure landmarks are not all zeros or invalid
-                    valid_hand_detected = False
-                    for i in range(hand_count):
-                        hand_start = i * 63
-                        hand_end = hand_start + 63
-                        if hand_end > len(hand_landmarks):
-                            continue
-                        hand_data = hand_landmarks[hand_start:hand_end]
-                        
-                        # Check if hand has valid landmarks (not all zeros)
-                        non_zero_count = sum(1 for x in hand_data if abs(x) > 0.001)
-                        if non_zero_count >= 15:  # At least 15 valid landmarks
-                            valid_hand_detected = True
-                            break
-                    
-                    if not valid_hand_detected:
-                        if frame_count <= 5 or frame_count % 30 == 0:
-                            logger.debug(f"⚠️ Hand validation failed: insufficient valid landmarks (hands={hand_count})")
-                        gloss_label, gloss_confidence = None, 0.0
-                        self._previous_hand_landmarks = None
-                    elif valid_hand_detected:
-                        # Geometric Sanity Check: Filter ghost hands using hand span
-                        # Ghost hands are typically collapsed to a tiny point (span < 0.06)
-                        # Real hands, even far away, rarely drop below 5-6% of screen size
-                        # OPTIMIZATION: Check pose wrist confidence first - if high (>0.8), bypass geometric check
-                        pose_landmarks = list(landmark_frame.pose) if landmark_frame.pose else []
-                        pose_wrist_confidence = 0.0
-                        bypass_geometric_check = False
-                        
-                        if len(pose_landmarks) >= 51:  # Pose has 33 landmarks * 3 coords = 99, but we need index 16 (right wrist) = 48-50
-                            # Right wrist is at index 16 in pose landmarks (x, y, z, visibility, presence)
-                            # MediaPipe pose format: [x, y, z, visibility, presence] per landmark
-                            # For normalized coordinates, we check if wrist position is valid
-                            right_wrist_idx = 16 * 3  # x coordinate of right wrist
-                            if right_wrist_idx + 2 < len(pose_landmarks):
-                                # Check if wrist position is non-zero (indicates detection)
-                                wrist_x = pose_landmarks[right_wrist_idx]
-                                wrist_y = pose_landmarks[right_wrist_idx + 1]
-                                wrist_z = pose_landmarks[right_wrist_idx + 2]
-                                # If wrist is detected (non-zero), assume high confidence
-                                if abs(wrist_x) > 0.001 or abs(wrist_y) > 0.001:
-                                    pose_wrist_confidence = 0.9  # High confidence if detected
-                                    bypass_geometric_check = True
-                                    if frame_count <= 5 or frame_count % 30 == 0:
-                                        logger.debug(f"✅ Pose wrist detected - bypassing geometric check (confidence: {pose_wrist_confidence:.2f})")
-                        
-                        max_span = 0.0
-                        valid_span_found = False
-                        
-                        if not bypass_geometric_check:
-                            # Perform geometric check with relaxed threshold (0.06 instead of 0.08)
-                            for i in range(hand_count):
-                                hand_start = i * 63
-                                hand_end = hand_start + 63
-                                if hand_end > len(hand_landmarks):
-                                    continue
-                                hand_chunk = hand_landmarks[hand_start:hand_end]
-                                span = self._calculate_hand_span(hand_chunk)
-                                max_span = max(max_span, span)
-                                
-                                # Early exit: if any hand passes, we're done
-                                if span >= 0.06:  # Relaxed threshold from 0.08 to 0.06
-                                    valid_span_found = True
-                                    if frame_count <= 5 or frame_count % 30 == 0:
-                                        logger.debug(f"✅ Hand {i+1} passed geometric check (span: {span:.4f} >= 0.06)")
-                                    break  # Early exit - don't check remaining hands
-                        else:
-                            # Pose confidence is high - trust the detection
-                            valid_span_found = True
-                        
-                        if not valid_span_found:
-                            # All detected hands are ghosts (collapsed/tiny)
-                            if frame_count <= 5 or frame_count % 30 == 0:
-                                logger.info(f"👻 Ghost Hand Ignored (max span: {max_span:.4f} < 0.06)")
-                            gloss_label, gloss_confidence = None, 0.0
-                        else:
-                            # Valid hand detected - proceed with GLOSS classification
-                            # Motion detection removed - client-side only (if client sends data, assume motion is happening)
-                            gloss_label, gloss_confidence = self.classifier.classify_hands(landmark_frame)
-                            if frame_count <= 5 or frame_count % 30 == 0:
-                                logger.debug(f"🔍 Classified hands: {gloss_label} (confidence: {gloss_confidence:.2f})")
-                    else:
-                        # No valid hand detected, skip GLOSS classification
-                        gloss_label, gloss_confidence = None, 0.0
-                        # Reset previous landmarks if no valid hand
-                        self._previous_hand_landmarks = None
-                
-                # Process GLOSS events with multi-frame validation
-                if gloss_label and gloss_confidence >= CONFIDENCE_THRESHOLD:
-                    # Step 2: Multi-Frame Validation - Require temporal consistency
-                    # Add current prediction to buffer
-                    self._recent_gloss_detections.append((gloss_label, gloss_confidence))
-                    
-                    # Keep buffer size manageable (keep last 5 frames)
-                    if len(self._recent_gloss_detections) > 5:
-                        self._recent_gloss_detections.pop(0)
-                    
-                    # Check if last N frames have the same gloss
-                    if len(self._recent_gloss_detections) >= self._min_consistent_frames:
-                        recent_labels = [item[0] for item in self._recent_gloss_detections[-self._min_consistent_frames:]]
-                        
-                        if len(set(recent_labels)) == 1:  # All same label
-                            # Validated - yield GLOSS event
-                            validated_label = recent_labels[0]
-                            gloss_event = expressora_pb2.RecognitionEvent(
-                                type=expressora_pb2.RecognitionEvent.Type.GLOSS,
-                                label=validated_label,
-                                confidence=gloss_confidence
-                            )
-                            logger.info(f"✅ GLOSS event (validated): {validated_label} (confidence: {gloss_confidence:.2f})")
-                            yield gloss_event
-                            # Clear buffer after successful yield
-                            self._recent_gloss_detections.clear()
-                            # Mark that a GLOSS was just yielded - trigger tone detection
-                            self._last_gloss_yielded = True
-                        else:
-                            # Inconsistent - reset buffer and reject
-                            if frame_count <= 5 or frame_count % 30 == 0:
-                                logger.debug(f"⏳ GLOSS pending validation: {gloss_label} (inconsistent across frames)")
-                            self._recent_gloss_detections.clear()
-                    else:
-                        # Not enough frames yet - wait for more
-                        if frame_count <= 5 or frame_count % 30 == 0:
-                            logger.debug(f"⏳ GLOSS pending validation: {gloss_label} (need {self._min_consistent_frames} consistent frames, have {len(self._recent_gloss_detections)})")
-                
-                # Classify face separately (for TONE events - NOT gloss words)
-                # OPTIMIZATION: Only process tone detection after a GLOSS event is successfully validated
-                if self._last_gloss_yielded:
-                    tone_label, tone_confidence = self.classifier.classify_face(landmark_frame)
-                    if tone_label and tone_confidence >= 0.80:  # Lower threshold for tone (0.80)
-                        # Only yield TONE if label changed (prevent duplicate tones)
-                        if self._last_tone_event != tone_label:
-                            # Yield TONE event
-                            tone_event = expressora_pb2.RecognitionEvent(
-                                type=expressora_pb2.RecognitionEvent.Type.TONE,
-                                label=tone_label,
-                                confidence=tone_confidence
-                            )
-                            logger.info(f"😊 TONE event: {tone_label} (confidence: {tone_confidence:.2f})")
-                            yield tone_event
-                            self._last_tone_event = tone_label
-                    # Reset flag after processing tone
-                    self._last_gloss_yielded = False
+                    if advice is not None:
+                        events.append(self._flow_control_event(session, advice))
+                message_seconds.observe(time.perf_counter() - started)
+                if events:
+                    started = time.perf_counter()
+                    for event in events:
+                        if event.HasField("timing"):
+                            self._mark_sent(event.timing)
+                        yield event
+                    emit_seconds.observe(time.perf_counter() - started)
+                    self._count_events(events)
+                if session.frame_traces:
+                    self._write_traces(session, time.time())
+            await receiver  # Re-raises the error that ended the receive loop, if any
+            
+            if session.gloss_buffer is not None:
+                # Client finished sending: translate what is left and deliver everything pending
+                self._start_auto_translation(session)
+                while session.auto_translations:
+                    event = await session.auto_translations.popleft()
+                    if event is not None:
+                        yield event
+                        self._count_events((event,))
                     
         except grpc.RpcError as e:
             # Client disconnected - this is normal, don't treat as error
             logger.info(f"Client disconnected from landmark stream: {e.code()}")
             # Do NOT set error code or raise - let function return gracefully
+        except asyncio.CancelledError:
+            if not session.evicted:
+                # Client went away - grpc.aio cancels the handler task
+                logger.info(f"Landmark stream cancelled (session {session.session_id})")
+                raise
+            # Evicted as idle by the registry - end the RPC with a status the client can see
+            await context.abort(grpc.StatusCode.CANCELLED, "Session evicted after idle timeout")
         except Exception as e:
             logger.error(f"Error in landmark stream: {e}", exc_info=True)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
+        finally:
+            if not receiver.done():
+                receiver.cancel()
+            elif not receiver.cancelled():
+                receiver.exception()  # Already raised above, or superseded by the handler's own error
+            for task in session.auto_translations:
+                task.cancel()
+            self.sessions.close(session.session_id)
+            if self.speculator is not None:
+                self.speculator.end_session(session.session_id)
+            logger.info(f"🔴 Landmark stream ended (session {session.session_id}, "
+                        f"{session.frame_count} frames, {session.frame_queue.dropped} dropped, "
+                        f"{len(self.sessions)} active)")
+    
+    async def _receive_frames(self, session, request_iterator, batched: bool, frames_received):
+        """
+        Read messages off the stream into the session's frame queue until the client stops sending.
+        
+        Args:
+            session: Session owning the stream
+            request_iterator: Incoming LandmarkFrame or LandmarkBatch messages
+            batched: True if messages are LandmarkBatch
+            frames_received: Counter series for received frames
+        """
+        queue = session.frame_queue
+        first = True
+        try:
+            async for message in request_iterator:
+                landmark_frames = message.frames if batched else (message,)
+                if not landmark_frames:
+                    continue
+                if first:
+                    logger.info("✅ First landmark frame received!")
+                    first = False
+                session.touch()
+                frames_received.inc(len(landmark_frames))
+                queue.put(landmark_frames, time.time())
+        finally:
+            queue.close()
+    
+    @staticmethod
+    def _flow_control_event(session, advice) -> expressora_pb2.RecognitionEvent:
+        """FLOW_CONTROL event carrying new load advice for the stream."""
+        logger.info(f"🚦 Flow control (session {session.session_id}): {LEVEL_NAMES[advice.level]} "
+                    f"({advice.reason}) - target_fps={advice.target_fps:g}, "
+                    f"face={advice.send_face}, pose={advice.send_pose}")
+        return expressora_pb2.RecognitionEvent(
+            type=expressora_pb2.RecognitionEvent.Type.FLOW_CONTROL,
+            label=LEVEL_NAMES[advice.level],
+            confidence=1.0,
+            flow_control=expressora_pb2.FlowControl(
+                target_fps=advice.target_fps,
+                send_face=advice.send_face,
+                send_pose=advice.send_pose,
+                level=advice.level,
+                reason=advice.reason,
+            ),
+        )
+    
+    def _count_drop(self, reason: str, count: int = 1):
+        """Count frames dropped from a stream's frame queue."""
+        self._frames_dropped[reason].inc(count)
+    
+    def _mark_sent(self, timing):
+        """Set EventTiming.sent and record the frame's capture-to-server and server latencies."""
+        sent = time.time()
+        timing.sent = sent * 1000.0
+        received = timing.server_receive / 1000.0
+        self.metrics.server_latency.observe(sent - received)
+        lag_ms = capture_to_server_ms(timing.frame_timestamp, received)
+        if lag_ms is not None:
+            self.metrics.capture_to_server.observe(max(0.0, lag_ms) / 1000.0)
+    
+    def _write_traces(self, session, emitted: float):
+        """Write the sampled frame traces of the message just handled."""
+        for trace in session.frame_traces:
+            self.tracer.record(session.session_id, trace, emitted if trace.events else None)
+        session.frame_traces.clear()
+    
+    def _count_events(self, events):
+        """Count sent RecognitionEvents by type."""
+        for event in events:
+            self.metrics.events.labels(EVENT_TYPE_NAMES.get(event.type, str(event.type))).inc()
+    
+    async def _process_frames(self, session, queued) -> List[expressora_pb2.RecognitionEvent]:
+        """
+        Run validation, classification and event logic for consecutive frames of one stream.
+        
+        Frames are validated first, then every frame that passes the hand checks is
+        classified with a single scheduler submission, then events are built in frame order.
+        With a windowed classifier every decoded frame is submitted (rejected ones without
+        their hands), so pauses age the stream's window instead of leaving old frames in it.
+        
+        Args:
+            session: Session owning the frames
+            queued: (LandmarkFrame, received time) pairs in capture order, from the frame queue
+        
+        Returns:
+            RecognitionEvents to send, in frame order
+        """
+        # Queued and batched frames are processed together; spread them back over time with
+        # their client timestamps so the hands-down timer sees the real capture timing.
+        arrival_time = time.time()
+        newest_timestamp = queued[-1][0].timestamp
+        
+        stage = self.metrics.stage
+        prepared = []  # (frame_count, validation, hands_down, classify, current_time, received, validated, trace)
+        to_classify = []
+        window = session.classifier_window
+        classified = 0
+        for landmark_frame, received in queued:
+            session.frame_count += 1
+            frame_count = session.frame_count
+            current_time = arrival_time
+            if landmark_frame.timestamp and newest_timestamp:
+                current_time -= max(0, newest_timestamp - landmark_frame.timestamp) / 1000.0
+            
+            # Decode and validate the frame once (vectorized over all hands)
+            started = time.perf_counter()
+            try:
+                hands, face, pose = decode_landmarks(landmark_frame)
+            except FrameDecodeError as e:
+                # Malformed packed payload - drop the frame, keep the stream alive
+                logger.warning(f"⚠️ Dropping malformed frame #{frame_count} (session {session.session_id}): {e}")
+                self.metrics.frames_dropped.labels("decode_error").inc()
+                continue
+            decoded = time.perf_counter()
+            stage["decode"].observe(decoded - started)
+            validation = FrameValidation(hands, face, pose, timestamp=landmark_frame.timestamp)
+            
+            if frame_count <= 5 or frame_count % 30 == 0:
+                logger.info(f"📥 Received frame #{frame_count}: hands={validation.hand_count}, "
+                            f"face={validation.face_count}, pose={len(validation.pose) // 3}")
+            
+            # Check hands-down detection (informational only, no action)
+            hands_down = session.hands_down_detector.check(validation.hands_flat, current_time)
+            if hands_down:
+                session.hands_down_detector.reset()  # Reset after detection
+            
+            classify = self._passes_hand_checks(validation, frame_count)
+            stage["validate"].observe(time.perf_counter() - decoded)
+            validated = time.time()
+            trace = None
+            if self.tracer is not None and self.tracer.sample(frame_count):
+                trace = FrameTrace(frame_count, landmark_frame.timestamp, received, validated)
+                session.frame_traces.append(trace)
+            prepared.append((frame_count, validation, hands_down, classify, current_time, received, validated, trace))
+            if classify:
+                to_classify.append(validation)
+                classified += 1
+            elif window is not None:
+                to_classify.append(validation.without_hands())
+        
+        # Motion detection removed - client-side only (if client sends data, assume motion is happening)
+        results = iter(())
+        if to_classify:
+            started = time.perf_counter()
+            results = iter(await self.scheduler.classify_hands_many(to_classify, window))
+            elapsed = time.perf_counter() - started
+            stage["classify_hands"].observe(elapsed)
+            self.flow_controller.observe_inference(elapsed)
+            self.metrics.frames_classified.inc(classified)
+        inferred = time.time()
+        
+        events = []
+        for frame_count, validation, hands_down, classify, current_time, received, validated, trace in prepared:
+            first_event = len(events)
+            if hands_down:
+                # HANDS_DOWN event (informational only)
+                logger.info("👋 HANDS_DOWN event detected (informational only)")
+                if self.speculator is not None:
+                    self.speculator.on_hands_down(session.session_id)
+                events.append(expressora_pb2.RecognitionEvent(
+                    type=expressora_pb2.RecognitionEvent.Type.HANDS_DOWN,
+                    label="hands_down",
+                    confidence=1.0
+                ))
+            
+            result = next(results) if classify or window is not None else None
+            gloss_label, gloss_confidence = result if classify else (None, 0.0)
+            if classify and (frame_count <= 5 or frame_count % 30 == 0):
+                logger.debug(f"🔍 Classified hands: {gloss_label} (confidence: {gloss_confidence:.2f})")
+            
+            gloss_event = self._validate_gloss(session, gloss_label, gloss_confidence, frame_count)
+            if gloss_event is not None:
+                events.append(gloss_event)
+            
+            tone_event = await self._detect_tone(session, validation)
+            if tone_event is not None:
+                events.append(tone_event)
+            
+            # A validated gloss also ran classify_face, so the frame's results are complete only now
+            frame_inferred = time.time() if gloss_event is not None else (inferred if classify else validated)
+            if len(events) > first_event:
+                self._stamp_timing(events[first_event:], validation.timestamp, received,
+                                   validated, frame_inferred)
+            if trace is not None:
+                trace.inferred = frame_inferred
+                trace.events = [EVENT_TYPE_NAMES.get(event.type, str(event.type)) for event in events[first_event:]]
+            
+            # After tone detection, so the prefix is translated with the tone this gloss set
+            if gloss_event is not None and self.speculator is not None:
+                self.speculator.on_gloss(session.session_id, gloss_event.label, session.last_tone_event)
+            
+            if session.gloss_buffer is not None:
+                self._auto_translate_step(session, gloss_event, hands_down, current_time)
+        
+        return events
     
-    def TranslateSequence(self, request, context):
+    @staticmethod
+    def _stamp_timing(events, capture_ms: int, received: float, validated: float, inferred: float):
+        """Attach the producing frame's EventTiming (server times as epoch milliseconds)."""
+        for event in events:
+            timing = event.timing
+            timing.frame_timestamp = capture_ms
+            timing.server_receive = received * 1000.0
+            timing.validated = validated * 1000.0
+            timing.inferred = inferred * 1000.0
+    
+    def _auto_translate_step(self, session, gloss_event: Optional[expressora_pb2.RecognitionEvent],
+                             hands_down: bool, current_time: float):
+        """
+        Auto-translate mode: buffer a validated gloss and start a translation when the
+        buffer holds max_glosses, no new gloss arrived for silence_threshold seconds,
+        or the hands went down.
+        """
+        buffer = session.gloss_buffer
+        # Same de-duplication as the client: a gloss repeated back to back counts once
+        if gloss_event is not None and gloss_event.label != buffer.last_gloss:
+            buffer.add_frame(None, gloss_event.label, current_time)
+        if hands_down or buffer.should_emit(current_time):
+            self._start_auto_translation(session)
+    
+    def _start_auto_translation(self, session):
+        """Translate the buffered glosses in the background and clear the buffer."""
+        buffer = session.gloss_buffer
+        if buffer.is_empty():
+            return
+        glosses = [gloss for _, gloss, _ in buffer.get_buffer()]
+        tone = session.last_tone_event or "/neutral"
+        buffer.clear()
+        logger.info(f"🔁 Auto-translating {len(glosses)} glosses (session {session.session_id})")
+        session.auto_translations.append(
+            asyncio.create_task(self._auto_translate(session.session_id, glosses, tone))
+        )
+    
+    async def _auto_translate(self, session_id: str, glosses: List[str],
+                              tone: str) -> Optional[expressora_pb2.RecognitionEvent]:
+        """Translate glosses (reusing a speculative result if there is one) into a TRANSLATION event."""
+        try:
+            result = None
+            if self.speculator is not None:
+                result = await self.speculator.lookup(session_id, glosses, tone)
+            if result is None:
+                result = await self._run_translator(self.translator.translate, glosses, tone)
+        except Exception as e:
+            logger.error(f"Auto-translation failed (session {session_id}): {e}", exc_info=True)
+            self.metrics.translation_errors.labels("AutoTranslate").inc()
+            return None
+        english, filipino, result_tone, source = result
+        self.metrics.record_translation("AutoTranslate", source)
+        return expressora_pb2.RecognitionEvent(
+            type=expressora_pb2.RecognitionEvent.Type.TRANSLATION,
+            label=english,
+            confidence=1.0,
+            translation=expressora_pb2.TranslationResult(
+                sentence=english,
+                sentence_filipino=filipino,
+                tone=result_tone,
+                source=source,
+            ),
+        )
+    
+    @staticmethod
+    def _finished_translations(session) -> List[expressora_pb2.RecognitionEvent]:
+        """Pop TRANSLATION events of auto-translations that have completed, in start order."""
+        events = []
+        pending = session.auto_translations
+        while pending and pending[0].done():
+            event = pending.popleft().result()
+            if event is not None:
+                events.append(event)
+        return events
+    
+    @staticmethod
+    def _passes_hand_checks(validation, frame_count: int) -> bool:
+        """Hand presence and ghost-hand checks that gate GLOSS classification."""
+        hand_count = validation.hand_count
+        
+        # Step 1: Hand Presence Validation - Validate that hand landmarks actually exist before processing GLOSS events
+        if hand_count == 0:
+            # No hands detected, skip GLOSS classification
+            # Still process TONE events (face detection)
+            if frame_count <= 5 or frame_count % 30 == 0:
+                logger.debug("⚠️ No hands detected, skipping GLOSS classification")
+            return False
+        if not validation.has_valid_hand:
+            # Landmarks are all zeros or too sparse (< 15 non-zero coordinates per hand)
+            if frame_count <= 5 or frame_count % 30 == 0:
+                logger.debug(f"⚠️ Hand validation failed: insufficient valid landmarks (hands={hand_count})")
+            return False
+        
+        # Geometric Sanity Check: Filter ghost hands using hand span
+        # Ghost hands are typically collapsed to a tiny point (span < 0.06)
+        # Real hands, even far away, rarely drop below 5-6% of screen size
+        # OPTIMIZATION: If the pose right wrist is detected, bypass the geometric check
+        if validation.pose_wrist_detected:
+            if frame_count <= 5 or frame_count % 30 == 0:
+                logger.debug("✅ Pose wrist detected - bypassing geometric check")
+            return True
+        if not validation.passes_span_check:
+            # All detected hands are ghosts (collapsed/tiny)
+            if frame_count <= 5 or frame_count % 30 == 0:
+                logger.info(f"👻 Ghost Hand Ignored (max span: {validation.max_span:.4f} < 0.06)")
+            return False
+        return True
+    
+    def _validate_gloss(self, session, gloss_label: Optional[str], gloss_confidence: float,
+                        frame_count: int) -> Optional[expressora_pb2.RecognitionEvent]:
+        """Multi-frame validation: returns a GLOSS event once the prediction is stable."""
+        if not gloss_label or gloss_confidence < CONFIDENCE_THRESHOLD:
+            return None
+        
+        # Step 2: Multi-Frame Validation - Require temporal consistency
+        # Add current prediction to buffer (deque keeps the last 5 frames)
+        recent = session.recent_gloss_detections
+        recent.append((gloss_label, gloss_confidence))
+        
+        # Check if last N frames have the same gloss
+        if len(recent) < self._min_consistent_frames:
+            # Not enough frames yet - wait for more
+            if frame_count <= 5 or frame_count % 30 == 0:
+                logger.debug(f"⏳ GLOSS pending validation: {gloss_label} (need {self._min_consistent_frames} consistent frames, have {len(recent)})")
+            return None
+        
+        recent_labels = [recent[-i][0] for i in range(self._min_consistent_frames, 0, -1)]
+        if len(set(recent_labels)) != 1:
+            # Inconsistent - reset buffer and reject
+            if frame_count <= 5 or frame_count % 30 == 0:
+                logger.debug(f"⏳ GLOSS pending validation: {gloss_label} (inconsistent across frames)")
+            recent.clear()
+            return None
+        
+        # Validated - emit GLOSS event
+        validated_label = recent_labels[0]
+        logger.info(f"✅ GLOSS event (validated): {validated_label} (confidence: {gloss_confidence:.2f})")
+        # Clear buffer after successful validation
+        recent.clear()
+        # Mark that a GLOSS was just emitted - trigger tone detection
+        session.last_gloss_yielded = True
+        return expressora_pb2.RecognitionEvent(
+            type=expressora_pb2.RecognitionEvent.Type.GLOSS,
+            label=validated_label,
+            confidence=gloss_confidence
+        )
+    
+    async def _detect_tone(self, session, validation) -> Optional[expressora_pb2.RecognitionEvent]:
+        """Classify face separately (for TONE events - NOT gloss words)."""
+        # OPTIMIZATION: Only process tone detection after a GLOSS event is successfully validated
+        if not session.last_gloss_yielded:
+            return None
+        # Reset flag after processing tone
+        session.last_gloss_yielded = False
+        
+        started = time.perf_counter()
+        tone_label, tone_confidence = await self._run_classifier(self.classifier.classify_face, validation)
+        self.metrics.stage["classify_face"].observe(time.perf_counter() - started)
+        if not tone_label or tone_confidence < 0.80:  # Lower threshold for tone (0.80)
+            return None
+        # Only emit TONE if label changed (prevent duplicate tones)
+        if session.last_tone_event == tone_label:
+            return None
+        logger.info(f"😊 TONE event: {tone_label} (confidence: {tone_confidence:.2f})")
+        session.last_tone_event = tone_label
+        return expressora_pb2.RecognitionEvent(
+            type=expressora_pb2.RecognitionEvent.Type.TONE,
+            label=tone_label,
+            confidence=tone_confidence
+        )
+    
+    async def TranslateSequence(self, request, context):
         """
         Unary RPC handler for translation.
         
@@ -288,10 +832,11 @@ class ExpressoraTranslationServicer(expressora_pb2_grpc.TranslationServiceServic
         
         This method uses the Hybrid TranslationService (Gemini + Offline fallback).
         """
+        tone = request.dominant_tone if request.dominant_tone else "/neutral"
+        started = time.perf_counter()
         try:
             glosses = list(request.glosses)
-            tone = request.dominant_tone if request.dominant_tone else "/neutral"
-            
+
             logger.info(f"📝 TranslateSequence called: {len(glosses)} glosses, tone={tone}")
             
             if not glosses:
@@ -299,11 +844,23 @@ class ExpressoraTranslationServicer(expressora_pb2_grpc.TranslationServiceServic
                     sentence="",
                     sentence_filipino="",
                     tone=tone,
-                    source="Offline (Local)"
+                    source=SOURCE_LOCAL
                 )
             
-            # Use Hybrid TranslationService (Gemini + Offline fallback)
-            english, filipino, result_tone, source = self.translator.translate(glosses, tone)
+            deadline = self._deadline(context)
+            # Memory-tier hits are answered here instead of waiting for a translator thread
+            result = self.translator.lookup_memory(glosses, tone)
+            if result is None and request.session_id and self.speculator is not None:
+                # The stream may already have translated exactly these glosses
+                timeout = deadline - time.monotonic() if deadline is not None else None
+                result = await self.speculator.lookup(request.session_id, glosses, tone, timeout)
+                if result is not None:
+                    logger.info(f"⚡ Speculative translation hit (session {request.session_id})")
+            if result is None:
+                # Use Hybrid TranslationService (Gemini + Offline fallback) within the client's deadline
+                result = await self._run_translator(self.translator.translate, glosses, tone, deadline)
+            english, filipino, result_tone, source = result
+            self.metrics.record_translation("TranslateSequence", source, time.perf_counter() - started)
             
             logger.info(f"✅ Translation result: English='{english}' | Filipino='{filipino}' (source: {source}, tone: {result_tone})")
             
@@ -316,6 +873,7 @@ class ExpressoraTranslationServicer(expressora_pb2_grpc.TranslationServiceServic
             
         except Exception as e:
             logger.error(f"Error in TranslateSequence: {e}", exc_info=True)
+            self.metrics.translation_errors.labels("TranslateSequence").inc()
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             
@@ -324,41 +882,414 @@ class ExpressoraTranslationServicer(expressora_pb2_grpc.TranslationServiceServic
                 sentence=f"Translation error: {str(e)}",
                 sentence_filipino="",
                 tone=tone,
-                source="Offline (Local)"
+                source=SOURCE_LOCAL
+            )
+    
+    async def TranslateSequenceStream(self, request, context):
+        """
+        Server-streaming RPC handler for progressive translation.
+        
+        Receives: GlossSequence
+        Returns: stream of TranslationResult - an offline draft, Gemini refinements as
+                 the response streams in, and a last message with final = true
+        
+        Cache and speculative hits are sent as a single final message.
+        """
+        glosses = list(request.glosses)
+        tone = request.dominant_tone if request.dominant_tone else "/neutral"
+        logger.info(f"📝 TranslateSequenceStream called: {len(glosses)} glosses, tone={tone}")
+        
+        if not glosses:
+            yield expressora_pb2.TranslationResult(tone=tone, source=SOURCE_LOCAL, final=True)
+            return
+        
+        started = time.perf_counter()
+        deadline = self._deadline(context)
+        if request.session_id and self.speculator is not None:
+            timeout = deadline - time.monotonic() if deadline is not None else None
+            result = await self.speculator.lookup(request.session_id, glosses, tone, timeout)
+            if result is not None:
+                logger.info(f"⚡ Speculative translation hit (session {request.session_id})")
+                english, filipino, result_tone, source = result
+                self.metrics.record_translation("TranslateSequenceStream", source, time.perf_counter() - started)
+                yield expressora_pb2.TranslationResult(
+                    sentence=english, sentence_filipino=filipino, tone=result_tone, source=source, final=True
+                )
+                return
+        
+        # translate_stream blocks between chunks; step through it on the translator pool
+        results = self.translator.translate_stream(glosses, tone, deadline)
+        done = object()
+        item = step = source = None
+        messages = 0
+        try:
+            while True:
+                step = self._translator_executor.submit(next, results, done)
+                item = await asyncio.wrap_future(step)
+                if item is done:
+                    break
+                english, filipino, result_tone, source, final = item
+                messages += 1
+                yield expressora_pb2.TranslationResult(
+                    sentence=english, sentence_filipino=filipino, tone=result_tone, source=source, final=final
+                )
+        except Exception as e:
+            logger.error(f"Error in TranslateSequenceStream: {e}", exc_info=True)
+            self.metrics.translation_errors.labels("TranslateSequenceStream").inc()
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return
+        finally:
+            if item is not done:
+                # Cancelled or failed mid-stream: close the generator so it releases its
+                # Gemini stream and breaker slot (after the step still running, if any)
+                if step is None:
+                    results.close()
+                else:
+                    step.add_done_callback(lambda _: results.close())
+        if source is None:
+            logger.warning("TranslateSequenceStream: translator produced no result")
+            source = SOURCE_LOCAL
+            yield expressora_pb2.TranslationResult(tone=tone, source=source, final=True)
+        self.metrics.record_translation("TranslateSequenceStream", source, time.perf_counter() - started)
+        logger.info(f"✅ Streamed translation in {messages} messages (source: {source})")
+    
+    async def TranslateSequences(self, request, context):
+        """
+        Unary batch RPC handler for translation.
+        
+        Receives: GlossSequenceBatch (many glosses + tone pairs)
+        Returns: TranslationResultBatch (one result per sequence, in request order)
+        
+        Duplicate sequences are translated once, cache hits are answered from one lookup
+        pass on the translator pool (the SQLite tier hits the disk), and the remaining
+        sequences run through the translator with bounded concurrency so one large call
+        cannot take over the translator pool.
+        """
+        sequences = request.sequences
+        started = time.perf_counter()
+        if len(sequences) > MAX_BATCH_SEQUENCES:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"Too many sequences ({len(sequences)} > {MAX_BATCH_SEQUENCES})"
             )
+        
+        # Dedupe on the normalized (glosses, tone) key
+        slots = []  # Index into `unique` for every request sequence
+        unique = {}  # key -> (position, glosses, tone)
+        for sequence in sequences:
+            glosses = list(sequence.glosses)
+            tone = sequence.dominant_tone if sequence.dominant_tone else "/neutral"
+            key = make_key(glosses, tone)
+            if key not in unique:
+                unique[key] = (len(unique), glosses, tone)
+            slots.append(unique[key][0])
+        
+        def lookup_all():
+            return [self.translator.lookup_cached(glosses, tone) if glosses else ("", "", tone, SOURCE_LOCAL)
+                    for _, glosses, tone in unique.values()]
+        
+        results = await self._run_translator(lookup_all)
+        misses = [(position, glosses, tone) for position, glosses, tone in unique.values()
+                  if results[position] is None]
+        
+        logger.info(f"📝 TranslateSequences called: {len(sequences)} sequences, {len(unique)} unique, "
+                    f"{len(unique) - len(misses)} answered without translating")
+        
+        deadline = self._deadline(context)
+        semaphore = asyncio.Semaphore(self._batch_translate_concurrency)
+        
+        async def translate_one(position, glosses, tone):
+            async with semaphore:
+                try:
+                    results[position] = await self._run_translator(
+                        self.translator.translate_uncached, glosses, tone, deadline
+                    )
+                except Exception as e:
+                    logger.error(f"Error translating {' '.join(glosses)}: {e}", exc_info=True)
+                    self.metrics.translation_errors.labels("TranslateSequences").inc()
+                    results[position] = (f"Translation error: {str(e)}", "", tone, SOURCE_LOCAL)
+        
+        await asyncio.gather(*(translate_one(*miss) for miss in misses))
+        
+        for slot in slots:
+            self.metrics.translations.labels("TranslateSequences", results[slot][3]).inc()
+        self.metrics.translation_seconds.labels("TranslateSequences").observe(time.perf_counter() - started)
+        return expressora_pb2.TranslationResultBatch(results=[
+            expressora_pb2.TranslationResult(
+                sentence=english, sentence_filipino=filipino, tone=result_tone, source=source
+            )
+            for english, filipino, result_tone, source in (results[slot] for slot in slots)
+        ])
+    
+    async def Profile(self, request, context):
+        """
+        Unary RPC handler for on-demand profiling.
+        
+        Receives: ProfileRequest (duration, optional session ID and sampling interval)
+        Returns: ProfileResponse with the folded stacks and the server file they were written to
+        
+        One profile runs at a time. With a session ID, event-loop samples are limited to
+        that stream's handler; classifier and translator threads are shared by all streams.
+        Disabled unless the server was started with --profile-dir.
+        """
+        if self.profiler is None:
+            await context.abort(grpc.StatusCode.FAILED_PRECONDITION,
+                                "Profiling is disabled (start the server with --profile-dir)")
+        task, label = None, "all"
+        if request.session_id:
+            session = self.sessions.get(request.session_id)
+            if session is None or session.task is None:
+                await context.abort(grpc.StatusCode.NOT_FOUND, f"No open stream with session {request.session_id}")
+            task, label = session.task, session.session_id
+        
+        duration = request.duration_seconds or DEFAULT_PROFILE_SECONDS
+        remaining = context.time_remaining()
+        if remaining is not None:
+            duration = min(duration, max(0.0, remaining - 1.0))  # Leave time to send the result
+        try:
+            path, sampler = await self.profiler.profile(
+                duration, request.interval_ms or DEFAULT_INTERVAL_MS, task=task, label=label
+            )
+        except ProfileInProgressError as e:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        return expressora_pb2.ProfileResponse(path=path, samples=sampler.samples, folded=sampler.folded())
+    
+    async def GetStats(self, request, context):
+        """
+        Unary RPC handler for server metrics.
+        
+        Receives: StatsRequest (optional metric name prefix)
+        Returns: StatsResponse with every matching sample and the same data in
+                 Prometheus text format (what the /metrics endpoint serves)
+        """
+        registry = self.metrics.registry
+        return expressora_pb2.StatsResponse(
+            samples=[
+                expressora_pb2.MetricSample(name=sample.name, labels=sample.labels, value=sample.value)
+                for sample in registry.samples(request.prefix)
+            ],
+            prometheus_text=registry.render_prometheus(request.prefix),
+        )
 
 
-def serve(port: int = 50051, host: str = "0.0.0.0"):
+async def serve(port: int = 50051, host: str = "0.0.0.0",
+                classifier_workers: int = DEFAULT_CLASSIFIER_WORKERS,
+                translator_workers: int = DEFAULT_TRANSLATOR_WORKERS,
+                max_concurrent_rpcs: int = None,
+                max_sessions: int = DEFAULT_MAX_SESSIONS,
+                session_idle_timeout: float = DEFAULT_SESSION_IDLE_TIMEOUT,
+                classifier: str = "tflite",
+                max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                max_batch_wait_ms: float = DEFAULT_MAX_BATCH_WAIT_MS,
+                translation_cache_size: int = DEFAULT_TRANSLATION_CACHE_SIZE,
+                translation_cache_ttl: float = DEFAULT_TRANSLATION_CACHE_TTL,
+                translation_cache_db: str = None,
+                gemini_failure_threshold: int = DEFAULT_BREAKER_FAILURE_THRESHOLD,
+                gemini_recovery_timeout: float = DEFAULT_BREAKER_RECOVERY_TIMEOUT,
+                translation_hedge_ms: float = 0.0,
+                translation_model: str = DEFAULT_WEIGHTS_PATH,
+                batch_translate_concurrency: int = DEFAULT_BATCH_TRANSLATE_CONCURRENCY,
+                gemini_rpm: float = DEFAULT_GEMINI_RPM,
+                gemini_max_prompt_batch: int = DEFAULT_MAX_PROMPT_BATCH,
+                speculative_translation: bool = False,
+                metrics_port: int = DEFAULT_METRICS_PORT,
+                metrics_host: str = DEFAULT_METRICS_HOST,
+                trace_file: str = None,
+                trace_sample_every: int = DEFAULT_TRACE_SAMPLE_EVERY,
+                profile_dir: str = None,
+                frame_queue_size: int = DEFAULT_FRAME_QUEUE_SIZE,
+                max_frame_age_ms: float = DEFAULT_MAX_FRAME_AGE_MS,
+                frame_skip: int = DEFAULT_FRAME_SKIP,
+                flow_latency_budget_ms: float = DEFAULT_LATENCY_BUDGET_MS):
     """
-    Start the gRPC server.
+    Start the asyncio gRPC server and block until it terminates.
     
     Args:
         port: Port to listen on
         host: Host to bind to
+        classifier_workers: Thread pool size for blocking classifier calls
+        translator_workers: Thread pool size for blocking translation calls
+        max_concurrent_rpcs: Optional cap on in-flight RPCs (None = unlimited)
+        max_sessions: Maximum number of concurrently open landmark streams
+        session_idle_timeout: Seconds without frames before a stream is evicted
+        classifier: Gesture classifier backend ("tflite" or "mock")
+        max_batch_size: Maximum frames per batched classify_hands call
+        max_batch_wait_ms: Maximum time a frame waits for others to join its batch
+        translation_cache_size: Translations kept in memory (0 disables caching)
+        translation_cache_ttl: Seconds a cached translation stays valid in memory
+        translation_cache_db: Optional SQLite file for a persistent cache tier
+        gemini_failure_threshold: Consecutive Gemini failures that open the circuit breaker
+        gemini_recovery_timeout: Seconds the breaker skips Gemini before probing it again
+        translation_hedge_ms: Hedged translation budget for Gemini (0 = wait for Gemini)
+        translation_model: T5 weights (.npz) for offline translation; local rules if missing
+        batch_translate_concurrency: Uncached sequences a TranslateSequences call translates at once
+        gemini_rpm: Gemini requests per minute; requests queued meanwhile share a prompt (0 = unlimited)
+        gemini_max_prompt_batch: Maximum gloss sequences packed into one Gemini prompt
+        speculative_translation: Translate each stream's gloss prefix in the background from
+            the cache or offline model (never spends Gemini quota)
+        metrics_port: Port for the Prometheus /metrics endpoint (0 = disabled)
+        metrics_host: Interface the /metrics endpoint binds to
+        trace_file: Chrome trace-event JSON file for sampled frame traces (None = off)
+        trace_sample_every: Trace every N-th frame of each stream
+        profile_dir: Directory for Profile RPC output (None disables the RPC)
+        frame_queue_size: Messages queued per stream before the oldest is dropped
+        max_frame_age_ms: Queued frames older than this are dropped (0 = no limit)
+        frame_skip: While frames are queued, drop every k-th arrival (0 = off)
+        flow_latency_budget_ms: classify_hands latency at which FLOW_CONTROL advises slowing down
     """
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    
-    # Add servicer using generated code
-    expressora_pb2_grpc.add_TranslationServiceServicer_to_server(
-        ExpressoraTranslationServicer(), server
+    server = grpc.aio.server(maximum_concurrent_rpcs=max_concurrent_rpcs)
+    servicer = ExpressoraTranslationServicer(
+        classifier_workers=classifier_workers,
+        translator_workers=translator_workers,
+        max_sessions=max_sessions,
+        session_idle_timeout=session_idle_timeout,
+        classifier=classifier,
+        max_batch_size=max_batch_size,
+        max_batch_wait_ms=max_batch_wait_ms,
+        translation_cache_size=translation_cache_size,
+        translation_cache_ttl=translation_cache_ttl,
+        translation_cache_db=translation_cache_db,
+        gemini_failure_threshold=gemini_failure_threshold,
+        gemini_recovery_timeout=gemini_recovery_timeout,
+        translation_hedge_ms=translation_hedge_ms,
+        translation_model=translation_model,
+        batch_translate_concurrency=batch_translate_concurrency,
+        gemini_rpm=gemini_rpm,
+        gemini_max_prompt_batch=gemini_max_prompt_batch,
+        speculative_translation=speculative_translation,
+        trace_file=trace_file,
+        trace_sample_every=trace_sample_every,
+        profile_dir=profile_dir,
+        frame_queue_size=frame_queue_size,
+        max_frame_age_ms=max_frame_age_ms,
+        frame_skip=frame_skip,
+        flow_latency_budget_ms=flow_latency_budget_ms,
     )
     
+    # Add servicer using generated code (works for both sync and aio servers)
+    expressora_pb2_grpc.add_TranslationServiceServicer_to_server(servicer, server)
+    
     server.add_insecure_port(f"{host}:{port}")
-    server.start()
+    await server.start()
+    servicer.scheduler.start()
+    eviction_task = asyncio.create_task(servicer.sessions.run_eviction_loop())
+    metrics_server = None
+    if metrics_port > 0:
+        metrics_server = MetricsHttpServer(servicer.metrics.registry, host=metrics_host, port=metrics_port)
+        metrics_server.start()
     
-    logger.info(f"Expressora gRPC server started on {host}:{port}")
+    logger.info(f"Expressora gRPC server (asyncio) started on {host}:{port}")
     
     try:
-        server.wait_for_termination()
-    except KeyboardInterrupt:
+        await server.wait_for_termination()
+    finally:
         logger.info("Shutting down server...")
-        server.stop(0)
+        eviction_task.cancel()
+        if metrics_server is not None:
+            metrics_server.stop()
+        try:
+            await server.stop(grace=1.0)
+            await servicer.scheduler.stop()
+        finally:
+            # On Ctrl-C the stop above is cancelled too; still release threads and log stats
+            servicer.shutdown()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Expressora gRPC Server")
     parser.add_argument("--port", type=int, default=50051, help="Server port")
     parser.add_argument("--host", type=str, default="0.0.0.0", help="Server host")
+    parser.add_argument("--classifier-workers", type=int, default=DEFAULT_CLASSIFIER_WORKERS,
+                        help="Threads for blocking classifier calls")
+    parser.add_argument("--translator-workers", type=int, default=DEFAULT_TRANSLATOR_WORKERS,
+                        help="Threads for blocking translation calls")
+    parser.add_argument("--max-concurrent-rpcs", type=int, default=None,
+                        help="Optional cap on concurrent RPCs (default: unlimited)")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS,
+                        help="Maximum concurrently open landmark streams")
+    parser.add_argument("--session-idle-timeout", type=float, default=DEFAULT_SESSION_IDLE_TIMEOUT,
+                        help="Seconds without frames before a landmark stream is evicted")
+    parser.add_argument("--classifier", choices=CLASSIFIER_CHOICES, default="tflite",
+                        help="Gesture classifier backend (falls back to mock if TFLite is unavailable)")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Maximum frames per batched classifier call across streams")
+    parser.add_argument("--max-batch-wait-ms", type=float, default=DEFAULT_MAX_BATCH_WAIT_MS,
+                        help="Maximum time a frame waits for others to join its batch")
+    parser.add_argument("--translation-cache-size", type=int, default=DEFAULT_TRANSLATION_CACHE_SIZE,
+                        help="Translations cached in memory (0 disables the cache)")
+    parser.add_argument("--translation-cache-ttl", type=float, default=DEFAULT_TRANSLATION_CACHE_TTL,
+                        help="Seconds a cached translation stays valid in memory")
+    parser.add_argument("--translation-cache-db", type=str, default=None,
+                        help="SQLite file for a persistent translation cache (default: memory only)")
+    parser.add_argument("--gemini-failure-threshold", type=int, default=DEFAULT_BREAKER_FAILURE_THRESHOLD,
+                        help="Consecutive Gemini failures before translations go straight to the local rules")
+    parser.add_argument("--gemini-recovery-timeout", type=float, default=DEFAULT_BREAKER_RECOVERY_TIMEOUT,
+                        help="Seconds to skip Gemini after the circuit opens before probing it again")
+    parser.add_argument("--translation-hedge-ms", type=float, default=0.0,
+                        help="Hedged mode: return the offline translation if Gemini takes longer than this (0 = off)")
+    parser.add_argument("--translation-model", type=str, default=DEFAULT_WEIGHTS_PATH,
+                        help="T5 weights (.npz) for offline translation (falls back to local rules if missing)")
+    parser.add_argument("--batch-translate-concurrency", type=int, default=DEFAULT_BATCH_TRANSLATE_CONCURRENCY,
+                        help="Uncached sequences a TranslateSequences call translates at once")
+    parser.add_argument("--gemini-rpm", type=float, default=DEFAULT_GEMINI_RPM,
+                        help="Gemini requests per minute; requests that queue are batched into one prompt (0 = unlimited)")
+    parser.add_argument("--gemini-max-prompt-batch", type=int, default=DEFAULT_MAX_PROMPT_BATCH,
+                        help="Maximum gloss sequences packed into one Gemini prompt")
+    parser.add_argument("--speculative-translation", action="store_true",
+                        help="Translate gloss prefixes in the background while streaming (cache/offline only)")
+    parser.add_argument("--metrics-port", type=int, default=DEFAULT_METRICS_PORT,
+                        help="Serve Prometheus metrics on http://<metrics-host>:<port>/metrics (default: 0, disabled)")
+    parser.add_argument("--metrics-host", type=str, default=DEFAULT_METRICS_HOST,
+                        help="Interface for the metrics endpoint (default: localhost only)")
+    parser.add_argument("--trace-file", type=str, default=None,
+                        help="Write sampled per-frame latency traces here (Chrome trace-event JSON)")
+    parser.add_argument("--trace-sample-every", type=int, default=DEFAULT_TRACE_SAMPLE_EVERY,
+                        help="Trace every N-th frame of each stream")
+    parser.add_argument("--profile-dir", type=str, default=None,
+                        help="Enable the Profile RPC and write its folded stacks here (default: disabled)")
+    parser.add_argument("--frame-queue-size", type=int, default=DEFAULT_FRAME_QUEUE_SIZE,
+                        help="Messages queued per stream (a batch counts as one); the oldest is dropped when processing falls behind")
+    parser.add_argument("--max-frame-age-ms", type=float, default=DEFAULT_MAX_FRAME_AGE_MS,
+                        help="Drop queued frames that waited longer than this (0 = no limit)")
+    parser.add_argument("--frame-skip", type=int, default=DEFAULT_FRAME_SKIP,
+                        help="While frames are queued, drop every k-th incoming frame (0 = off)")
+    parser.add_argument("--flow-latency-budget-ms", type=float, default=DEFAULT_LATENCY_BUDGET_MS,
+                        help="classify_hands latency at which flow-controlled streams are asked to slow down")
     
     args = parser.parse_args()
-    serve(port=args.port, host=args.host)
+    try:
+        asyncio.run(serve(
+            port=args.port,
+            host=args.host,
+            classifier_workers=args.classifier_workers,
+            translator_workers=args.translator_workers,
+            max_concurrent_rpcs=args.max_concurrent_rpcs,
+            max_sessions=args.max_sessions,
+            session_idle_timeout=args.session_idle_timeout,
+            classifier=args.classifier,
+            max_batch_size=args.max_batch_size,
+            max_batch_wait_ms=args.max_batch_wait_ms,
+            translation_cache_size=args.translation_cache_size,
+            translation_cache_ttl=args.translation_cache_ttl,
+            translation_cache_db=args.translation_cache_db,
+            gemini_failure_threshold=args.gemini_failure_threshold,
+            gemini_recovery_timeout=args.gemini_recovery_timeout,
+            translation_hedge_ms=args.translation_hedge_ms,
+            translation_model=args.translation_model,
+            batch_translate_concurrency=args.batch_translate_concurrency,
+            gemini_rpm=args.gemini_rpm,
+            gemini_max_prompt_batch=args.gemini_max_prompt_batch,
+            speculative_translation=args.speculative_translation,
+            metrics_port=args.metrics_port,
+            metrics_host=args.metrics_host,
+            trace_file=args.trace_file,
+            trace_sample_every=args.trace_sample_every,
+            profile_dir=args.profile_dir,
+            frame_queue_size=args.frame_queue_size,
+            max_frame_age_ms=args.max_frame_age_ms,
+            frame_skip=args.frame_skip,
+            flow_latency_budget_ms=args.flow_latency_budget_ms,
+        ))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,98 @@
+"""
+Per-session sliding window of model features.
+A preallocated float32 ring buffer replaces the deque of per-frame arrays, so
+appending a frame never allocates and the last N frames are always available
+as one contiguous (N, features) array for inference.
+"""
+import numpy as np
+
+
+class FeatureWindow:
+    """
+    Fixed-length sliding window over per-frame feature vectors.
+
+    Every frame is written twice, at slot i and slot i + length of a 2 * length
+    buffer. The most recent `length` frames therefore always form one contiguous
+    slice that can be handed to the model without stacking or reordering.
+    The number of frames with hand data is maintained incrementally on append.
+    """
+
+    __slots__ = ("length", "num_features", "hands_dim", "_buffer", "_valid", "_start", "_size", "_valid_count")
+
+    def __init__(self, length: int, num_features: int, hands_dim: int):
+        """
+        Args:
+            length: Number of frames in the window (SEQUENCE_LENGTH)
+            num_features: Features per frame (FEATURES_PER_FRAME)
+            hands_dim: Leading features holding hand data; a frame counts as valid
+                       if any of them is non-zero
+        """
+        self.length = length
+        self.num_features = num_features
+        self.hands_dim = hands_dim
+        self._buffer = np.zeros((2 * length, num_features), dtype=np.float32)
+        self._valid = np.zeros(length, dtype=bool)
+        self._start = 0  # Slot of the oldest frame
+        self._size = 0
+        self._valid_count = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_full(self) -> bool:
+        return self._size == self.length
+
+    @property
+    def valid_count(self) -> int:
+        """Frames in the window that contain hand data."""
+        return self._valid_count
+
+    def append(self, features: np.ndarray):
+        """
+        Add one frame, dropping the oldest if the window is full. O(1), no allocation.
+
+        Args:
+            features: float array of shape (num_features,)
+        """
+        pos = self._start + self._size
+        if pos >= self.length:
+            pos -= self.length
+        self._buffer[pos] = features
+        self._buffer[pos + self.length] = features
+
+        valid = bool(self._buffer[pos, :self.hands_dim].any())
+        if self._size == self.length:
+            # pos is the oldest slot: overwrite it and move the start past it
+            self._valid_count -= self._valid[pos]
+            self._start = pos + 1 if pos + 1 < self.length else 0
+        else:
+            self._size += 1
+        self._valid[pos] = valid
+        self._valid_count += valid
+
+    def drop_oldest(self):
+        """Remove the oldest frame (no-op when empty), like removeFirst() on Android's buffer."""
+        if not self._size:
+            return
+        start = self._start
+        self._valid_count -= self._valid[start]
+        self._valid[start] = False
+        self._start = start + 1 if start + 1 < self.length else 0
+        self._size -= 1
+
+    def view(self) -> np.ndarray:
+        """
+        Contiguous (len(self), num_features) view of the frames in order, oldest first.
+
+        The view aliases the ring buffer and is only valid until the next append();
+        copy it if it has to outlive that.
+        """
+        return self._buffer[self._start:self._start + self._size]
+
+    def clear(self):
+        """Drop all frames."""
+        self._valid[:] = False
+        self._start = 0
+        self._size = 0
+        self._valid_count = 0
@@ -0,0 +1,149 @@
+"""
+Server-to-client flow control for landmark streams.
+Streams that opt in with x-expressora-flow-control: 1 get FLOW_CONTROL events
+telling the client which frame rate to send and which landmark groups to leave
+out. The advice comes from the stream's own frame queue (depth and drops) and
+the server-wide classify_hands latency, so a saturated server sheds work at the
+source instead of receiving and dropping frames it cannot process.
+"""
+import time
+from typing import NamedTuple, Optional
+
+# Request metadata key opting a stream into FLOW_CONTROL events ("1" = on)
+FLOW_CONTROL_METADATA_KEY = "x-expressora-flow-control"
+
+LEVEL_NORMAL = 0   # Send everything at the client's own rate
+LEVEL_REDUCED = 1  # Lower frame rate, no pose
+LEVEL_SHED = 2     # Lowest frame rate, no pose (and no face if the classifier does not need it)
+LEVEL_NAMES = ("normal", "reduced", "shed")
+
+# Advised frame rates per level (0 = no limit)
+LEVEL_TARGET_FPS = (0.0, 15.0, 10.0)
+
+# classify_hands latency (submission to result) that counts as fully loaded
+DEFAULT_LATENCY_BUDGET_MS = 150.0
+
+# Load score thresholds (1.0 = queue always full or latency at budget)
+REDUCE_AT = 0.75
+SHED_AT = 1.5
+RECOVER_BELOW = 0.4
+# Seconds a stream stays at a level before it is lowered again
+DEFAULT_HOLD_SECONDS = 3.0
+
+EWMA_ALPHA = 0.2
+
+
+class FlowAdvice(NamedTuple):
+    level: int
+    target_fps: float
+    send_face: bool
+    send_pose: bool
+    reason: str
+
+
+class FlowState:
+    """Per-stream controller state (kept on the Session)."""
+
+    __slots__ = ("level", "depth", "dropped", "changed_at")
+
+    def __init__(self):
+        self.level = LEVEL_NORMAL
+        self.depth = 0.0        # EWMA of messages taken per processing step
+        self.dropped = 0        # Frame queue drop count at the last update
+        self.changed_at = 0.0   # time.monotonic() of the last level change
+
+
+class FlowController:
+    """
+    Turns load signals into FlowAdvice with hysteresis.
+
+    Load score per stream = max(queue depth EWMA in messages / queue size, classify_hands latency
+    EWMA / budget), raised to at least 1.0 when the stream's queue dropped frames since
+    the last step. Levels go up as soon as the score crosses a threshold and come down
+    one at a time after the score stayed below RECOVER_BELOW for the hold time.
+    Used from the event loop only.
+    """
+
+    def __init__(self, queue_size: int, latency_budget_ms: float = DEFAULT_LATENCY_BUDGET_MS,
+                 face_optional: bool = False, hold_seconds: float = DEFAULT_HOLD_SECONDS):
+        """
+        Args:
+            queue_size: Per-stream frame queue size in messages (depth that counts as full)
+            latency_budget_ms: classify_hands latency that counts as fully loaded
+            face_optional: The classifier does not read face points for glosses, so
+                face landmarks can be shed (TONE events stop while shedding)
+            hold_seconds: Minimum time at a level before lowering it
+        """
+        self.queue_size = max(1, queue_size)
+        self.latency_budget = latency_budget_ms / 1000.0
+        self.face_optional = face_optional
+        self.hold_seconds = hold_seconds
+        self.inference_latency = 0.0  # EWMA of classify_hands seconds, all streams
+        self.advice_sent = [0, 0, 0]  # By level
+
+    def observe_inference(self, seconds: float):
+        """Record one classify_hands submission-to-result latency."""
+        self.inference_latency += EWMA_ALPHA * (seconds - self.inference_latency)
+
+    def advice(self, level: int, reason: str) -> FlowAdvice:
+        return FlowAdvice(
+            level=level,
+            target_fps=LEVEL_TARGET_FPS[level],
+            send_face=not (level >= LEVEL_SHED and self.face_optional),
+            send_pose=level == LEVEL_NORMAL,
+            reason=reason,
+        )
+
+    def update(self, state: FlowState, depth: int, dropped: int,
+               now: Optional[float] = None) -> Optional[FlowAdvice]:
+        """
+        Feed one processing step of a stream.
+
+        Args:
+            state: The stream's FlowState
+            depth: Messages taken from the queue in this step (a batch counts as one)
+            dropped: The queue's total drop count so far (frames only drop while earlier
+                messages are still queued)
+            now: time.monotonic() (for tests)
+
+        Returns:
+            New advice if the stream's level changed, else None
+        """
+        now = now if now is not None else time.monotonic()
+        state.depth += EWMA_ALPHA * (depth - state.depth)
+        new_drops = dropped > state.dropped
+        state.dropped = dropped
+
+        queue_score = state.depth / self.queue_size
+        latency_score = self.inference_latency / self.latency_budget if self.latency_budget > 0 else 0.0
+        score = max(queue_score, latency_score, 1.0 if new_drops else 0.0)
+        if new_drops:
+            reason = "frames_dropped"
+        elif latency_score >= queue_score:
+            reason = "inference_latency"
+        else:
+            reason = "queue_depth"
+
+        level = state.level
+        if score >= SHED_AT:
+            level = LEVEL_SHED
+        elif score >= REDUCE_AT:
+            level = max(level, LEVEL_REDUCED)
+        if level > state.level:
+            return self._change(state, level, reason, now)
+        if (state.level > LEVEL_NORMAL and score < RECOVER_BELOW
+                and now - state.changed_at >= self.hold_seconds):
+            return self._change(state, state.level - 1, "recovered", now)
+        return None
+
+    def _change(self, state: FlowState, level: int, reason: str, now: float) -> FlowAdvice:
+        state.level = level
+        state.changed_at = now
+        self.advice_sent[level] += 1
+        return self.advice(level, reason)
+
+    def stats(self) -> dict:
+        return {
+            "inference_latency_ms": round(self.inference_latency * 1000, 2),
+            "advice_sent": {name: count for name, count in zip(LEVEL_NAMES, self.advice_sent)},
+        }
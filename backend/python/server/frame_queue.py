@@ -0,0 +1,119 @@
+"""
+Bounded per-stream frame queue for StreamLandmarks.
+A receive task reads frames off the gRPC stream as fast as they arrive and puts
+them here; the processing loop takes everything that is waiting in one go.
+When processing falls behind, frames are dropped instead of piling up in the
+gRPC receive buffers, so recognition stays close to what the signer is doing now.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# Messages kept per stream (about 270 ms of single frames at 30 fps); the oldest
+# message is dropped when full. A LandmarkBatch counts as one message.
+DEFAULT_FRAME_QUEUE_SIZE = 8
+# Messages that waited longer than this are dropped when taken (0 = no age limit)
+DEFAULT_MAX_FRAME_AGE_MS = 500.0
+# While earlier messages are waiting, drop every k-th incoming frame (0 = off)
+DEFAULT_FRAME_SKIP = 0
+
+# frames_dropped reasons
+DROP_QUEUE_FULL = "queue_full"
+DROP_STALE = "stale"
+DROP_SKIPPED = "skipped"
+DROP_REASONS = (DROP_QUEUE_FULL, DROP_STALE, DROP_SKIPPED)
+
+
+class FrameQueue:
+    """
+    Latest-wins queue of received messages for one stream.
+
+    Each message (a LandmarkFrame or a LandmarkBatch's frames) is queued as a unit, so a
+    batch is never split and frames are only dropped while an earlier message is still
+    waiting to be taken. take() returns (LandmarkFrame, received) pairs, where `received`
+    is the server's time.time() when the message arrived. Used from the event loop only:
+    put() from the receive task, take() from the processing loop.
+    """
+
+    __slots__ = ("max_messages", "max_age", "skip_every", "dropped", "high_water", "last_taken",
+                 "_messages", "_ready", "_closed", "_backlog_arrivals", "_on_drop")
+
+    def __init__(self, max_messages: int = DEFAULT_FRAME_QUEUE_SIZE,
+                 max_age_ms: float = DEFAULT_MAX_FRAME_AGE_MS,
+                 skip_every: int = DEFAULT_FRAME_SKIP,
+                 on_drop: Optional[Callable[[str, int], None]] = None):
+        """
+        Args:
+            max_messages: Messages kept; the oldest is dropped when a new one arrives on a full queue
+            max_age_ms: Messages older than this are dropped when taken (0 = no limit);
+                the newest message is always kept
+            skip_every: While earlier messages are waiting, drop every k-th arriving frame (0 = off)
+            on_drop: Called with the reason and frame count of every drop
+        """
+        self.max_messages = max(1, max_messages)
+        self.max_age = max_age_ms / 1000.0
+        self.skip_every = max(0, skip_every)
+        self.dropped = 0
+        self.high_water = 0  # Largest depth seen, in messages
+        self.last_taken = 0  # Messages returned by the last take()
+        self._messages: deque = deque()  # (frames, received)
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._backlog_arrivals = 0
+        self._on_drop = on_drop
+
+    def __len__(self) -> int:
+        """Messages waiting."""
+        return len(self._messages)
+
+    def _drop(self, reason: str, count: int = 1):
+        self.dropped += count
+        if self._on_drop is not None:
+            self._on_drop(reason, count)
+
+    def put(self, landmark_frames: Sequence, received: float):
+        """Queue the frames of one message (oldest first)."""
+        messages = self._messages
+        if self.skip_every and messages:
+            # Behind: thin the stream out evenly instead of only losing the oldest messages
+            kept = []
+            for landmark_frame in landmark_frames:
+                self._backlog_arrivals += 1
+                if self._backlog_arrivals % self.skip_every == 0:
+                    self._drop(DROP_SKIPPED)
+                else:
+                    kept.append(landmark_frame)
+            landmark_frames = kept
+        if landmark_frames:
+            messages.append((landmark_frames, received))
+            if len(messages) > self.max_messages:
+                self._drop(DROP_QUEUE_FULL, len(messages.popleft()[0]))
+            if len(messages) > self.high_water:
+                self.high_water = len(messages)
+        self._ready.set()
+
+    def close(self):
+        """No more frames will arrive; take() returns what is left, then []."""
+        self._closed = True
+        self._ready.set()
+
+    async def take(self) -> List[Tuple[object, float]]:
+        """
+        Wait for frames and return all that are waiting, oldest first.
+
+        Returns:
+            (LandmarkFrame, received) pairs; an empty list once closed and drained
+        """
+        messages = self._messages
+        while not messages and not self._closed:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.max_age > 0 and len(messages) > 1:
+            cutoff = time.time() - self.max_age
+            while len(messages) > 1 and messages[0][1] < cutoff:
+                self._drop(DROP_STALE, len(messages.popleft()[0]))
+        self.last_taken = len(messages)
+        taken = [(landmark_frame, received) for frames, received in messages for landmark_frame in frames]
+        messages.clear()
+        return taken
@@ -0,0 +1,136 @@
+"""
+Per-frame latency tracing for landmark streams.
+Each frame's server milestones (message received, validation done, inference
+done, event sent) are echoed on the RecognitionEvents it produces as an
+EventTiming, next to the client's LandmarkFrame.timestamp. A sample of frames
+is also written to a Chrome trace-event JSON file (open it in chrome://tracing
+or https://ui.perfetto.dev) with one row per session.
+"""
+import json
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Trace one frame in N per stream (about once per second at 30 fps)
+DEFAULT_TRACE_SAMPLE_EVERY = 30
+
+# Client timestamps further than this from the server clock are not epoch milliseconds
+# (e.g. a camera clock), so no capture-to-server latency is derived from them
+MAX_CLOCK_SKEW_MS = 60_000.0
+
+TRACE_PID = 1
+
+
+def capture_to_server_ms(capture_ms: int, received: float) -> Optional[float]:
+    """
+    Client capture to server receive in milliseconds.
+
+    Args:
+        capture_ms: LandmarkFrame.timestamp (client clock, ms)
+        received: time.time() when the server received the frame
+
+    Returns:
+        Latency in ms (includes clock offset between client and server), or None
+        if the frame has no timestamp or it is not on an epoch clock
+    """
+    if not capture_ms:
+        return None
+    latency = received * 1000.0 - capture_ms
+    return latency if abs(latency) <= MAX_CLOCK_SKEW_MS else None
+
+
+class FrameTrace:
+    """Server milestones of one sampled frame (time.time() seconds)."""
+
+    __slots__ = ("frame_count", "capture_ms", "received", "validated", "inferred", "events")
+
+    def __init__(self, frame_count: int, capture_ms: int, received: float, validated: float):
+        self.frame_count = frame_count
+        self.capture_ms = capture_ms
+        self.received = received
+        self.validated = validated
+        self.inferred = validated  # Updated once the classifier results are in
+        self.events: List[str] = []  # Event types produced by the frame
+
+
+class FrameTracer:
+    """
+    Writes sampled FrameTraces as Chrome trace events.
+
+    Complete ("X") events on the server clock in microseconds: capture_to_server
+    (when the client timestamp is epoch ms), validate, classify and emit, under
+    one "frame" span. Called from the event loop only. The file is a JSON array;
+    it stays loadable even if the server dies before close() writes the "]".
+    """
+
+    def __init__(self, path: str, sample_every: int = DEFAULT_TRACE_SAMPLE_EVERY):
+        """
+        Args:
+            path: Output file (overwritten)
+            sample_every: Trace every N-th frame of each stream
+        """
+        self.path = path
+        self.sample_every = max(1, sample_every)
+        self.traced_frames = 0
+        self._tids: Dict[str, int] = {}
+        self._file = open(path, "w")
+        self._file.write("[")
+        self._first = True
+        self._write({"name": "process_name", "ph": "M", "pid": TRACE_PID, "args": {"name": "expressora-server"}})
+        logger.info(f"🧭 Tracing 1 in {self.sample_every} frames per stream to {path}")
+
+    def sample(self, frame_count: int) -> bool:
+        """Whether the frame with this per-stream number should be traced."""
+        return frame_count % self.sample_every == 0
+
+    def _write(self, event: dict):
+        self._file.write(("\n" if self._first else ",\n") + json.dumps(event, separators=(",", ":")))
+        self._first = False
+
+    def _tid(self, session_id: str) -> int:
+        tid = self._tids.get(session_id)
+        if tid is None:
+            tid = self._tids[session_id] = len(self._tids) + 1
+            self._write({"name": "thread_name", "ph": "M", "pid": TRACE_PID, "tid": tid,
+                         "args": {"name": session_id}})
+        return tid
+
+    def _span(self, name: str, tid: int, start: float, end: float, args: Optional[dict] = None):
+        event = {"name": name, "cat": "frame", "ph": "X", "pid": TRACE_PID, "tid": tid,
+                 "ts": round(start * 1e6, 1), "dur": round(max(0.0, end - start) * 1e6, 1)}
+        if args:
+            event["args"] = args
+        self._write(event)
+
+    def record(self, session_id: str, trace: FrameTrace, emitted: Optional[float] = None):
+        """
+        Write the spans of one frame.
+
+        Args:
+            session_id: Stream the frame belongs to
+            trace: The frame's milestones
+            emitted: time.time() once its events were handed to gRPC (None if it produced none)
+        """
+        tid = self._tid(session_id)
+        end = emitted if emitted is not None else trace.inferred
+        args = {"frame": trace.frame_count, "events": trace.events, "capture_ms": trace.capture_ms}
+        lag_ms = capture_to_server_ms(trace.capture_ms, trace.received)
+        if lag_ms is not None and lag_ms > 0:
+            self._span("capture_to_server", tid, trace.capture_ms / 1000.0, trace.received)
+        self._span("frame", tid, trace.received, end, args)
+        self._span("validate", tid, trace.received, trace.validated)
+        self._span("classify", tid, trace.validated, trace.inferred)
+        if emitted is not None:
+            self._span("emit", tid, trace.inferred, emitted)
+        self.traced_frames += 1
+
+    def stats(self) -> dict:
+        return {"traced_frames": self.traced_frames, "sessions": len(self._tids)}
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.write("\n]\n")
+        self._file.close()
+        logger.info(f"Frame traces: {self.traced_frames} frames written to {self.path}")
@@ -0,0 +1,166 @@
+"""
+Vectorized landmark frame validation.
+Decodes a LandmarkFrame into float32 arrays once and computes hand validity
+and hand spans for all hands in a single NumPy pass. The result is shared by
+StreamLandmarks and the classifiers so no stage re-reads the protobuf fields.
+"""
+from typing import Optional
+
+import numpy as np
+
+from landmark_codec import decode_frame
+
+HAND_LANDMARKS = 21
+COORDS = 3
+ONE_HAND_DIM = HAND_LANDMARKS * COORDS  # 63
+
+# Step 1: Hand Presence Validation - a hand needs at least 15 non-zero coordinates
+MIN_NONZERO_COORDS = 15
+NONZERO_EPSILON = 0.001
+
+# Geometric Sanity Check: wrist (landmark 0) to middle finger tip (landmark 12)
+WRIST_INDEX = 0
+MIDDLE_TIP_INDEX = 12
+GHOST_SPAN_THRESHOLD = 0.06  # Relaxed threshold from 0.08 to 0.06
+
+# Pose right wrist is landmark 16 (x at index 48)
+POSE_RIGHT_WRIST_OFFSET = 16 * 3
+
+
+def _to_array(values) -> np.ndarray:
+    """Copy a repeated float field into a float32 array (fastest path for upb containers)."""
+    return np.fromiter(values, dtype=np.float32, count=len(values))
+
+
+class FrameValidation:
+    """
+    Decoded landmark arrays plus per-hand validation results for one frame.
+
+    Attributes:
+        hands: float32 array (hand_count, 21, 3)
+        hands_flat: float32 array (hand_count * 63,) - same memory as hands
+        pose: float32 array (pose_floats,)
+        valid_mask: bool array (hand_count,) - hand has >= 15 non-zero coordinates
+        spans: float32 array (hand_count,) - wrist to middle finger tip distance (computed on first use)
+        timestamp: Client timestamp in milliseconds
+    """
+
+    __slots__ = ("hands", "hands_flat", "pose", "valid_mask", "timestamp", "_spans", "_face_field", "_face")
+
+    def __init__(self, hands_flat: np.ndarray, face, pose: np.ndarray, timestamp: int = 0):
+        """
+        Args:
+            hands_flat: Flattened hand coordinates [x,y,z, ...] for up to N hands
+            face: Face coordinates, either a float32 array or a repeated field decoded on first use
+            pose: Flattened pose coordinates
+            timestamp: Client timestamp in milliseconds
+        """
+        hand_count = len(hands_flat) // ONE_HAND_DIM
+        self.hands_flat = hands_flat[:hand_count * ONE_HAND_DIM]
+        self.hands = self.hands_flat.reshape(hand_count, HAND_LANDMARKS, COORDS)
+        self.pose = pose
+        self.timestamp = timestamp
+        self._face_field = face
+        self._face: Optional[np.ndarray] = face if isinstance(face, np.ndarray) else None
+
+        # One pass over all hands: non-zero coordinate counts per hand
+        nonzero = (np.abs(self.hands_flat.reshape(hand_count, ONE_HAND_DIM)) > NONZERO_EPSILON).sum(axis=1)
+        self.valid_mask = nonzero >= MIN_NONZERO_COORDS
+        self._spans: Optional[np.ndarray] = None
+
+    @property
+    def hand_count(self) -> int:
+        return self.hands.shape[0]
+
+    @property
+    def spans(self) -> np.ndarray:
+        """Wrist-to-middle-tip distance for every hand (skipped when the pose wrist bypasses the check)."""
+        if self._spans is None:
+            delta = self.hands[:, WRIST_INDEX, :] - self.hands[:, MIDDLE_TIP_INDEX, :]
+            self._spans = np.sqrt((delta * delta).sum(axis=1))
+        return self._spans
+
+    @property
+    def face(self) -> np.ndarray:
+        """Flattened face coordinates (decoded lazily - only tone and sequence models need them)."""
+        if self._face is None:
+            self._face = _to_array(self._face_field)
+            self._face_field = None
+        return self._face
+
+    @property
+    def face_count(self) -> int:
+        """Number of face landmarks."""
+        if self._face is not None:
+            return len(self._face) // COORDS
+        return len(self._face_field) // COORDS
+
+    @property
+    def has_valid_hand(self) -> bool:
+        """At least one hand passes the non-zero landmark check."""
+        return bool(self.valid_mask.any())
+
+    @property
+    def max_span(self) -> float:
+        return float(self.spans.max()) if self.hand_count else 0.0
+
+    @property
+    def passes_span_check(self) -> bool:
+        """At least one hand is larger than a collapsed ghost hand."""
+        return bool((self.spans >= GHOST_SPAN_THRESHOLD).any())
+
+    @property
+    def pose_wrist_detected(self) -> bool:
+        """Right wrist present in pose landmarks (lets callers bypass the span check)."""
+        if len(self.pose) < POSE_RIGHT_WRIST_OFFSET + 3:
+            return False
+        wrist = self.pose[POSE_RIGHT_WRIST_OFFSET:POSE_RIGHT_WRIST_OFFSET + 2]
+        return bool((np.abs(wrist) > NONZERO_EPSILON).any())
+
+    def without_hands(self) -> "FrameValidation":
+        """Same frame with its hands removed (face and pose kept), for frames whose hands were rejected."""
+        return FrameValidation(self.hands_flat[:0], self.face, self.pose, timestamp=self.timestamp)
+
+
+def decode_landmarks(landmark_frame):
+    """
+    Decode a LandmarkFrame's coordinates.
+    Frames carrying a packed payload are decoded with landmark_codec instead of
+    the repeated fields; a repeated face field is returned as is and decoded on first use.
+
+    Args:
+        landmark_frame: LandmarkFrame proto message
+
+    Returns:
+        Tuple of (hands, face, pose) for FrameValidation
+
+    Raises:
+        FrameDecodeError: If the packed payload is malformed
+    """
+    if landmark_frame.packed:
+        return decode_frame(landmark_frame.packed)
+    return _to_array(landmark_frame.hands), landmark_frame.face, _to_array(landmark_frame.pose)
+
+
+def validate_frame(landmark_frame) -> FrameValidation:
+    """
+    Decode and validate a LandmarkFrame in one vectorized pass.
+
+    Args:
+        landmark_frame: LandmarkFrame proto message
+
+    Returns:
+        FrameValidation shared by StreamLandmarks and the classifier
+
+    Raises:
+        FrameDecodeError: If the packed payload is malformed
+    """
+    hands, face, pose = decode_landmarks(landmark_frame)
+    return FrameValidation(hands_flat=hands, face=face, pose=pose, timestamp=landmark_frame.timestamp)
+
+
+def as_validated(frame) -> FrameValidation:
+    """Accept either a LandmarkFrame or an existing FrameValidation."""
+    if isinstance(frame, FrameValidation):
+        return frame
+    return validate_frame(frame)
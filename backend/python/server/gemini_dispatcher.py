@@ -0,0 +1,321 @@
+"""
+Rate-limited, batching dispatcher for Gemini translation calls.
+Outgoing prompts are paced by a token bucket sized to the API's requests-per-minute
+quota. Requests that queue up while the bucket is empty are packed into a single
+numbered prompt, so one call answers several gloss sequences at once.
+"""
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GEMINI_RPM = 15            # Gemini Flash free-tier quota
+DEFAULT_MAX_PROMPT_BATCH = 8       # Gloss sequences packed into one prompt
+DEFAULT_MAX_CONCURRENT_PROMPTS = 4  # Prompts in flight at the same time
+
+# One line per item: "<n>. English: [sentence] | Filipino: [sentence]"
+_BATCH_LINE = re.compile(r"^\s*(\d+)[.)]\s*English:\s*(.*?)\s*\|\s*Filipino:\s*(.*?)\s*$")
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate_per_minute / 60 tokens per second. Thread-safe.
+
+    The bucket holds at most `burst` tokens, so after an idle period only that many
+    calls go out back to back before the steady rate applies.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        """
+        Args:
+            rate_per_minute: Sustained calls per minute (<= 0 = unlimited)
+            burst: Bucket capacity
+        """
+        self.rate = max(0.0, rate_per_minute) / 60.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            0.0 if a token was taken, otherwise the seconds until one will be available
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a token is taken.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if a token was taken, False if it would not be available in time
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def refund(self):
+        """Return a token that was taken but not used."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1.0)
+
+
+class _Request:
+    __slots__ = ("glosses", "tone", "deadline", "future")
+
+    def __init__(self, glosses: List[str], tone: str, deadline: Optional[float]):
+        self.glosses = glosses
+        self.tone = tone
+        self.deadline = deadline
+        self.future: Future = Future()
+
+
+def build_batch_prompt(items: List[Tuple[List[str], str]]) -> str:
+    """Build one numbered prompt for several (glosses, tone) items."""
+    lines = [
+        "You are an FSL (Filipino Sign Language) interpreter. "
+        "Translate each numbered gloss sequence below into natural sentences in BOTH English and Filipino. "
+        "Use the facial tone given for each item as context. "
+        "Answer with exactly one line per item, in the same order, formatted exactly as: "
+        "'<number>. English: [sentence] | Filipino: [sentence]'",
+        "",
+    ]
+    for number, (glosses, tone) in enumerate(items, start=1):
+        lines.append(f"{number}. Glosses: {' '.join(glosses)} | Tone: {tone}")
+    lines.extend(["", "Output:"])
+    return "\n".join(lines)
+
+
+def parse_batch_response(text: str) -> Dict[int, Tuple[str, str]]:
+    """
+    Split a numbered batch response into per-item translations.
+
+    Returns:
+        Dict of item number (1-based) -> (english_sentence, filipino_sentence);
+        items missing from the response are absent
+    """
+    results = {}
+    for line in text.splitlines():
+        match = _BATCH_LINE.match(line.strip().strip("'\"`"))
+        if match:
+            english, filipino = match.group(2).strip(), match.group(3).strip()
+            if english and filipino:
+                results.setdefault(int(match.group(1)), (english, filipino))
+    return results
+
+
+class GeminiDispatcher:
+    """
+    Queues Gemini translation requests and sends them at the configured rate.
+
+    Callers block in translate() while a dispatcher thread waits for a token.
+    Everything that accumulated in the meantime (up to max_batch items) goes out
+    as one prompt; a lone request uses the regular single-item prompt. The
+    response is split back per request, and an item the model did not answer
+    fails on its own without affecting the others.
+    """
+
+    def __init__(self, single_call: Callable[[List[str], str, Optional[float]], Tuple[str, str]],
+                 generate: Callable[[str, Optional[float]], str],
+                 rpm: float = DEFAULT_GEMINI_RPM, max_batch: int = DEFAULT_MAX_PROMPT_BATCH,
+                 max_concurrent_prompts: int = DEFAULT_MAX_CONCURRENT_PROMPTS):
+        """
+        Args:
+            single_call: fn(glosses, tone, timeout) -> (english, filipino) for one item
+            generate: fn(prompt, timeout) -> response text for a batched prompt
+            rpm: Gemini requests per minute (<= 0 = no rate limit)
+            max_batch: Maximum gloss sequences per prompt
+            max_concurrent_prompts: Prompts allowed in flight at once
+        """
+        self._single_call = single_call
+        self._generate = generate
+        self.rpm = rpm
+        self.max_batch = max(1, max_batch)
+        # A full minute of quota: calls only wait (and batch) once the RPM budget is spent
+        self.bucket = TokenBucket(rpm, burst=max(1, int(rpm)))
+        self._pending: List[_Request] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent_prompts),
+                                            thread_name_prefix="gemini-prompt")
+
+        # Stats
+        self.prompts = 0          # Gemini calls made
+        self.items = 0            # Gloss sequences sent
+        self.batched_items = 0    # Gloss sequences that shared a prompt
+        self.throttled = 0        # Times a prompt had to wait for a token
+        self.abandoned = 0        # Requests whose caller gave up before they were sent
+        self.unanswered = 0       # Batched items missing from the response
+
+        self._thread = threading.Thread(target=self._run, name="gemini-dispatcher", daemon=True)
+        self._thread.start()
+
+    def translate(self, glosses: List[str], tone: str, timeout: Optional[float] = None) -> Tuple[str, str]:
+        """
+        Queue a translation and wait for its result.
+
+        Args:
+            glosses: List of gloss labels
+            tone: Tone tag
+            timeout: Seconds to wait, including time spent waiting for a token (None = no limit)
+
+        Returns:
+            Tuple of (english_sentence, filipino_sentence)
+
+        Raises:
+            TimeoutError: If no answer arrived within timeout
+            Exception: If the Gemini call failed or did not answer this item
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        request = _Request(list(glosses), tone, deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Gemini dispatcher is closed")
+            self._pending.append(request)
+            self._cond.notify()
+        try:
+            return request.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Still queued: withdraw it so it does not use up quota
+            if request.future.cancel():
+                self.abandoned += 1
+            raise TimeoutError(f"No Gemini answer within {timeout:.2f}s") from None
+
+    def _run(self):
+        """Dispatcher thread: wait for work, wait for a token, send what has queued."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+
+            wait = self.bucket.try_acquire()
+            if wait > 0:
+                self.throttled += 1
+                while wait > 0:
+                    with self._cond:
+                        if self._closed:
+                            return
+                        self._cond.wait(wait)
+                    wait = self.bucket.try_acquire()
+
+            batch = self._take_batch()
+            if not batch:
+                # Every queued caller gave up while we waited
+                self.bucket.refund()
+                continue
+            self.prompts += 1
+            self.items += len(batch)
+            if len(batch) > 1:
+                self.batched_items += len(batch)
+            try:
+                self._executor.submit(self._send, batch)
+            except RuntimeError as e:  # Closed while we waited for the token
+                for request in batch:
+                    request.future.set_exception(e)
+                return
+
+    def _take_batch(self) -> List[_Request]:
+        """Pop up to max_batch queued requests whose callers are still waiting."""
+        batch = []
+        now = time.monotonic()
+        with self._cond:
+            while self._pending and len(batch) < self.max_batch:
+                request = self._pending.pop(0)
+                if not request.future.set_running_or_notify_cancel():
+                    continue
+                if request.deadline is not None and request.deadline <= now:
+                    self.abandoned += 1
+                    request.future.set_exception(TimeoutError("Deadline passed while waiting for a Gemini token"))
+                    continue
+                batch.append(request)
+        return batch
+
+    @staticmethod
+    def _timeout_for(batch: List[_Request]) -> Optional[float]:
+        """Request timeout for a prompt: the most patient caller's remaining time."""
+        if any(r.deadline is None for r in batch):
+            return None
+        return max(r.deadline for r in batch) - time.monotonic()
+
+    def _send(self, batch: List[_Request]):
+        """Make one Gemini call for the batch and resolve each request's future."""
+        timeout = self._timeout_for(batch)
+        try:
+            if len(batch) == 1:
+                request = batch[0]
+                request.future.set_result(self._single_call(request.glosses, request.tone, timeout))
+                return
+
+            prompt = build_batch_prompt([(r.glosses, r.tone) for r in batch])
+            results = parse_batch_response(self._generate(prompt, timeout))
+            logger.info(f"Gemini batched prompt: {len(results)}/{len(batch)} items answered")
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        for number, request in enumerate(batch, start=1):
+            result = results.get(number)
+            if result is not None:
+                request.future.set_result(result)
+            else:
+                self.unanswered += 1
+                request.future.set_exception(
+                    ValueError(f"Batched Gemini response has no line for item {number}")
+                )
+
+    def close(self):
+        """Stop the dispatcher; queued requests fail and in-flight prompts are not waited for."""
+        with self._cond:
+            self._closed = True
+            pending, self._pending = self._pending, []
+            self._cond.notify_all()
+        for request in pending:
+            if request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError("Gemini dispatcher is closed"))
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def queued(self) -> int:
+        """Requests waiting for a token or a prompt."""
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        """Counters for logging and monitoring."""
+        return {
+            "rpm": self.rpm,
+            "queued": self.queued(),
+            "prompts": self.prompts,
+            "items": self.items,
+            "batched_items": self.batched_items,
+            "items_per_prompt": round(self.items / self.prompts, 2) if self.prompts else 0.0,
+            "throttled": self.throttled,
+            "abandoned": self.abandoned,
+            "unanswered": self.unanswered,
+        }
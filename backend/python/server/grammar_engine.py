@@ -2,28 +2,31 @@
 Grammar Engine for converting glosses to proper English sentences.
 Applies grammar rules based on tone tags to generate natural sentences.
 """
-from typing import List
+from typing import List, Optional, Tuple
+
+from lexicon import Lexicon, Segment, load_lexicon, POS_ADJECTIVE, POS_PRONOUN, POS_QUESTION, POS_VERB
+
+# Subjects in order of preference when a sequence contains several pronouns
+SUBJECT_PREFERENCE = ("I", "he", "she", "they", "you")
 
 
 class GrammarEngine:
     """
     Converts list of glosses + tone into proper English sentences.
     Applies basic grammar rules based on tone tags.
+    Word classes (action verbs, states, question words, pronouns) come from the
+    compiled lexicon, so English and Tagalog labels are handled alike.
     """
     
     # Question words that typically start questions
-    QUESTION_STARTERS = ["DO", "DID", "ARE", "IS", "WILL", "CAN", "WOULD", "COULD", "SHOULD"]
-    
-    # Action verbs that work with "Do/Did"
-    ACTION_VERBS = ["EAT", "DRINK", "GO", "COME", "SEE", "HEAR", "KNOW", "THINK", "FEEL", 
-                    "HELP", "WORK", "STOP", "START", "MEET", "LOVE", "LIKE", "WANT", "NEED"]
+    QUESTION_STARTERS = frozenset(["DO", "DID", "ARE", "IS", "WILL", "CAN", "WOULD", "COULD", "SHOULD"])
     
-    # State verbs that work with "Are/Is"
-    STATE_VERBS = ["HAPPY", "SAD", "ANGRY", "TIRED", "SORRY", "NICE", "GOOD", "BAD"]
-    
-    def __init__(self):
-        """Initialize the grammar engine."""
-        pass
+    def __init__(self, lexicon: Optional[Lexicon] = None):
+        """
+        Args:
+            lexicon: Gloss lexicon (default: the bundled lexicon_v11.json)
+        """
+        self.lexicon = lexicon or load_lexicon()
     
     def generate_sentence(self, glosses: List[str], tone_tag: str) -> str:
         """
@@ -42,21 +45,38 @@ class GrammarEngine:
         # Normalize tone tag (remove leading slash if present)
         tone = tone_tag.lstrip("/").lower() if tone_tag else "neutral"
         
-        # Convert glosses to lowercase for processing
-        gloss_lower = [g.lower() for g in glosses]
+        # Glosses and known phrases -> English words (one pass over the sequence)
+        segments = self.lexicon.segment(glosses)
+        words = [self._english(segment) for segment in segments]
         
         # Apply grammar rules based on tone
         if tone == "question":
-            return self._generate_question(gloss_lower)
+            return self._generate_question(words, [self._pos(segment) for segment in segments])
         elif tone == "exclamation":
-            return self._generate_exclamation(gloss_lower)
+            return self._generate_exclamation(words)
         elif tone == "serious" or tone == "neutral":
-            return self._generate_statement(gloss_lower)
+            return self._generate_statement(words)
         else:
             # Default to statement
-            return self._generate_statement(gloss_lower)
+            return self._generate_statement(words)
+    
+    @staticmethod
+    def _english(segment: Segment) -> str:
+        return segment.entry.english if segment.entry else " ".join(segment.glosses).lower()
+    
+    @staticmethod
+    def _pos(segment: Segment) -> str:
+        return segment.entry.pos if segment.entry else ""
     
-    def _generate_question(self, glosses: List[str]) -> str:
+    @staticmethod
+    def _split_subject(words: List[str], pos: List[str]) -> Tuple[str, List[str]]:
+        """Pick the subject among the pronouns (default "you") and return the remaining words."""
+        pronouns = {("I" if w.lower() in ("i", "me") else w) for w, p in zip(words, pos) if p == POS_PRONOUN}
+        subject = next((s for s in SUBJECT_PREFERENCE if s in pronouns), "you")
+        rest = [w for w, p in zip(words, pos) if p != POS_PRONOUN]
+        return subject, rest
+    
+    def _generate_question(self, glosses: List[str], pos: Optional[List[str]] = None) -> str:
         """
         Generate a question sentence.
         
@@ -64,15 +84,21 @@ class GrammarEngine:
             ["eat", "you"] -> "Did you eat?"
             ["happy", "you"] -> "Are you happy?"
             ["where", "you"] -> "Where are you?"
+        
+        Args:
+            glosses: English words
+            pos: Part of speech of each word (looked up in the lexicon if omitted)
         """
         if not glosses:
             return ""
+        if pos is None:
+            pos = [self._pos(Segment((g,), self.lexicon.lookup(g))) for g in glosses]
         
-        # Check for question words
-        question_words = ["how", "what", "where", "when", "why", "who", "which"]
         first_gloss = glosses[0]
+        first_pos = pos[0]
         
-        if first_gloss in question_words:
+        # Check for question words
+        if first_pos == POS_QUESTION:
             # Question word at start - form: "QuestionWord + verb + subject + ...?"
             if len(glosses) > 1:
                 # Reorder: question word + rest
@@ -82,26 +108,10 @@ class GrammarEngine:
                 return first_gloss.capitalize() + "?"
         
         # Check if first gloss is an action verb
-        if first_gloss.upper() in self.ACTION_VERBS:
+        if first_pos == POS_VERB:
             # Use "Do/Did" + subject + verb
             verb = first_gloss
-            rest = glosses[1:] if len(glosses) > 1 else []
-            
-            # Determine subject (look for "you", "i", "he", "she", "they")
-            subject = "you"  # Default
-            if "i" in rest:
-                subject = "I"
-            elif "he" in rest:
-                subject = "he"
-            elif "she" in rest:
-                subject = "she"
-            elif "they" in rest:
-                subject = "they"
-            elif "you" in rest:
-                subject = "you"
-            
-            # Remove subject from rest
-            rest_filtered = [g for g in rest if g.lower() not in ["i", "you", "he", "she", "they", "we"]]
+            subject, rest_filtered = self._split_subject(glosses[1:], pos[1:])
             
             # Build question: "Did + subject + verb + rest?"
             if rest_filtered:
@@ -110,22 +120,10 @@ class GrammarEngine:
                 return f"Did {subject} {verb}?".capitalize()
         
         # Check if first gloss is a state verb/adjective
-        elif first_gloss.upper() in self.STATE_VERBS:
+        elif first_pos == POS_ADJECTIVE:
             # Use "Are/Is" + subject + adjective
             adjective = first_gloss
-            rest = glosses[1:] if len(glosses) > 1 else []
-            
-            subject = "you"  # Default
-            if "i" in rest:
-                subject = "I"
-            elif "he" in rest:
-                subject = "he"
-            elif "she" in rest:
-                subject = "she"
-            elif "they" in rest:
-                subject = "they"
-            
-            rest_filtered = [g for g in rest if g.lower() not in ["i", "you", "he", "she", "they", "we"]]
+            subject, rest_filtered = self._split_subject(glosses[1:], pos[1:])
             
             if rest_filtered:
                 return f"Are {subject} {adjective} {' '.join(rest_filtered)}?".capitalize()
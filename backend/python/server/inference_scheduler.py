@@ -0,0 +1,161 @@
+"""
+Cross-stream micro-batching for gesture classification.
+Every StreamLandmarks session submits its frames here instead of calling the
+classifier inline; pending requests from all sessions run as one batched call.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceScheduler:
+    """
+    Collects classify_hands requests from all active streams and runs them as one batch.
+
+    A batch is dispatched as soon as max_batch_size requests are pending, or
+    max_wait_ms after the first request arrived, whichever comes first. While a
+    batch runs on the executor the next one accumulates, so the classifier stays busy.
+    Each caller gets its own result back through a future.
+    """
+
+    def __init__(self, classifier, executor: Executor,
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0):
+        """
+        Args:
+            classifier: Classifier implementing classify_hands_batch()
+            executor: Executor that runs the blocking batched call
+            max_batch_size: Maximum requests per batched call
+            max_wait_ms: Maximum time the first request waits for others to join
+        """
+        self.classifier = classifier
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._pending: List[Tuple[object, object, asyncio.Future]] = []
+        self._has_work = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.batches_run = 0
+        self.requests_run = 0
+        self.inference_seconds = 0.0  # Time spent in classify_hands_batch
+
+    @property
+    def average_batch_size(self) -> float:
+        """Mean number of requests per batched call so far."""
+        return self.requests_run / self.batches_run if self.batches_run else 0.0
+
+    def start(self):
+        """Start the dispatch loop on the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the dispatch loop and fail any requests still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, _, future in self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Inference scheduler stopped"))
+        self._pending.clear()
+
+    async def classify_hands(self, landmark_frame, window=None) -> Tuple[Optional[str], float]:
+        """
+        Queue one frame for batched classification and wait for its result.
+
+        Args:
+            landmark_frame: LandmarkFrame or FrameValidation
+            window: Per-stream window from classifier.create_window()
+
+        Returns:
+            Tuple of (gloss_label, confidence), as returned by classifier.classify_hands
+        """
+        return (await self.classify_hands_many([landmark_frame], window))[0]
+
+    async def classify_hands_many(self, landmark_frames: List, window=None) -> List[Tuple[Optional[str], float]]:
+        """
+        Queue consecutive frames of one stream in a single submission.
+
+        The frames are queued back to back, so they reach the classifier in
+        order and usually in the same batched call.
+
+        Args:
+            landmark_frames: LandmarkFrames or FrameValidations in capture order
+            window: Per-stream window from classifier.create_window()
+
+        Returns:
+            List of (gloss_label, confidence), one per frame
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in landmark_frames]
+        self._pending.extend(zip(landmark_frames, [window] * len(futures), futures))
+        self._has_work.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+        return list(await asyncio.gather(*futures))
+
+    async def _run(self):
+        """Dispatch loop: wait for work, give it max_wait to fill, run one batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._has_work.wait()
+
+            if len(self._pending) < self.max_batch_size and self.max_wait > 0:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            if len(self._pending) < self.max_batch_size:
+                self._batch_full.clear()
+            if not self._pending:
+                self._has_work.clear()
+
+            # Streams whose RPC was cancelled while waiting no longer need a result
+            batch = [item for item in batch if not item[2].cancelled()]
+            if not batch:
+                continue
+
+            requests = [(frame, window) for frame, window, _ in batch]
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, self.classifier.classify_hands_batch, requests
+                )
+            except Exception as e:
+                logger.error(f"Batched classification failed ({len(batch)} requests): {e}", exc_info=True)
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.requests_run += len(batch)
+            self.inference_seconds += time.perf_counter() - started
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        """Counters for logging and monitoring."""
+        return {
+            "batches": self.batches_run,
+            "requests": self.requests_run,
+            "average_batch_size": round(self.average_batch_size, 2),
+            "average_batch_ms": round(self.inference_seconds / self.batches_run * 1000, 3) if self.batches_run else 0.0,
+            "pending": len(self._pending),
+        }
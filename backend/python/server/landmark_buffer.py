@@ -106,7 +106,7 @@ class HandsDownDetector:
         Check if hands are down based on wrist y-coordinate.
         
         Args:
-            hand_landmarks: Flattened array [x0,y0,z0, x1,y1,z1, ...]
+            hand_landmarks: Flattened list or float32 array [x0,y0,z0, x1,y1,z1, ...]
                            Wrist is at indices 0-2 (y at index 1)
                            Can contain one or two hands (63 or 126 floats)
             current_time: Current timestamp in seconds
@@ -114,7 +114,7 @@ class HandsDownDetector:
         Returns:
             True if hands have been down for > duration_threshold
         """
-        if not hand_landmarks or len(hand_landmarks) < 3:
+        if hand_landmarks is None or len(hand_landmarks) < 3:
             # No hands detected, reset
             self.hands_down_start = None
             return False
@@ -0,0 +1,130 @@
+"""
+Packed binary encoding for LandmarkFrame.packed.
+Replaces the repeated float fields with one bytes payload so clients upload
+fewer bytes and the server decodes coordinates with np.frombuffer instead of
+building Python float containers.
+
+Layout (little-endian):
+    0  2s  magic b"EL"
+    2  B   version (1)
+    3  B   encoding (1 = float32, 2 = float16, 3 = int16 quantized)
+    4  H   hand float count
+    6  H   face float count
+    8  H   pose float count
+    10 2x  reserved
+    12 f   scale (int16 only: coordinate = value * scale)
+    16     hands, face, pose coordinates back to back
+"""
+import struct
+from typing import Tuple
+
+import numpy as np
+
+PACKED_MAGIC = b"EL"
+PACKED_VERSION = 1
+HEADER = struct.Struct("<2sBBHHHxxf")  # 16 bytes
+
+ENCODING_F32 = 1
+ENCODING_F16 = 2
+ENCODING_I16 = 3
+
+ENCODING_NAMES = {ENCODING_F32: "f32", ENCODING_F16: "f16", ENCODING_I16: "i16"}
+ENCODING_IDS = {name: code for code, name in ENCODING_NAMES.items()}
+ENCODING_DTYPES = {
+    ENCODING_F32: np.dtype("<f4"),
+    ENCODING_F16: np.dtype("<f2"),
+    ENCODING_I16: np.dtype("<i2"),
+}
+
+# Legacy clients keep using the repeated float fields
+ENCODING_REPEATED = "repeated"
+SUPPORTED_ENCODINGS = (ENCODING_REPEATED,) + tuple(ENCODING_NAMES[code] for code in sorted(ENCODING_NAMES))
+
+# Per-stream negotiation metadata keys
+FRAME_ENCODING_METADATA_KEY = "x-expressora-frame-encoding"  # client -> server: preferred encoding; echoed back with the one to use
+FRAME_ENCODINGS_KEY = "x-expressora-frame-encodings"         # server -> client: supported encodings
+
+# int16 default: +/-2.0 range at ~6e-5 resolution (normalized coordinates sit in [0, 1])
+DEFAULT_I16_SCALE = 1.0 / 16384.0
+
+
+class FrameDecodeError(ValueError):
+    """Raised when a packed payload is malformed."""
+
+
+def negotiate_encoding(requested: str) -> str:
+    """
+    Pick the frame encoding for a stream.
+
+    Args:
+        requested: Value of the client's x-expressora-frame-encoding metadata (may be empty)
+
+    Returns:
+        The requested encoding if supported, otherwise "repeated"
+    """
+    requested = (requested or "").strip().lower()
+    return requested if requested in SUPPORTED_ENCODINGS else ENCODING_REPEATED
+
+
+def encode_frame(hands, face=(), pose=(), encoding: str = "f16", scale: float = DEFAULT_I16_SCALE) -> bytes:
+    """
+    Pack landmark coordinates into a LandmarkFrame.packed payload.
+
+    Args:
+        hands: Flattened hand coordinates
+        face: Flattened face coordinates
+        pose: Flattened pose coordinates
+        encoding: "f32", "f16" or "i16"
+        scale: Quantization step for "i16"
+
+    Returns:
+        Packed bytes (header + coordinates)
+    """
+    code = ENCODING_IDS[encoding]
+    parts = [np.asarray(part, dtype=np.float32).reshape(-1) for part in (hands, face, pose)]
+    values = np.concatenate(parts)
+    if code == ENCODING_I16:
+        values = np.clip(np.rint(values / scale), -32768, 32767)
+    else:
+        scale = 0.0
+    header = HEADER.pack(PACKED_MAGIC, PACKED_VERSION, code, len(parts[0]), len(parts[1]), len(parts[2]), scale)
+    return header + values.astype(ENCODING_DTYPES[code]).tobytes()
+
+
+def decode_frame(packed: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode a LandmarkFrame.packed payload.
+
+    float32 payloads are returned as zero-copy (read-only) views of the message
+    buffer; float16 and int16 payloads are widened to float32 in one vectorized step.
+
+    Args:
+        packed: Packed bytes
+
+    Returns:
+        Tuple of (hands, face, pose) float32 arrays
+
+    Raises:
+        FrameDecodeError: If the header or payload size is invalid
+    """
+    if len(packed) < HEADER.size:
+        raise FrameDecodeError(f"Packed frame too short ({len(packed)} bytes)")
+    magic, version, code, n_hands, n_face, n_pose, scale = HEADER.unpack_from(packed)
+    if magic != PACKED_MAGIC or version != PACKED_VERSION:
+        raise FrameDecodeError(f"Unsupported packed frame header (magic={magic!r}, version={version})")
+    dtype = ENCODING_DTYPES.get(code)
+    if dtype is None:
+        raise FrameDecodeError(f"Unknown packed frame encoding {code}")
+
+    total = n_hands + n_face + n_pose
+    if len(packed) != HEADER.size + total * dtype.itemsize:
+        raise FrameDecodeError(f"Packed frame size mismatch: {len(packed)} bytes for {total} values")
+
+    values = np.frombuffer(packed, dtype=dtype, count=total, offset=HEADER.size)
+    if code == ENCODING_I16:
+        values = values.astype(np.float32)
+        values *= scale
+    elif code == ENCODING_F16:
+        values = values.astype(np.float32)
+
+    return values[:n_hands], values[n_hands:n_hands + n_face], values[n_hands + n_face:]
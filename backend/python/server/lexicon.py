@@ -0,0 +1,163 @@
+"""
+Compiled gloss lexicon for the local translators.
+Loaded once from models/lexicon_v11.json, which covers every label the classifier
+can emit. Lookups are dict hits, word classes are frozensets, and multi-gloss
+phrases ("THANK YOU", "NICE MEET YOU") are matched with a trie, so translating a
+sequence stays linear in its length.
+"""
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "models", "lexicon_v11.json")
+
+# Parts of speech used in the lexicon file
+POS_VERB = "verb"
+POS_ADJECTIVE = "adjective"
+POS_QUESTION = "question"
+POS_PRONOUN = "pronoun"
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+_PHRASE_END = ""  # Trie key marking a complete phrase (never a normalized gloss)
+
+
+@lru_cache(maxsize=4096)
+def normalize_gloss(gloss: str) -> str:
+    """
+    Lookup key of a gloss: lower case without underscores, dashes or spaces ("THANK_YOU" -> "thankyou").
+    Memoized, since the classifier only emits a few hundred distinct labels.
+    """
+    return _SEPARATORS.sub("", gloss.strip().lower())
+
+
+class LexiconEntry(NamedTuple):
+    english: str
+    filipino: str
+    pos: str
+
+
+class Segment(NamedTuple):
+    """One or more consecutive glosses translated as a unit (entry is None if unknown)."""
+    glosses: Sequence[str]
+    entry: Optional[LexiconEntry]
+
+
+class Lexicon:
+    """
+    Gloss -> (English, Filipino, part of speech) table with phrase matching.
+
+    Immutable after construction and safe to share between threads.
+    """
+
+    def __init__(self, words: Dict[str, LexiconEntry], phrases: Dict[tuple, LexiconEntry]):
+        """
+        Args:
+            words: Normalized gloss -> entry
+            phrases: Tuple of normalized glosses (2 or more) -> entry
+        """
+        self._words = words
+        # Nested dicts keyed by normalized gloss; _PHRASE_END holds the entry
+        self._trie: dict = {}
+        for keys, entry in phrases.items():
+            node = self._trie
+            for key in keys:
+                node = node.setdefault(key, {})
+            node[_PHRASE_END] = entry
+        self.phrase_count = len(phrases)
+
+        def pos_set(pos: str) -> FrozenSet[str]:
+            return frozenset(key for key, entry in words.items() if entry.pos == pos)
+
+        self.verbs = pos_set(POS_VERB)
+        self.adjectives = pos_set(POS_ADJECTIVE)
+        self.question_words = pos_set(POS_QUESTION)
+        self.pronouns = pos_set(POS_PRONOUN)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, gloss: str) -> bool:
+        return normalize_gloss(gloss) in self._words
+
+    def lookup(self, gloss: str) -> Optional[LexiconEntry]:
+        """Entry for a single gloss, or None if it is not in the lexicon."""
+        return self._words.get(normalize_gloss(gloss))
+
+    def segment(self, glosses: Sequence[str]) -> List[Segment]:
+        """
+        Split a gloss sequence into known phrases and single glosses.
+
+        At each position the longest phrase in the trie wins; otherwise the gloss
+        stands alone. Phrases are a few glosses long, so this is O(len(glosses)).
+        """
+        return [Segment(glosses[i:j], entry) for i, j, entry in self._spans(glosses)]
+
+    def _spans(self, glosses: Sequence[str]) -> Iterator[Tuple[int, int, Optional[LexiconEntry]]]:
+        """Yield (start, end, entry) for each segment of the sequence."""
+        keys = [normalize_gloss(g) for g in glosses]
+        trie, words = self._trie, self._words
+        n = len(keys)
+        i = 0
+        while i < n:
+            node = trie
+            match_end, match = i, None
+            j = i
+            while j < n and keys[j] in node:
+                node = node[keys[j]]
+                j += 1
+                if _PHRASE_END in node:
+                    match_end, match = j, node[_PHRASE_END]
+            if match is not None:
+                yield i, match_end, match
+                i = match_end
+            else:
+                yield i, i + 1, words.get(keys[i])
+                i += 1
+
+    def to_english(self, glosses: Sequence[str]) -> List[str]:
+        """English words for a sequence; unknown glosses are lower-cased as they are."""
+        return [entry.english if entry else glosses[i].lower() for i, _, entry in self._spans(glosses)]
+
+    def to_filipino(self, glosses: Sequence[str]) -> List[str]:
+        """Filipino words for a sequence; unknown glosses are kept as they are."""
+        return [entry.filipino if entry else glosses[i] for i, _, entry in self._spans(glosses)]
+
+
+def _entry(raw: dict) -> LexiconEntry:
+    return LexiconEntry(raw["en"], raw["fil"], raw.get("pos", ""))
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(path: str = DEFAULT_LEXICON_PATH) -> Lexicon:
+    """
+    Load and compile a lexicon file (cached: each path is read once per process).
+
+    Raises:
+        OSError, ValueError: If the file is missing or malformed
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    words: Dict[str, LexiconEntry] = {}
+    for section in ("labels", "extra"):
+        for gloss, raw in data.get(section, {}).items():
+            key = normalize_gloss(gloss)
+            if key in words:
+                logger.warning(f"Lexicon {path}: duplicate gloss '{gloss}' ignored")
+                continue
+            words[key] = _entry(raw)
+
+    phrases = {}
+    for raw in data.get("phrases", []):
+        keys = tuple(normalize_gloss(g) for g in raw["glosses"])
+        if len(keys) < 2:
+            raise ValueError(f"Lexicon {path}: phrase {raw['glosses']} needs at least two glosses")
+        phrases[keys] = _entry(raw)
+
+    logger.info(f"Loaded lexicon {os.path.basename(path)}: {len(words)} glosses, {len(phrases)} phrases")
+    return Lexicon(words, phrases)
@@ -0,0 +1,389 @@
+"""
+Low-overhead server metrics.
+Counters, gauges and fixed-bucket histograms kept in plain Python objects (one
+small lock per labelled series), rendered on demand as Prometheus text for the
+local /metrics endpoint and as samples for the GetStats RPC. Components that
+already keep counters expose them through their stats() dicts as collectors.
+"""
+import logging
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "expressora"
+
+# Seconds; covers sub-millisecond decode up to multi-second Gemini calls
+DEFAULT_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Sample(NamedTuple):
+    name: str
+    labels: Dict[str, str]
+    value: float
+
+
+class _Series:
+    """One labelled counter or gauge value."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = float(value)
+
+
+class _HistogramSeries:
+    """One labelled histogram: per-bucket counts, sum and count."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the q-th percentile (0-100) by linear interpolation inside its bucket.
+        Values in the +Inf bucket are reported as the largest finite bound.
+        """
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if total == 0:
+            return 0.0
+        rank = q / 100.0 * total
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                return lower + (self.bounds[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+
+class _Metric:
+    """Metric family: a name, help text and one series per label combination."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self):
+        return _Series()
+
+    def labels(self, *values: str):
+        """
+        Series for the given label values (created on first use).
+
+        Hot paths should call this once and keep the returned series.
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        key = tuple(str(v) for v in values)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, self._new_series())
+        return series
+
+    def _items(self) -> List[Tuple[Dict[str, str], object]]:
+        with self._lock:
+            items = list(self._series.items())
+        return [(dict(zip(self.labelnames, key)), series) for key, series in items]
+
+
+class Counter(_Metric):
+    """Monotonic count (use .labels(...).inc(), or .inc() without labels)."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def samples(self) -> List[Sample]:
+        return [Sample(self.name, labels, series.value) for labels, series in self._items()]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at collection time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the (unlabelled) value from `function` whenever metrics are collected."""
+        self._function = function
+
+    def samples(self) -> List[Sample]:
+        if self._function is not None:
+            return [Sample(self.name, {}, float(self._function()))]
+        return [Sample(self.name, labels, series.value) for labels, series in self._items()]
+
+
+class Histogram(_Metric):
+    """Distribution in fixed buckets (seconds by default)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def _new_series(self):
+        return _HistogramSeries(self.bounds)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        for labels, series in self._items():
+            with series._lock:
+                counts, total, count = list(series.counts), series.sum, series.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                samples.append(Sample(f"{self.name}_bucket", {**labels, "le": le}, cumulative))
+            samples.append(Sample(f"{self.name}_sum", labels, total))
+            samples.append(Sample(f"{self.name}_count", labels, count))
+        return samples
+
+
+def _flatten_stats(prefix: str, stats: dict) -> List[Sample]:
+    """Turn a component's stats() dict into gauge samples (strings become a value label)."""
+    samples = []
+    for key, value in stats.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, (bool, int, float)):
+            samples.append(Sample(name, {}, float(value)))
+        elif isinstance(value, str):
+            samples.append(Sample(name, {"value": value}, 1.0))
+        elif isinstance(value, dict):
+            samples.extend(_flatten_stats(name, value))
+    return samples
+
+
+class MetricsRegistry:
+    """Named metrics plus stats() collectors, all prefixed with the namespace."""
+
+    def __init__(self, namespace: str = NAMESPACE):
+        self.namespace = namespace
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Tuple[str, Callable[[], dict]]] = []  # (subsystem, stats)
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets))
+
+    def add_collector(self, subsystem: str, stats: Callable[[], dict]):
+        """
+        Export a component's stats() dict as gauges named <namespace>_<subsystem>_<key>.
+
+        Args:
+            subsystem: Name prefix, e.g. "translation_cache"
+            stats: Callable returning the dict (called on every collection)
+        """
+        self._collectors.append((subsystem, stats))
+
+    def collect(self) -> List[Tuple[str, str, str, List[Sample]]]:
+        """(name, type, help, samples) for every metric family and collector."""
+        families = [(m.name, m.kind, m.documentation, m.samples()) for m in self._metrics]
+        for subsystem, stats in self._collectors:
+            try:
+                samples = _flatten_stats(f"{self.namespace}_{subsystem}", stats())
+            except Exception as e:
+                logger.warning(f"Metrics collector {subsystem} failed: {e}")
+                continue
+            families.extend((sample.name, "gauge", f"From {subsystem} stats()", [sample]) for sample in samples)
+        return families
+
+    def samples(self, prefix: str = "") -> List[Sample]:
+        """All current samples, optionally only those whose name starts with prefix."""
+        return [s for _, _, _, samples in self.collect() for s in samples if s.name.startswith(prefix)]
+
+    def render_prometheus(self, prefix: str = "") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, kind, documentation, samples in self.collect():
+            samples = [s for s in samples if s.name.startswith(prefix)]
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                lines.append(f"{sample.name}{_format_labels(sample.labels)} {_format_value(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class ServerMetrics:
+    """
+    Metrics recorded by the gRPC servicer.
+
+    Per-stage latencies (seconds) use the stage label: decode (repeated fields or
+    packed payload to arrays), validate (hand checks), classify_hands (scheduler
+    submission to result, including batching wait), classify_face, and emit
+    (handler suspended while gRPC sends the events of one message).
+    """
+
+    STAGES = ("decode", "validate", "classify_hands", "classify_face", "emit")
+    STREAM_RPCS = ("StreamLandmarks", "StreamLandmarkBatches")
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+
+        stage = r.histogram("stage_seconds", "Time spent in each landmark processing stage", ("stage",))
+        self.stage = {name: stage.labels(name) for name in self.STAGES}
+        message = r.histogram("message_seconds", "Processing time of the frames taken from a stream's queue at once",
+                              ("rpc",))
+        self.message = {rpc: message.labels(rpc) for rpc in self.STREAM_RPCS}
+
+        frames = r.counter("frames_received_total", "Landmark frames received", ("rpc",))
+        self.frames_received = {rpc: frames.labels(rpc) for rpc in self.STREAM_RPCS}
+        self.frames_dropped = r.counter("frames_dropped_total", "Landmark frames dropped", ("reason",))
+        self.frames_classified = r.counter("frames_classified_total", "Frames submitted to classify_hands")
+        self.events = r.counter("events_total", "RecognitionEvents sent", ("type",))
+
+        latency = r.histogram("event_latency_seconds", "Latency of the frame behind each sent event: client "
+                              "capture to server receive (epoch client clocks only) and server receive to send",
+                              ("span",))
+        self.capture_to_server = latency.labels("capture_to_server")
+        self.server_latency = latency.labels("server")
+
+        self.streams_started = r.counter("streams_started_total", "Landmark streams opened")
+        self.streams_rejected = r.counter("streams_rejected_total", "Landmark streams rejected at the session limit")
+        self.active_streams = r.gauge("active_streams", "Landmark streams currently open")
+
+        self.translations = r.counter("translations_total", "Translations answered, by RPC and source",
+                                      ("rpc", "source"))
+        self.translation_errors = r.counter("translation_errors_total", "Translation RPCs that failed", ("rpc",))
+        self.translation_seconds = r.histogram("translation_seconds", "Translation RPC latency", ("rpc",))
+
+    def record_translation(self, rpc: str, source: str, seconds: Optional[float] = None):
+        """Count one translation by source and, if given, record the RPC latency."""
+        self.translations.labels(rpc, source).inc()
+        if seconds is not None:
+            self.translation_seconds.labels(rpc).observe(seconds)
+
+    def stage_summary(self) -> dict:
+        """Per-stage p50/p99 in milliseconds and counts, for the shutdown log."""
+        summary = {}
+        for name, series in self.stage.items():
+            if series.count:
+                summary[name] = {
+                    "count": series.count,
+                    "p50_ms": round(series.percentile(50) * 1000, 3),
+                    "p99_ms": round(series.percentile(99) * 1000, 3),
+                }
+        return summary
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = None  # Set on the per-server subclass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404, "Only /metrics is served")
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the server log
+
+
+class MetricsHttpServer:
+    """Serves GET /metrics (Prometheus text) from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Args:
+            registry: Metrics to expose
+            host: Interface to bind (keep it local unless scrapers run elsewhere)
+            port: TCP port (0 = any free port, see .port)
+        """
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.host = host
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        logger.info(f"📈 Metrics endpoint on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
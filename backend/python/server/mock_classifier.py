@@ -6,6 +6,8 @@ import random
 import time
 from typing import List, Tuple, Optional
 
+from frame_validation import as_validated
+
 # Sample gloss vocabulary
 SAMPLE_GLOSSES = [
     "HELLO", "THANK_YOU", "YES", "NO", "PLEASE", "SORRY", "GOODBYE",
@@ -24,6 +26,9 @@ class MockClassifier:
     In production, this would be replaced with actual ML model inference.
     """
     
+    # Glosses come from hand landmarks only (face is used for tone)
+    uses_face_features = False
+    
     def __init__(self, processing_delay: float = 0.05):
         """
         Args:
@@ -32,14 +37,19 @@ class MockClassifier:
         self.processing_delay = processing_delay
         self.last_gloss: Optional[str] = None
         self.gloss_history: List[str] = []
+    
+    def create_window(self):
+        """Per-stream window (unused - the mock classifies single frames)."""
+        return None
         
-    def classify_hands(self, landmark_frame) -> Tuple[Optional[str], float]:
+    def classify_hands(self, landmark_frame, window=None) -> Tuple[Optional[str], float]:
         """
         Classify hand gestures from landmark frame.
         Returns gloss predictions from hands only.
         
         Args:
-            landmark_frame: Landmark frame data
+            landmark_frame: LandmarkFrame or FrameValidation
+            window: Per-stream window from create_window() (ignored)
             
         Returns:
             Tuple of (gloss_label, confidence) or (None, 0.0) if no hands detected
@@ -47,31 +57,27 @@ class MockClassifier:
         # Simulate processing delay
         time.sleep(self.processing_delay)
         
-        # Step 5: Post-Processing Validation - Enhanced hand presence check
-        if not hasattr(landmark_frame, 'hands') or not landmark_frame.hands:
-            return None, 0.0
-        
-        hand_landmarks = list(landmark_frame.hands)
-        hand_count = len(hand_landmarks) // 63 if hand_landmarks else 0
-        
-        if hand_count == 0:
-            return None, 0.0
+        return self._classify_hands_frame(landmark_frame)
+    
+    def classify_hands_batch(self, requests: List[Tuple[object, object]]) -> List[Tuple[Optional[str], float]]:
+        """
+        Classify frames from many streams in one simulated batched call.
+        The processing delay is paid once per batch, like a batched model invocation.
         
-        # Additional validation: Check landmark quality
-        # Ensure landmarks are not all zeros or invalid positions
-        valid_hand_found = False
-        for i in range(hand_count):
-            hand_start = i * 63
-            hand_end = hand_start + 63
-            hand_data = hand_landmarks[hand_start:hand_end]
+        Args:
+            requests: List of (LandmarkFrame or FrameValidation, window) pairs
             
-            # Check if hand has valid landmarks (not all zeros)
-            non_zero_count = sum(1 for x in hand_data if abs(x) > 0.001)
-            if non_zero_count >= 15:  # At least 15 valid landmarks
-                valid_hand_found = True
-                break
-        
-        if not valid_hand_found:
+        Returns:
+            List of (gloss_label, confidence) in request order
+        """
+        time.sleep(self.processing_delay)
+        return [self._classify_hands_frame(landmark_frame) for landmark_frame, _ in requests]
+    
+    def _classify_hands_frame(self, landmark_frame) -> Tuple[Optional[str], float]:
+        """Hand classification for a single frame, without the simulated delay."""
+        # Step 5: Post-Processing Validation - reuse the vectorized hand checks
+        validation = as_validated(landmark_frame)
+        if not validation.has_valid_hand:
             # No valid hand detected - return None
             return None, 0.0
         
@@ -92,7 +98,7 @@ class MockClassifier:
         Returns tone predictions from face only (NOT gloss words).
         
         Args:
-            landmark_frame: Landmark frame data
+            landmark_frame: LandmarkFrame or FrameValidation
             
         Returns:
             Tuple of (tone_tag, confidence) or (None, 0.0) if no face detected
@@ -101,9 +107,7 @@ class MockClassifier:
         time.sleep(self.processing_delay * 0.5)  # Face processing is faster
         
         # Check if face is present
-        face_count = len(landmark_frame.face) // 3 if hasattr(landmark_frame, 'face') and landmark_frame.face else 0
-        
-        if face_count == 0:
+        if as_validated(landmark_frame).face_count == 0:
             return None, 0.0
         
         # Generate random tone (in production, this would be actual face expression model)
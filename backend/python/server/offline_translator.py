@@ -0,0 +1,452 @@
+"""
+Offline gloss-to-sentence translation with the app's small T5 model, on CPU in NumPy.
+Uses the same tokenizer.json / config.json as the Android OfflineTranslationEngine.
+The encoder runs once per request, the decoder reuses cached keys/values across
+steps, and concurrent requests are decoded together as one greedy batch.
+
+Weights are not shipped with the repo. Export them once from the Hugging Face
+checkpoint the app's ONNX files were built from:
+
+    model = T5ForConditionalGeneration.from_pretrained(checkpoint_dir)
+    np.savez("models/translation/t5_weights.npz",
+             **{k: v.numpy() for k, v in model.state_dict().items()})
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "translation")
+DEFAULT_WEIGHTS_PATH = os.path.join(TRANSLATION_MODELS_DIR, "t5_weights.npz")
+DEFAULT_TOKENIZER_PATH = os.path.join(TRANSLATION_MODELS_DIR, "tokenizer.json")
+DEFAULT_CONFIG_PATH = os.path.join(TRANSLATION_MODELS_DIR, "config.json")
+
+LANGUAGE_TAGS = {"en": "<2en>", "fil": "<2fil>"}
+METASPACE = "\u2581"  # SentencePiece word-boundary marker
+MAX_NEW_TOKENS = 32
+MASK_VALUE = np.float32(-1e9)
+
+
+class UnigramTokenizer:
+    """
+    Minimal reader for the app's tokenizer.json (Metaspace pre-tokenizer + Unigram model).
+    Words are segmented with Viterbi over the piece log-probabilities.
+    """
+
+    def __init__(self, path: str = DEFAULT_TOKENIZER_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        vocab = data["model"]["vocab"]
+        self._pieces: Dict[str, Tuple[int, float]] = {piece: (i, score) for i, (piece, score) in enumerate(vocab)}
+        self._max_piece_len = max(len(piece) for piece, _ in vocab)
+        self._unk_score = min(score for _, score in vocab) - 10.0
+
+        self.special_tokens: Dict[str, int] = {t["content"]: t["id"] for t in data.get("added_tokens", []) if t.get("special")}
+        self.special_ids = frozenset(self.special_tokens.values())
+        self.id_to_token: Dict[int, str] = {i: piece for i, (piece, _) in enumerate(vocab)}
+        self.id_to_token.update({i: token for token, i in self.special_tokens.items()})
+        self.unk_id = self.special_tokens.get("[UNK]", 2)
+        self._word_cache: Dict[str, List[int]] = {}
+
+    def encode(self, text: str) -> List[int]:
+        """Encode text (special tokens such as <2en> may appear as whole words)."""
+        ids: List[int] = []
+        for word in text.split():
+            special = self.special_tokens.get(word)
+            if special is not None:
+                ids.append(special)
+            else:
+                ids.extend(self._encode_word(word))
+        return ids
+
+    def _encode_word(self, word: str) -> List[int]:
+        """Viterbi segmentation of one whitespace-separated word (memoized)."""
+        cached = self._word_cache.get(word)
+        if cached is not None:
+            return cached
+
+        text = METASPACE + word
+        n = len(text)
+        best = [-math.inf] * (n + 1)
+        back: List[Tuple[int, int]] = [(0, self.unk_id)] * (n + 1)
+        best[0] = 0.0
+        for end in range(1, n + 1):
+            for start in range(max(0, end - self._max_piece_len), end):
+                if best[start] == -math.inf:
+                    continue
+                entry = self._pieces.get(text[start:end])
+                if entry is None:
+                    if end - start != 1:
+                        continue
+                    entry = (self.unk_id, self._unk_score)  # Character outside the vocabulary
+                score = best[start] + entry[1]
+                if score > best[end]:
+                    best[end] = score
+                    back[end] = (start, entry[0])
+
+        ids = []
+        end = n
+        while end > 0:
+            start, token_id = back[end]
+            ids.append(token_id)
+            end = start
+        ids.reverse()
+
+        if len(self._word_cache) < 10000:
+            self._word_cache[word] = ids
+        return ids
+
+    def decode(self, ids: Sequence[int]) -> str:
+        """Decode token IDs, skipping special tokens."""
+        pieces = [self.id_to_token.get(i, "") for i in ids if i not in self.special_ids]
+        return "".join(pieces).replace(METASPACE, " ").strip()
+
+
+def _relative_position_bucket(relative_position: np.ndarray, bidirectional: bool,
+                              num_buckets: int, max_distance: int) -> np.ndarray:
+    """T5 relative position buckets (same arithmetic as the Hugging Face implementation)."""
+    buckets = np.zeros_like(relative_position)
+    if bidirectional:
+        num_buckets //= 2
+        buckets += (relative_position > 0).astype(np.int64) * num_buckets
+        relative_position = np.abs(relative_position)
+    else:
+        relative_position = -np.minimum(relative_position, 0)
+    max_exact = num_buckets // 2
+    is_small = relative_position < max_exact
+    scaled = (np.log(np.maximum(relative_position, 1).astype(np.float32) / max_exact)
+              / np.float32(math.log(max_distance / max_exact)) * np.float32(num_buckets - max_exact))
+    if_large = np.minimum(max_exact + scaled.astype(np.int64), num_buckets - 1)
+    return buckets + np.where(is_small, relative_position, if_large)
+
+
+def _rms_norm(x: np.ndarray, weight: np.ndarray, eps: float) -> np.ndarray:
+    """T5 layer norm: scale only, no mean subtraction and no bias."""
+    variance = np.mean(x * x, axis=-1, keepdims=True)
+    return x / np.sqrt(variance + eps) * weight
+
+
+def _softmax_inplace(scores: np.ndarray) -> np.ndarray:
+    scores -= scores.max(axis=-1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=-1, keepdims=True)
+    return scores
+
+
+class NumpyT5:
+    """
+    T5 encoder-decoder forward pass in NumPy (float32), loaded once.
+
+    Weights use Hugging Face state_dict names. Matrices are stored transposed
+    (and the self-attention q/k/v fused) so every projection is one matmul.
+    """
+
+    def __init__(self, weights_path: str, config: dict):
+        self.d_model = config["d_model"]
+        self.num_heads = config["num_heads"]
+        self.d_kv = config["d_kv"]
+        self.inner_dim = self.num_heads * self.d_kv
+        self.num_layers = config["num_layers"]
+        self.num_decoder_layers = config.get("num_decoder_layers", self.num_layers)
+        self.num_buckets = config["relative_attention_num_buckets"]
+        self.max_distance = config.get("relative_attention_max_distance", 128)
+        self.eps = config.get("layer_norm_epsilon", 1e-6)
+        self.decoder_start_token_id = config["decoder_start_token_id"]
+        self.eos_token_id = config["eos_token_id"]
+        self.pad_token_id = config.get("pad_token_id", self.decoder_start_token_id)
+        self.tie_word_embeddings = config.get("tie_word_embeddings", True)
+        if config.get("is_gated_act", False) or config.get("feed_forward_proj", "relu") != "relu":
+            raise ValueError("Only the relu (non-gated) T5 feed-forward is supported")
+
+        with np.load(weights_path) as npz:
+            w = {name: npz[name].astype(np.float32) for name in npz.files}
+
+        self.embed = w["shared.weight"]
+        lm_head = w.get("lm_head.weight", self.embed)
+        self.lm_head_t = np.ascontiguousarray(lm_head.T)
+        self.enc_rel_bias = w["encoder.block.0.layer.0.SelfAttention.relative_attention_bias.weight"]
+        self.dec_rel_bias = w["decoder.block.0.layer.0.SelfAttention.relative_attention_bias.weight"]
+        self.enc_final_ln = w["encoder.final_layer_norm.weight"]
+        self.dec_final_ln = w["decoder.final_layer_norm.weight"]
+
+        def t(name):
+            return np.ascontiguousarray(w[name].T)
+
+        def fused_qkv(prefix):
+            return np.ascontiguousarray(np.concatenate([w[f"{prefix}.q.weight"], w[f"{prefix}.k.weight"],
+                                                        w[f"{prefix}.v.weight"]]).T)
+
+        self.encoder_layers = []
+        for i in range(self.num_layers):
+            p = f"encoder.block.{i}.layer"
+            self.encoder_layers.append({
+                "ln_attn": w[f"{p}.0.layer_norm.weight"],
+                "qkv": fused_qkv(f"{p}.0.SelfAttention"),
+                "o": t(f"{p}.0.SelfAttention.o.weight"),
+                "ln_ff": w[f"{p}.1.layer_norm.weight"],
+                "wi": t(f"{p}.1.DenseReluDense.wi.weight"),
+                "wo": t(f"{p}.1.DenseReluDense.wo.weight"),
+            })
+
+        self.decoder_layers = []
+        for i in range(self.num_decoder_layers):
+            p = f"decoder.block.{i}.layer"
+            self.decoder_layers.append({
+                "ln_self": w[f"{p}.0.layer_norm.weight"],
+                "qkv": fused_qkv(f"{p}.0.SelfAttention"),
+                "o": t(f"{p}.0.SelfAttention.o.weight"),
+                "ln_cross": w[f"{p}.1.layer_norm.weight"],
+                "cross_q": t(f"{p}.1.EncDecAttention.q.weight"),
+                "cross_kv": np.ascontiguousarray(np.concatenate([w[f"{p}.1.EncDecAttention.k.weight"],
+                                                                 w[f"{p}.1.EncDecAttention.v.weight"]]).T),
+                "cross_o": t(f"{p}.1.EncDecAttention.o.weight"),
+                "ln_ff": w[f"{p}.2.layer_norm.weight"],
+                "wi": t(f"{p}.2.DenseReluDense.wi.weight"),
+                "wo": t(f"{p}.2.DenseReluDense.wo.weight"),
+            })
+
+        # Decoder self-attention bias for every (query, key) position up to the step limit
+        self._dec_bias_table = self._position_bias(MAX_NEW_TOKENS + 1, MAX_NEW_TOKENS + 1, False, self.dec_rel_bias)
+
+    def _position_bias(self, query_len: int, key_len: int, bidirectional: bool, table: np.ndarray) -> np.ndarray:
+        """Relative position bias of shape (1, heads, query_len, key_len)."""
+        relative = np.arange(key_len)[None, :] - np.arange(query_len)[:, None]
+        buckets = _relative_position_bucket(relative, bidirectional, self.num_buckets, self.max_distance)
+        return np.ascontiguousarray(table[buckets].transpose(2, 0, 1)[None])
+
+    def _split_heads(self, x: np.ndarray) -> np.ndarray:
+        """(B, L, inner) -> (B, H, L, d_kv)"""
+        b, length, _ = x.shape
+        return x.reshape(b, length, self.num_heads, self.d_kv).transpose(0, 2, 1, 3)
+
+    def _merge_heads(self, x: np.ndarray) -> np.ndarray:
+        """(B, H, L, d_kv) -> (B, L, inner)"""
+        b, _, length, _ = x.shape
+        return x.transpose(0, 2, 1, 3).reshape(b, length, self.inner_dim)
+
+    def encode(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """
+        Run the encoder.
+
+        Args:
+            input_ids: int array (B, S), right-padded
+            attention_mask: bool array (B, S)
+
+        Returns:
+            float32 hidden states (B, S, d_model)
+        """
+        seq_len = input_ids.shape[1]
+        x = self.embed[input_ids]
+        mask_bias = np.where(attention_mask[:, None, None, :], np.float32(0.0), MASK_VALUE)
+        bias = self._position_bias(seq_len, seq_len, True, self.enc_rel_bias) + mask_bias
+
+        for layer in self.encoder_layers:
+            h = _rms_norm(x, layer["ln_attn"], self.eps)
+            q, k, v = np.split(h @ layer["qkv"], 3, axis=-1)
+            scores = self._split_heads(q) @ self._split_heads(k).transpose(0, 1, 3, 2) + bias
+            x = x + self._merge_heads(_softmax_inplace(scores) @ self._split_heads(v)) @ layer["o"]
+
+            h = _rms_norm(x, layer["ln_ff"], self.eps)
+            x = x + np.maximum(h @ layer["wi"], 0.0) @ layer["wo"]
+
+        return _rms_norm(x, self.enc_final_ln, self.eps)
+
+    def generate(self, sequences: Sequence[Sequence[int]], max_new_tokens: int = MAX_NEW_TOKENS) -> List[List[int]]:
+        """
+        Batched greedy decoding.
+
+        Args:
+            sequences: Encoder token IDs per request (EOS is appended here)
+            max_new_tokens: Maximum generated tokens per request
+
+        Returns:
+            Generated token IDs per request, without the final EOS
+        """
+        max_new_tokens = min(max_new_tokens, MAX_NEW_TOKENS)
+        batch = len(sequences)
+        src_len = max(len(s) for s in sequences) + 1
+        input_ids = np.full((batch, src_len), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((batch, src_len), dtype=bool)
+        for row, seq in enumerate(sequences):
+            input_ids[row, :len(seq)] = seq
+            input_ids[row, len(seq)] = self.eos_token_id
+            attention_mask[row, :len(seq) + 1] = True
+
+        encoded = self.encode(input_ids, attention_mask)
+        cross_bias = np.where(attention_mask[:, None, None, :], np.float32(0.0), MASK_VALUE)
+
+        # Cross-attention keys/values depend only on the encoder output: compute them once
+        cross_kv = []
+        for layer in self.decoder_layers:
+            k, v = np.split(encoded @ layer["cross_kv"], 2, axis=-1)
+            cross_kv.append((self._split_heads(k), np.ascontiguousarray(self._split_heads(v))))
+
+        # Self-attention cache, filled one position per step
+        cache_shape = (batch, self.num_heads, max_new_tokens, self.d_kv)
+        self_k = [np.zeros(cache_shape, dtype=np.float32) for _ in self.decoder_layers]
+        self_v = [np.zeros(cache_shape, dtype=np.float32) for _ in self.decoder_layers]
+
+        tokens = np.full(batch, self.decoder_start_token_id, dtype=np.int64)
+        finished = np.zeros(batch, dtype=bool)
+        outputs = np.full((batch, max_new_tokens), self.pad_token_id, dtype=np.int64)
+        steps = 0
+
+        for step in range(max_new_tokens):
+            x = self.embed[tokens][:, None, :]
+            self_bias = self._dec_bias_table[:, :, step:step + 1, :step + 1]
+
+            for i, layer in enumerate(self.decoder_layers):
+                h = _rms_norm(x, layer["ln_self"], self.eps)
+                q, k, v = np.split(h @ layer["qkv"], 3, axis=-1)
+                self_k[i][:, :, step] = k.reshape(batch, self.num_heads, self.d_kv)
+                self_v[i][:, :, step] = v.reshape(batch, self.num_heads, self.d_kv)
+                scores = self._split_heads(q) @ self_k[i][:, :, :step + 1].transpose(0, 1, 3, 2) + self_bias
+                x = x + self._merge_heads(_softmax_inplace(scores) @ self_v[i][:, :, :step + 1]) @ layer["o"]
+
+                h = _rms_norm(x, layer["ln_cross"], self.eps)
+                cross_k, cross_v = cross_kv[i]
+                scores = self._split_heads(h @ layer["cross_q"]) @ cross_k.transpose(0, 1, 3, 2) + cross_bias
+                x = x + self._merge_heads(_softmax_inplace(scores) @ cross_v) @ layer["cross_o"]
+
+                h = _rms_norm(x, layer["ln_ff"], self.eps)
+                x = x + np.maximum(h @ layer["wi"], 0.0) @ layer["wo"]
+
+            x = _rms_norm(x[:, 0], self.dec_final_ln, self.eps)
+            if self.tie_word_embeddings:
+                x = x * np.float32(self.d_model ** -0.5)
+            next_tokens = np.argmax(x @ self.lm_head_t, axis=-1)
+
+            next_tokens[finished] = self.pad_token_id
+            outputs[:, step] = next_tokens
+            finished |= next_tokens == self.eos_token_id
+            tokens = next_tokens
+            steps = step + 1
+            if finished.all():
+                break
+
+        results = []
+        for row in range(batch):
+            ids = outputs[row, :steps].tolist()
+            if self.eos_token_id in ids:
+                ids = ids[:ids.index(self.eos_token_id)]
+            results.append(ids)
+        return results
+
+
+class OfflineTranslator:
+    """
+    Thread-safe offline translator with cross-request batching.
+
+    Calls from the translator thread pool queue their token sequences; the first
+    caller to find no batch running becomes the runner, waits max_wait_ms for
+    other requests to join, and decodes everything pending as one greedy batch.
+    """
+
+    def __init__(self, weights_path: str = DEFAULT_WEIGHTS_PATH,
+                 tokenizer_path: str = DEFAULT_TOKENIZER_PATH,
+                 config_path: str = DEFAULT_CONFIG_PATH,
+                 max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        """
+        Args:
+            weights_path: .npz file with the T5 state_dict
+            tokenizer_path: tokenizer.json shared with the app
+            config_path: config.json shared with the app
+            max_batch_size: Maximum sequences decoded together
+            max_wait_ms: Time the runner waits for concurrent requests to join
+
+        Raises:
+            FileNotFoundError: If the weights file is missing
+        """
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        self.tokenizer = UnigramTokenizer(tokenizer_path)
+        self.model = NumpyT5(weights_path, config)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[List[int], Future]] = []
+        self._running = False
+
+        # Stats
+        self.batches_run = 0
+        self.sequences_run = 0
+
+        logger.info(f"OfflineTranslator loaded {os.path.basename(weights_path)} "
+                    f"(d_model={self.model.d_model}, layers={self.model.num_layers}+{self.model.num_decoder_layers})")
+
+    def translate(self, glosses: Sequence[str], target_lang: str = "en") -> str:
+        """Translate one gloss sequence to English ("en") or Filipino ("fil")."""
+        return self.translate_many([(glosses, target_lang)])[0]
+
+    def translate_many(self, requests: Sequence[Tuple[Sequence[str], str]]) -> List[str]:
+        """
+        Translate several (glosses, target_lang) pairs, batched with any concurrent callers.
+
+        Returns:
+            Sentences in request order
+        """
+        sequences = [self.tokenizer.encode(f"{LANGUAGE_TAGS.get(lang, LANGUAGE_TAGS['en'])} {' '.join(glosses)}")
+                     for glosses, lang in requests]
+        return [self.tokenizer.decode(ids) for ids in self._generate(sequences)]
+
+    def _generate(self, sequences: List[List[int]]) -> List[List[int]]:
+        """Queue sequences and wait for their decoded IDs (runs the batch loop if idle)."""
+        futures = [Future() for _ in sequences]
+        with self._lock:
+            self._pending.extend(zip(sequences, futures))
+            runner = not self._running
+            self._running = True
+        if runner:
+            self._drain()
+        return [future.result() for future in futures]
+
+    def _drain(self):
+        """Decode pending sequences batch by batch until none are left."""
+        if self.max_wait > 0:
+            time.sleep(self.max_wait)  # Let concurrent requests join the first batch
+        while True:
+            with self._lock:
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+                if not batch:
+                    self._running = False
+                    return
+            try:
+                outputs = self.model.generate([seq for seq, _ in batch])
+            except Exception as e:
+                logger.error(f"Offline translation batch failed ({len(batch)} sequences): {e}", exc_info=True)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches_run += 1
+            self.sequences_run += len(batch)
+            for (_, future), ids in zip(batch, outputs):
+                future.set_result(ids)
+
+
+def load_offline_translator(weights_path: Optional[str] = None, **kwargs) -> Optional[OfflineTranslator]:
+    """
+    Load the offline translator if its weights are available.
+
+    Returns:
+        OfflineTranslator, or None if the weights are missing or fail to load
+    """
+    weights_path = weights_path or DEFAULT_WEIGHTS_PATH
+    if not os.path.exists(weights_path):
+        logger.info(f"Offline T5 weights not found at {weights_path}. Using local rules as the offline fallback.")
+        return None
+    try:
+        return OfflineTranslator(weights_path=weights_path, **kwargs)
+    except Exception as e:
+        logger.warning(f"Failed to load offline T5 translator: {e}. Using local rules as the offline fallback.")
+        return None
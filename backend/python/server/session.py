@@ -0,0 +1,182 @@
+"""
+Per-stream session state for StreamLandmarks.
+Each stream owns a Session; the SessionRegistry caps how many can be open and
+evicts streams that have stopped sending frames.
+"""
+import asyncio
+import itertools
+import logging
+import secrets
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from landmark_buffer import HandsDownDetector, LandmarkBuffer
+
+logger = logging.getLogger(__name__)
+
+# Multi-frame validation keeps the last N gloss predictions per stream
+RECENT_GLOSS_HISTORY = 5
+
+# Initial metadata key carrying the session ID, so later unary calls can refer to the stream
+SESSION_ID_METADATA_KEY = "x-expressora-session-id"
+# Request metadata key opting a stream into server-pushed TRANSLATION events ("1" = on)
+AUTO_TRANSLATE_METADATA_KEY = "x-expressora-auto-translate"
+
+
+class SessionLimitError(Exception):
+    """Raised when the registry is full and no idle session can be evicted."""
+
+
+class Session:
+    """
+    Mutable state for a single StreamLandmarks call.
+    Uses __slots__ so per-stream memory stays small and predictable.
+    """
+
+    __slots__ = (
+        "session_id",
+        "peer",
+        "created_at",
+        "last_active",
+        "frame_count",
+        "hands_down_detector",
+        "recent_gloss_detections",
+        "last_tone_event",
+        "last_gloss_yielded",
+        "classifier_window",
+        "frame_encoding",
+        "gloss_buffer",
+        "auto_translations",
+        "frame_traces",
+        "frame_queue",
+        "flow",
+        "task",
+        "evicted",
+    )
+
+    def __init__(self, session_id: str, peer: str = "",
+                 hands_down_threshold_y: float = 0.9, hands_down_duration: float = 1.5):
+        """
+        Args:
+            session_id: Unique identifier for this stream
+            peer: Client address as reported by the gRPC context
+            hands_down_threshold_y: Y-coordinate threshold for hands-down detection
+            hands_down_duration: Seconds hands must stay down before HANDS_DOWN fires
+        """
+        now = time.monotonic()
+        self.session_id = session_id
+        self.peer = peer
+        self.created_at = now
+        self.last_active = now
+        self.frame_count = 0
+        self.hands_down_detector = HandsDownDetector(
+            threshold_y=hands_down_threshold_y, duration_threshold=hands_down_duration
+        )
+        # Step 2: Multi-Frame Validation - recent (label, confidence) predictions
+        self.recent_gloss_detections: deque = deque(maxlen=RECENT_GLOSS_HISTORY)
+        # TONE event optimization - trigger only after gloss registration
+        self.last_tone_event: Optional[str] = None
+        self.last_gloss_yielded = False
+        # Classifier-owned frame window (None for frame-level classifiers)
+        self.classifier_window = None
+        # Negotiated LandmarkFrame encoding ("repeated" or a packed encoding)
+        self.frame_encoding = "repeated"
+        # Auto-translate mode: glosses waiting to be translated (None = mode off)
+        # and translation tasks whose TRANSLATION events are not yet sent, oldest first
+        self.gloss_buffer: Optional[LandmarkBuffer] = None
+        self.auto_translations: deque = deque()
+        # Sampled FrameTraces of the message being processed, written once its events are sent
+        self.frame_traces: list = []
+        # Frames received but not processed yet (set by the stream handler)
+        self.frame_queue = None
+        # Flow-control state if the client asked for FLOW_CONTROL events (None = off)
+        self.flow = None
+        # Handler task, cancelled if the session is evicted
+        self.task: Optional[asyncio.Task] = None
+        self.evicted = False
+
+    def touch(self):
+        """Record activity (a frame was received)."""
+        self.last_active = time.monotonic()
+
+    def idle_seconds(self, now: Optional[float] = None) -> float:
+        """Seconds since the last received frame."""
+        return (now if now is not None else time.monotonic()) - self.last_active
+
+
+class SessionRegistry:
+    """
+    Registry of open StreamLandmarks sessions with a cap and idle eviction.
+
+    All methods are called from the server's event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_sessions: int = 500, idle_timeout: float = 60.0):
+        """
+        Args:
+            max_sessions: Maximum number of concurrently open sessions
+            idle_timeout: Seconds without frames before a session is evicted
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[str, Session] = {}
+        self._ids = itertools.count(1)
+        self.evicted_count = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def open(self, peer: str = "") -> Session:
+        """
+        Create and register a new session.
+
+        Raises:
+            SessionLimitError: If the registry is full even after evicting idle sessions
+        """
+        if len(self._sessions) >= self.max_sessions:
+            self.evict_idle()
+            if len(self._sessions) >= self.max_sessions:
+                raise SessionLimitError(
+                    f"Session limit reached ({self.max_sessions} active streams)"
+                )
+
+        # Random suffix: clients present the ID in later calls, so it must not be guessable
+        session = Session(session_id=f"s{next(self._ids)}-{secrets.token_hex(8)}", peer=peer)
+        self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Look up an open session by ID."""
+        return self._sessions.get(session_id)
+
+    def close(self, session_id: str):
+        """Remove a session (no-op if it was already evicted)."""
+        self._sessions.pop(session_id, None)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Evict sessions idle for longer than idle_timeout.
+        The handler task of each evicted session is cancelled; the handler sees
+        session.evicted and aborts the RPC so the client gets a status.
+
+        Returns:
+            Number of sessions evicted
+        """
+        now = now if now is not None else time.monotonic()
+        stale = [s for s in self._sessions.values() if s.idle_seconds(now) > self.idle_timeout]
+        for session in stale:
+            logger.info(f"⏱️ Evicting idle session {session.session_id} ({session.peer}) "
+                        f"after {session.idle_seconds(now):.1f}s")
+            self._sessions.pop(session.session_id, None)
+            session.evicted = True
+            if session.task is not None and not session.task.done():
+                session.task.cancel()
+        self.evicted_count += len(stale)
+        return len(stale)
+
+    async def run_eviction_loop(self, interval: float = 5.0):
+        """Periodically evict idle sessions until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
@@ -0,0 +1,88 @@
+"""
+Single-flight request coalescing.
+Concurrent calls with the same key share one execution of the underlying
+function; every caller receives its result (or its exception).
+"""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    The first caller for a key (the leader) runs the function on its own thread;
+    callers that arrive while it is running (followers) block until it finishes,
+    or until their own timeout passes, and get the same result. Once the call completes the key is released, so later
+    calls run again (caching is left to the caller). Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+
+        # Stats
+        self.calls = 0        # Underlying function executions
+        self.coalesced = 0    # Calls answered by another caller's execution
+
+    @property
+    def saved_ratio(self) -> float:
+        """Fraction of requests that did not need their own execution."""
+        total = self.calls + self.coalesced
+        return self.coalesced / total if total else 0.0
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> Tuple[T, bool]:
+        """
+        Run fn(*args) unless an identical call is already in flight.
+
+        Args:
+            key: Identity of the call
+            fn: Function to run
+            *args: Arguments for fn
+            timeout: Seconds a follower waits for the leader's result (None = no limit;
+                the leader always runs fn to completion)
+
+        Returns:
+            Tuple of (result, shared) - shared is True if another caller's execution was reused
+
+        Raises:
+            concurrent.futures.TimeoutError: If a follower's timeout passed first
+            Whatever fn raised, for the leader and all followers
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            return future.result(timeout=max(0.0, timeout) if timeout is not None else None), True
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        """Counters for logging and monitoring."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "saved_ratio": round(self.saved_ratio, 4),
+        }
@@ -0,0 +1,199 @@
+"""
+Speculative prefix translation for landmark streams.
+While a stream emits GLOSS events, the glosses seen so far are translated in the
+background. When the client later calls TranslateSequence with the stream's
+session ID and the same glosses, the answer is already there (or in flight).
+The server speculates with cache and offline translations only, so speculation
+never spends Gemini quota that real requests need.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from translation_cache import make_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PREFIX_GLOSSES = 7     # Same cap as the client's gloss buffer
+DEFAULT_RETENTION = 60.0           # Seconds results are kept after the stream ends
+RESULTS_PER_SESSION = 8            # Translated prefixes kept per session
+DEFAULT_MAX_IN_FLIGHT = 2          # Speculative translations running across all streams
+
+TranslateFn = Callable[[List[str], str], Awaitable[Tuple[str, str, str, str]]]
+
+
+class _SessionSpeculation:
+    """Prefix and translated results of one stream."""
+
+    __slots__ = ("prefix", "tone", "results", "task", "ended_at")
+
+    def __init__(self):
+        self.prefix: List[str] = []
+        self.tone = "/neutral"
+        # make_key(prefix, tone) -> Future of (english, filipino, tone, source)
+        self.results: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self.task: Optional[asyncio.Task] = None  # Speculation currently running
+        self.ended_at: Optional[float] = None
+
+
+class PrefixSpeculator:
+    """
+    Background translation of each stream's gloss prefix.
+
+    Every new GLOSS extends the session's prefix. At most one speculative
+    translation runs per session; when it finishes and the prefix has grown in
+    the meantime, the latest prefix is translated next, so a burst of glosses
+    costs one call rather than one per gloss. HANDS_DOWN starts a new prefix.
+    Speculation only uses spare capacity: a prefix is skipped (and retried with
+    the next gloss) when `max_in_flight` speculations are already running.
+    A finished result is only handed out if `usable` accepts it, so a cheaper
+    speculative answer never replaces a better one the caller would get.
+
+    All methods are called from the server's event loop, so no locking is needed.
+    """
+
+    def __init__(self, translate: TranslateFn, max_prefix_glosses: int = DEFAULT_MAX_PREFIX_GLOSSES,
+                 retention: float = DEFAULT_RETENTION, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 usable: Optional[Callable[[Tuple[str, str, str, str]], bool]] = None):
+        """
+        Args:
+            translate: Coroutine function (glosses, tone) -> (english, filipino, tone, source)
+            max_prefix_glosses: Longest prefix that is translated speculatively
+            retention: Seconds a finished stream's results stay available
+            max_in_flight: Speculative translations running at once across all streams
+            usable: Returns False for a result a lookup should not return (e.g. an
+                offline translation while Gemini is available); None = all results
+        """
+        self._translate = translate
+        self.max_prefix_glosses = max_prefix_glosses
+        self.retention = retention
+        self.max_in_flight = max(1, max_in_flight)
+        self._usable = usable
+        self._sessions: Dict[str, _SessionSpeculation] = {}
+        self.in_flight = 0
+
+        # Stats
+        self.speculations = 0   # Speculative translations started
+        self.skipped = 0        # Prefixes not speculated because capacity was busy
+        self.hits = 0           # TranslateSequence calls answered from a speculation
+        self.misses = 0         # Calls with a session ID whose glosses were not speculated (or not usable)
+
+    def on_gloss(self, session_id: str, gloss: str, tone: Optional[str]):
+        """
+        Record a GLOSS event and translate the new prefix in the background.
+
+        Args:
+            session_id: Stream that emitted the gloss
+            gloss: Validated gloss label
+            tone: Latest TONE label of the stream (None = neutral)
+        """
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionSpeculation()
+        # The tone can change without the prefix growing; the prefix is re-translated then
+        state.tone = tone or "/neutral"
+        # The client drops a gloss repeated back to back, so the prefix does too
+        repeated = bool(state.prefix) and state.prefix[-1] == gloss
+        if not repeated and len(state.prefix) < self.max_prefix_glosses:
+            state.prefix.append(gloss)
+        if state.prefix and state.task is None:
+            state.task = asyncio.create_task(self._speculate(session_id, state))
+
+    def on_hands_down(self, session_id: str):
+        """Start a new prefix (translated prefixes stay available)."""
+        state = self._sessions.get(session_id)
+        if state is not None:
+            state.prefix = []
+
+    def end_session(self, session_id: str):
+        """Mark the stream as ended; its results are kept for `retention` seconds."""
+        state = self._sessions.get(session_id)
+        if state is not None:
+            state.ended_at = time.monotonic()
+        self._purge()
+
+    async def lookup(self, session_id: str, glosses: List[str], tone: str,
+                     timeout: Optional[float] = None) -> Optional[Tuple[str, str, str, str]]:
+        """
+        Return the speculative translation of (glosses, tone), waiting for it if still in flight.
+
+        Args:
+            session_id: Session ID the stream sent in its initial metadata
+            glosses: Glosses from the TranslateSequence request
+            tone: Tone from the TranslateSequence request
+            timeout: Seconds to wait for an in-flight speculation (None = no limit)
+
+        Returns:
+            Tuple of (english, filipino, tone, source), or None if nothing usable was speculated
+        """
+        state = self._sessions.get(session_id)
+        future = state.results.get(make_key(glosses, tone)) if state is not None else None
+        if future is None or future.cancelled():
+            self.misses += 1
+            return None
+        try:
+            # shield: a caller giving up must not cancel the speculation for later callers
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except Exception as e:
+            logger.debug(f"Speculative translation for session {session_id} unusable: {e!r}")
+            self.misses += 1
+            return None
+        if self._usable is not None and not self._usable(result):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    async def _speculate(self, session_id: str, state: _SessionSpeculation):
+        """Translate the session's prefix until it stops changing."""
+        try:
+            while state.prefix:
+                glosses, tone = list(state.prefix), state.tone
+                key = make_key(glosses, tone)
+                if key in state.results:
+                    break
+                if self.in_flight >= self.max_in_flight:
+                    self.skipped += 1
+                    break
+                future = asyncio.get_running_loop().create_future()
+                state.results[key] = future
+                while len(state.results) > RESULTS_PER_SESSION:
+                    state.results.popitem(last=False)
+                self.speculations += 1
+                self.in_flight += 1
+                try:
+                    future.set_result(await self._translate(glosses, tone))
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    future.set_exception(e)
+                    future.exception()  # Mark retrieved; lookups treat it as a miss
+                    logger.warning(f"Speculative translation failed (session {session_id}): {e}")
+                finally:
+                    self.in_flight -= 1
+        finally:
+            state.task = None
+
+    def _purge(self):
+        """Drop ended sessions whose retention has passed."""
+        cutoff = time.monotonic() - self.retention
+        expired = [sid for sid, s in self._sessions.items()
+                   if s.ended_at is not None and s.ended_at < cutoff and s.task is None]
+        for session_id in expired:
+            del self._sessions[session_id]
+
+    def stats(self) -> dict:
+        """Counters for logging and monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._sessions),
+            "speculations": self.speculations,
+            "skipped": self.skipped,
+            "in_flight": self.in_flight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
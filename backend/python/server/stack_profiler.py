@@ -0,0 +1,198 @@
+"""
+On-demand sampling profiler.
+A background thread reads every thread's Python stack with sys._current_frames()
+at a fixed interval and counts identical stacks. Nothing runs until a profile is
+requested, so it costs nothing the rest of the time. Output is in folded-stack
+format ("thread;outer;...;inner count"), which flamegraph.pl and speedscope read.
+
+Stacks are rooted at the thread: the event loop (StreamLandmarks handlers, event
+logic), classifier-N (classify_hands/classify_face) and translator-N
+(TranslationService). When profiling one session, event-loop samples are kept
+only while that stream's handler task is running; the pool threads are shared by
+all streams, so their samples always cover every stream.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_MS = 10.0
+MIN_INTERVAL_MS = 1.0
+DEFAULT_PROFILE_SECONDS = 10.0
+MAX_PROFILE_SECONDS = 300.0
+
+# GIL switch interval while sampling. The sampler needs the GIL to read stacks; with
+# the default 5 ms, short event-loop callbacks finish before it gets a turn and
+# samples land mostly where threads block in C (select, sleep).
+SAMPLING_SWITCH_INTERVAL = 0.0002
+
+# Leaf frames of threads that are parked (idle pool workers, the loop's select)
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("threading.py", "run"),  # Thread whose target is a C function (gRPC's poller)
+}
+
+
+class ProfileInProgressError(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+class StackSampler:
+    """Samples thread stacks until the duration passes or stop() is called."""
+
+    def __init__(self, interval_ms: float = DEFAULT_INTERVAL_MS,
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 loop_thread_id: Optional[int] = None,
+                 task: Optional[asyncio.Task] = None,
+                 include_idle: bool = False):
+        """
+        Args:
+            interval_ms: Time between samples
+            loop: Event loop whose current task is checked when `task` is set
+            loop_thread_id: Thread running `loop` (named "event-loop" in the output)
+            task: Only keep event-loop samples taken while this task runs (None = all)
+            include_idle: Also count threads parked in a wait or select
+        """
+        self.interval = max(MIN_INTERVAL_MS, interval_ms) / 1000.0
+        self.loop = loop
+        self.loop_thread_id = loop_thread_id
+        self.task = task
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[object, str] = {}  # code object -> "qualname (file.py)"
+        self._stop = threading.Event()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)  # co_qualname is Python 3.11+
+            label = self._labels[code] = f"{name} ({os.path.basename(code.co_filename)})"
+        return label
+
+    def _thread_names(self) -> Dict[int, str]:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        if self.loop_thread_id is not None:
+            names[self.loop_thread_id] = "event-loop"
+        return names
+
+    def _sample_once(self, own_id: int, names: Dict[int, str]):
+        loop_busy_elsewhere = False
+        if self.task is not None and self.loop is not None:
+            loop_busy_elsewhere = asyncio.current_task(self.loop) is not self.task
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if thread_id == self.loop_thread_id and loop_busy_elsewhere:
+                continue
+            code = frame.f_code
+            if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if thread_id not in names:
+                names.update(self._thread_names())  # Pool threads start lazily
+            frames.append(names.get(thread_id, f"thread-{thread_id}"))
+            self.stacks[";".join(reversed(frames))] += 1
+        self.samples += 1
+
+    def run(self, duration: float):
+        """Sample for `duration` seconds (blocking; run it on its own thread)."""
+        own_id = threading.get_ident()
+        names = self._thread_names()
+        deadline = time.monotonic() + duration
+        next_sample = time.monotonic()
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, SAMPLING_SWITCH_INTERVAL))
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                if now >= next_sample:
+                    self._sample_once(own_id, names)
+                    next_sample += self.interval
+                self._stop.wait(max(0.0, min(next_sample, deadline) - time.monotonic()))
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+    def stop(self):
+        self._stop.set()
+
+    def folded(self) -> str:
+        """Folded stacks, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """
+    Runs one StackSampler at a time and writes its output to a directory.
+
+    Used from the server's event loop.
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Args:
+            output_dir: Directory for .folded files (created if missing)
+        """
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self._running = False
+        self.profiles = 0
+
+    async def profile(self, duration: float, interval_ms: float = DEFAULT_INTERVAL_MS,
+                      task: Optional[asyncio.Task] = None, label: str = "all"):
+        """
+        Sample for `duration` seconds and write the folded stacks.
+
+        Args:
+            duration: Seconds to sample (capped at MAX_PROFILE_SECONDS)
+            interval_ms: Time between samples
+            task: Only keep event-loop samples of this task (e.g. one stream's handler)
+            label: Goes into the file name (session ID or "all")
+
+        Returns:
+            Tuple of (path, StackSampler)
+
+        Raises:
+            ProfileInProgressError: If another profile is running
+        """
+        if self._running:
+            raise ProfileInProgressError("A profile is already running")
+        self._running = True
+        duration = min(max(0.0, duration), MAX_PROFILE_SECONDS)
+        sampler = StackSampler(
+            interval_ms=interval_ms, loop=asyncio.get_running_loop(),
+            loop_thread_id=threading.get_ident(), task=task,
+        )
+        logger.info(f"🔬 Profiling {label} for {duration:g}s (every {sampler.interval * 1000:g} ms)")
+        try:
+            # Dedicated thread: the executor pools may be the thing being profiled
+            thread = threading.Thread(target=sampler.run, args=(duration,), name="stack-sampler", daemon=True)
+            thread.start()
+            while thread.is_alive():
+                await asyncio.sleep(min(0.1, duration or 0.1))
+        finally:
+            sampler.stop()
+            self._running = False
+
+        path = os.path.join(self.output_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{label}.folded")
+        with open(path, "w") as f:
+            f.write(sampler.folded())
+        self.profiles += 1
+        logger.info(f"🔬 Profile written to {path} ({sampler.samples} samples, {len(sampler.stacks)} stacks)")
+        return path, sampler
@@ -0,0 +1,281 @@
+"""
+TFLite classifier backed by the unified holistic LSTM model (expressora_unified_v19).
+Mirrors the Android pipeline (LandmarkFeatureExtractor + FeatureScaler + TfLiteInterpreter):
+the model sees 30-frame windows of 237 features per frame.
+"""
+import json
+import logging
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from feature_window import FeatureWindow
+from frame_validation import as_validated
+
+# The model's LSTM layers use Select TF ops (FlexTensorListReserve), which only the
+# full TensorFlow interpreter links in. LiteRT / tflite_runtime are tried as fallbacks
+# for builds of the model that do not need the Flex delegate.
+try:
+    from tensorflow.lite import Interpreter
+except ImportError:
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            Interpreter = None
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+DEFAULT_MODEL_PATH = os.path.join(MODELS_DIR, "expressora_unified_v19.tflite")
+DEFAULT_LABELS_PATH = os.path.join(MODELS_DIR, "labels_v11.json")
+
+# Window layout (matches build_unified_dataset.py / LandmarkFeatureExtractor.kt)
+SEQUENCE_LENGTH = 30
+ONE_HAND_DIM = 63  # 21 landmarks * 3 coords
+HANDS_DIM = ONE_HAND_DIM * 2  # Left hand, then right hand
+EYEBROW_INDICES = [46, 52, 53, 65, 70, 276, 282, 283, 295, 300]
+LIP_INDICES = [0, 13, 14, 17, 37, 39, 40, 61, 80, 81, 82, 178, 181, 185, 191,
+               267, 269, 270, 291, 310, 311, 312, 318, 402, 405, 409, 415]
+FACE_INDICES = np.array(sorted(EYEBROW_INDICES + LIP_INDICES))  # 37 points
+FEATURES_PER_FRAME = HANDS_DIM + len(FACE_INDICES) * 3  # 237
+
+# Minimum frames (out of 30) with hand data before inference is trusted
+MIN_VALID_FRAMES = 20
+
+# Face mesh points used by the tone heuristic
+BROW_MID_INDICES = [105, 334]
+EYE_TOP_INDICES = [159, 386]
+EYE_OUTER_INDICES = [33, 263]
+INNER_LIP_INDICES = [13, 14]
+BROW_RAISE_RATIO = 0.32   # brow-to-eye gap / inter-ocular distance for "/question"
+MOUTH_OPEN_RATIO = 0.35   # inner-lip gap / inter-ocular distance for "/exclamation"
+
+
+def _scale_section(raw: np.ndarray) -> np.ndarray:
+    """
+    FeatureScaler: a section that is entirely zero is missing and stays 0.0
+    (the -10.0 sentinel is replaced with 0.0 before inference), otherwise [0, 1] -> [-1, 1].
+    """
+    if not raw.any():
+        return np.zeros_like(raw)
+    return (raw - 0.5) * 2.0
+
+
+def _normalize_z(points: np.ndarray) -> np.ndarray:
+    """Clamp z to [-1, 1] and map to [0, 1] like the training pipeline (in place)."""
+    np.clip(points[:, 2], -1.0, 1.0, out=points[:, 2])
+    points[:, 2] += 1.0
+    points[:, 2] *= 0.5
+    return points
+
+
+def extract_frame_features(landmark_frame) -> np.ndarray:
+    """
+    Build the 237-float model feature vector for one frame.
+
+    Args:
+        landmark_frame: LandmarkFrame or FrameValidation with hands = [left 63, right 63]
+                        and a 468-point face mesh
+
+    Returns:
+        float32 array of shape (237,) - left hand, right hand, 37 face points
+    """
+    validation = as_validated(landmark_frame)
+    features = np.zeros(FEATURES_PER_FRAME, dtype=np.float32)
+
+    for h in range(min(validation.hand_count, 2)):
+        section = validation.hands[h].copy()
+        if not section.any():
+            continue  # Zero-padded hand = missing
+        features[h * ONE_HAND_DIM:(h + 1) * ONE_HAND_DIM] = _scale_section(_normalize_z(section).reshape(-1))
+
+    face = validation.face
+    if len(face) >= 3:
+        face_points = face[:len(face) - len(face) % 3].reshape(-1, 3)
+        selected = np.zeros((len(FACE_INDICES), 3), dtype=np.float32)
+        present = FACE_INDICES < len(face_points)
+        selected[present] = face_points[FACE_INDICES[present]]
+        if selected.any():
+            features[HANDS_DIM:] = _scale_section(_normalize_z(selected).reshape(-1))
+
+    return features
+
+
+class TFLiteClassifier:
+    """
+    Production classifier running the unified holistic model with TFLite.
+
+    Implements the same classify_hands/classify_face interface as MockClassifier.
+    The model is loaded once; input and output tensors are reused across calls and
+    only reallocated when the batch size changes (the batch dimension is dynamic).
+    Each stream keeps its own frame window (see create_window), because the model
+    classifies 30-frame sequences rather than single frames.
+    """
+
+    # The model input includes 37 face points, so face landmarks are needed for glosses
+    uses_face_features = True
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, labels_path: str = DEFAULT_LABELS_PATH,
+                 num_threads: Optional[int] = None):
+        """
+        Args:
+            model_path: Path to the .tflite model
+            labels_path: Path to the JSON label list (index -> gloss)
+            num_threads: Interpreter CPU threads (None = runtime default)
+
+        Raises:
+            ImportError: If no TFLite interpreter package is installed
+            ValueError: If the label count does not match the model output
+        """
+        if Interpreter is None:
+            raise ImportError("No TFLite interpreter available (install tensorflow-cpu)")
+
+        with open(labels_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        raw_labels = data["labels"] if isinstance(data, dict) else data
+        # Glosses are emitted upper-case, like the rest of the server ("THANK_YOU")
+        self.labels: List[str] = [label.upper() for label in raw_labels]
+
+        self._interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self._interpreter.allocate_tensors()
+        input_details = self._interpreter.get_input_details()[0]
+        output_details = self._interpreter.get_output_details()[0]
+
+        num_classes = int(output_details["shape"][-1])
+        if num_classes != len(self.labels):
+            raise ValueError(f"Model has {num_classes} outputs but {labels_path} has {len(self.labels)} labels")
+
+        # tensor() returns accessors to the interpreter's own buffers, so inference
+        # writes windows straight into the input tensor and reads scores in place.
+        self._input_index = input_details["index"]
+        self._input_tensor = self._interpreter.tensor(self._input_index)
+        self._output_tensor = self._interpreter.tensor(output_details["index"])
+        self._batch_size = int(input_details["shape"][0])
+        self._lock = threading.Lock()  # Interpreter is not thread-safe
+
+        logger.info(f"TFLiteClassifier loaded {os.path.basename(model_path)}: "
+                    f"input={list(input_details['shape'])}, classes={num_classes}")
+
+    def create_window(self) -> FeatureWindow:
+        """Create the per-stream feature window consumed by classify_hands."""
+        return FeatureWindow(SEQUENCE_LENGTH, FEATURES_PER_FRAME, HANDS_DIM)
+
+    def classify_hands(self, landmark_frame, window: Optional[FeatureWindow] = None) -> Tuple[Optional[str], float]:
+        """
+        Add the frame to the stream's window and classify the window once it is full.
+
+        Args:
+            landmark_frame: LandmarkFrame or FrameValidation
+            window: Per-stream window from create_window()
+
+        Returns:
+            Tuple of (gloss_label, confidence) or (None, 0.0) while the window is filling
+        """
+        return self.classify_hands_batch([(landmark_frame, window)])[0]
+
+    def classify_hands_batch(self, requests: List[Tuple[object, Optional[FeatureWindow]]]) -> List[Tuple[Optional[str], float]]:
+        """
+        Classify frames from many streams with a single interpreter invocation.
+
+        Each frame is appended to its stream's window; every window that is full
+        and has enough hand frames is copied into one row of the batched input.
+        Several consecutive frames of the same stream may appear in one call.
+        A frame with no landmarks at all is not appended but removes the oldest frame,
+        so a pause empties the window instead of leaving the previous sign in it
+        (LandmarkFeatureExtractor.kt only does this while the buffer is full). A frame
+        without hands is appended, so it counts against MIN_VALID_FRAMES, but not classified.
+
+        Args:
+            requests: List of (LandmarkFrame or FrameValidation, window) pairs
+
+        Returns:
+            List of (gloss_label, confidence) in request order
+        """
+        results: List[Tuple[Optional[str], float]] = [(None, 0.0)] * len(requests)
+
+        with self._lock:
+            ready = []
+            snapshots = {}  # request index -> window copy, for windows that appear again later
+            last_use = {id(window): i for i, (_, window) in enumerate(requests)}
+            for i, (landmark_frame, window) in enumerate(requests):
+                if window is None:
+                    continue
+                features = extract_frame_features(landmark_frame)
+                if not features.any():
+                    # Nothing detected: age the window instead of adding an empty frame
+                    window.drop_oldest()
+                    continue
+                window.append(features)
+                if not window.is_full or not features[:HANDS_DIM].any():
+                    continue
+                if window.valid_count < MIN_VALID_FRAMES:
+                    # Too many frames without hands - the model collapses to random predictions
+                    continue
+                ready.append(i)
+                if last_use[id(window)] != i:
+                    # Consecutive frames of one stream (LandmarkBatch) share a window:
+                    # keep this frame's view before the next frame slides it
+                    snapshots[i] = window.view().copy()
+
+            if not ready:
+                return results
+
+            self._ensure_batch_size(len(ready))
+            inputs = self._input_tensor()
+            for row, i in enumerate(ready):
+                # One contiguous copy per row straight into the input tensor
+                inputs[row] = snapshots[i] if i in snapshots else requests[i][1].view()
+            del inputs  # Release the view before invoke()
+
+            self._interpreter.invoke()
+
+            scores = self._output_tensor()
+            best = np.argmax(scores, axis=1)
+            confidences = scores[np.arange(len(ready)), best]
+            del scores  # Release the view before the next invoke()
+
+        for row, i in enumerate(ready):
+            results[i] = (self.labels[best[row]], float(confidences[row]))
+        return results
+
+    def _ensure_batch_size(self, batch_size: int):
+        """Resize the batch dimension (caller holds the lock); a no-op if unchanged."""
+        if batch_size == self._batch_size:
+            return
+        self._interpreter.resize_tensor_input(self._input_index, [batch_size, SEQUENCE_LENGTH, FEATURES_PER_FRAME])
+        self._interpreter.allocate_tensors()
+        self._batch_size = batch_size
+
+    def classify_face(self, landmark_frame) -> Tuple[Optional[str], float]:
+        """
+        Classify facial tone from the face mesh with a geometric heuristic.
+        Raised eyebrows mark a question, a wide-open mouth an exclamation.
+
+        Args:
+            landmark_frame: LandmarkFrame or FrameValidation
+
+        Returns:
+            Tuple of (tone_tag, confidence) or (None, 0.0) if no face detected
+        """
+        face = as_validated(landmark_frame).face
+        if len(face) < 468 * 3 or not face.any():
+            return None, 0.0
+        points = face[:468 * 3].reshape(468, 3)
+
+        eye_distance = float(np.linalg.norm(points[EYE_OUTER_INDICES[0], :2] - points[EYE_OUTER_INDICES[1], :2]))
+        if eye_distance < 1e-6:
+            return None, 0.0
+
+        brow_gap = float(np.mean(points[EYE_TOP_INDICES, 1] - points[BROW_MID_INDICES, 1])) / eye_distance
+        mouth_gap = float(points[INNER_LIP_INDICES[1], 1] - points[INNER_LIP_INDICES[0], 1]) / eye_distance
+
+        if brow_gap >= BROW_RAISE_RATIO:
+            return "/question", min(0.99, 0.80 + (brow_gap - BROW_RAISE_RATIO))
+        if mouth_gap >= MOUTH_OPEN_RATIO:
+            return "/exclamation", min(0.99, 0.80 + (mouth_gap - MOUTH_OPEN_RATIO))
+        return "/neutral", 0.80
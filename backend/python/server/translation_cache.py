@@ -0,0 +1,200 @@
+"""
+Two-tier cache for gloss translations.
+Tier 1 is an in-process LRU with a TTL; tier 2 is an optional SQLite file that
+survives restarts. Keys are the normalized (glosses, tone) pair, so repeated
+phrases like HELLO YOU skip the Gemini round trip.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL = 6 * 3600.0          # seconds an entry stays valid in memory
+DEFAULT_DISK_TTL = 7 * 24 * 3600.0  # seconds an entry stays valid on disk
+
+
+def make_key(glosses: Iterable[str], tone: str) -> str:
+    """
+    Normalize a translation request into a cache key.
+
+    Glosses are stripped and upper-cased, empty glosses dropped, and a missing
+    tone treated as "/neutral", so "hello you" and "HELLO YOU" share an entry.
+    """
+    gloss_part = " ".join(g.strip().upper() for g in glosses if g and g.strip())
+    tone_part = (tone or "/neutral").strip().lower()
+    return f"{gloss_part}|{tone_part}"
+
+
+class TranslationCache:
+    """
+    LRU + TTL translation cache with an optional persistent SQLite tier.
+
+    Lookups check memory first, then disk; disk hits are promoted to memory.
+    When memory is full the least recently used entry is evicted; expired
+    entries are dropped when they are looked up. Thread-safe, because
+    TranslationService.translate runs on the translator thread pool. The memory
+    tier has its own lock, so get_memory() never waits for a SQLite query and is
+    cheap enough for the event loop.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 db_path: Optional[str] = None, disk_ttl: float = DEFAULT_DISK_TTL):
+        """
+        Args:
+            max_entries: Maximum entries kept in memory
+            ttl: Seconds a memory entry stays valid
+            db_path: SQLite file for the persistent tier (None = memory only)
+            disk_ttl: Seconds a disk entry stays valid
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()     # Memory tier
+        self._db_lock = threading.Lock()  # SQLite tier
+
+        # Stats
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            try:
+                self._db = self._open_db(db_path)
+            except sqlite3.Error as e:
+                logger.warning(f"Translation cache database {db_path} unavailable: {e}. Using memory only.")
+
+    def _open_db(self, db_path: str) -> sqlite3.Connection:
+        """Open the SQLite tier and purge entries older than disk_ttl."""
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, english TEXT NOT NULL, filipino TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        purged = db.execute("DELETE FROM translations WHERE created < ?", (time.time() - self.disk_ttl,)).rowcount
+        count = db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        logger.info(f"Translation cache database {db_path}: {count} entries ({purged} expired entries purged)")
+        return db
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from either tier."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, glosses: Iterable[str], tone: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up a translation.
+
+        Returns:
+            Tuple of (english_sentence, filipino_sentence), or None on a miss
+        """
+        key = make_key(glosses, tone)
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+
+        with self._db_lock:
+            row = None
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT english, filipino FROM translations WHERE key = ? AND created >= ?",
+                    (key, time.time() - self.disk_ttl),
+                ).fetchone()
+        with self._lock:
+            if row is not None:
+                value = (row[0], row[1])
+                self._store(key, value, time.monotonic())
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def get_memory(self, glosses: Iterable[str], tone: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up a translation in the memory tier only (a miss is not counted; get() follows).
+
+        Returns:
+            Tuple of (english_sentence, filipino_sentence), or None if not in memory
+        """
+        return self._get_memory(make_key(glosses, tone))
+
+    def _get_memory(self, key: str) -> Optional[Tuple[str, str]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expirations += 1
+            return None
+
+    def put(self, glosses: Iterable[str], tone: str, english: str, filipino: str):
+        """Store a translation in both tiers."""
+        key = make_key(glosses, tone)
+        value = (english, filipino)
+        with self._lock:
+            self._store(key, value, time.monotonic())
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO translations (key, english, filipino, created) VALUES (?, ?, ?, ?)",
+                        (key, english, filipino, time.time()),
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to persist translation for '{key}': {e}")
+
+    def _store(self, key: str, value: Tuple[str, str], now: float):
+        """Insert into the memory tier, evicting the least recently used entry if full (caller holds the lock)."""
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all memory entries (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        """Close the SQLite tier."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        """Counters for logging and monitoring."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
@@ -4,15 +4,86 @@ Implements hybrid intelligence: Cloud-first with automatic fallback to local rul
 """
 import os
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Iterator, Optional, Tuple
 import google.generativeai as genai
-from tenacity import retry, stop_after_attempt, wait_fixed, RetryError
+from tenacity import Retrying, retry_if_exception, wait_fixed, RetryError
 from dotenv import load_dotenv
 
+from offline_translator import OfflineTranslator
+from circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN
+from gemini_dispatcher import GeminiDispatcher, DEFAULT_GEMINI_RPM, DEFAULT_MAX_PROMPT_BATCH
+from lexicon import load_lexicon
+from single_flight import SingleFlight
+from translation_cache import TranslationCache, make_key
+
 # Load environment variables from .env file
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Values of TranslationResult.source
+SOURCE_CLOUD = "Cloud (Gemini)"
+SOURCE_LOCAL = "Offline (Local)"
+SOURCE_CACHE = "Cloud (Gemini, Cached)"
+SOURCE_OFFLINE_MODEL = "Offline (T5)"
+SOURCE_CLOUD_PARTIAL = "Cloud (Gemini, Partial)"  # Streaming: Gemini's answer so far
+# Hedged mode: Gemini missed the latency budget and the offline answer was returned
+HEDGED_SOURCES = {
+    SOURCE_LOCAL: "Offline (Local, Hedged)",
+    SOURCE_OFFLINE_MODEL: "Offline (T5, Hedged)",
+}
+
+# Gemini retry policy: at most 2 attempts, 1 s apart, and never past the caller's deadline
+GEMINI_MAX_ATTEMPTS = 2
+GEMINI_RETRY_WAIT = 1.0
+GEMINI_MIN_ATTEMPT_TIME = 0.5   # Don't start an attempt with less time than this left
+LOCAL_FALLBACK_RESERVE = 0.05   # Time kept back for the local rules after Gemini gives up
+
+# Circuit breaker defaults
+DEFAULT_BREAKER_FAILURE_THRESHOLD = 3
+DEFAULT_BREAKER_RECOVERY_TIMEOUT = 30.0
+
+# Hedged mode: background Gemini calls that may outlive the request
+DEFAULT_HEDGE_WORKERS = 4
+
+
+class DeadlineExceededError(Exception):
+    """Raised when too little of the caller's deadline is left for a Gemini attempt."""
+
+
+def _parse_partial_response(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Parse an incomplete "English: ... | Filipino: ..." response.
+    
+    Returns:
+        Tuple of (english_so_far, filipino_so_far) - filipino is "" until it starts -
+        or None if no English text has arrived yet
+    """
+    if "English:" not in text:
+        return None
+    english, _, rest = text.split("English:", 1)[1].partition("|")
+    english = english.strip()
+    if not english:
+        return None
+    filipino = rest.split("Filipino:", 1)[1].strip() if "Filipino:" in rest else ""
+    return english, filipino
+
+
+def _apply_tone(sentence: str, tone: str) -> str:
+    """Capitalize and end the sentence with the punctuation implied by the tone."""
+    sentence = sentence.strip()
+    if not sentence:
+        return sentence
+    sentence = sentence[0].upper() + sentence[1:]
+    if tone == "/question":
+        return sentence.rstrip(".!?") + "?"
+    if tone == "/exclamation":
+        return sentence.rstrip(".!?") + "!"
+    return sentence if sentence[-1] in ".!?" else sentence + "."
+
 
 class TranslationService:
     """
@@ -20,8 +91,57 @@ class TranslationService:
     with local rule-based fallback for reliability.
     """
     
-    def __init__(self):
-        """Initialize the translation service with Gemini API."""
+    def __init__(self, cache: Optional[TranslationCache] = None,
+                 breaker_failure_threshold: int = DEFAULT_BREAKER_FAILURE_THRESHOLD,
+                 breaker_recovery_timeout: float = DEFAULT_BREAKER_RECOVERY_TIMEOUT,
+                 hedge_budget_ms: float = 0.0,
+                 hedge_workers: int = DEFAULT_HEDGE_WORKERS,
+                 offline_translator: Optional[OfflineTranslator] = None,
+                 gemini_rpm: float = DEFAULT_GEMINI_RPM,
+                 gemini_max_prompt_batch: int = DEFAULT_MAX_PROMPT_BATCH):
+        """
+        Initialize the translation service with Gemini API.
+        
+        Args:
+            cache: Optional cache for Gemini translations (None = always call Gemini)
+            breaker_failure_threshold: Consecutive Gemini failures before the cloud path is skipped
+            breaker_recovery_timeout: Seconds to skip Gemini before probing it again
+            hedge_budget_ms: Hedged mode latency budget for Gemini (0 = hedging disabled)
+            hedge_workers: Threads for background Gemini calls in hedged mode
+            offline_translator: Optional T5 engine used instead of the local rules when offline
+            gemini_rpm: Gemini requests per minute; queued requests are batched into one prompt (0 = unlimited, no batching)
+            gemini_max_prompt_batch: Maximum gloss sequences packed into one Gemini prompt
+        """
+        self.cache = cache
+        self.offline = offline_translator
+        # Gloss tables for the local rules, compiled once per process
+        self.lexicon = load_lexicon()
+        
+        # Hedged mode: local rules run alongside Gemini; Gemini only wins within the budget
+        self.hedge_budget = max(0.0, hedge_budget_ms) / 1000.0
+        self._hedge_executor = None
+        if self.hedge_budget > 0:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="gemini-hedge")
+        # One slot per hedge thread: when all are busy, no Gemini call is queued behind them
+        self._hedge_slots = threading.BoundedSemaphore(max(1, hedge_workers))
+        self.hedge_cloud_wins = 0
+        self.hedge_local_wins = 0
+        self.late_cloud_results = 0  # Cloud answers that missed the budget but were cached
+        self.hedge_saturated = 0     # Requests answered locally because every hedge thread was busy
+        
+        # Offline answers given instead of Gemini, by reason
+        self.fallback_no_model = 0   # No API key configured
+        self.fallback_skipped = 0    # Breaker open, no quota or no time left before the deadline
+        self.fallback_failed = 0     # Gemini call failed
+        
+        # While Gemini is failing, go straight to the local rules
+        self.breaker = CircuitBreaker(
+            name="gemini",
+            failure_threshold=breaker_failure_threshold,
+            recovery_timeout=breaker_recovery_timeout,
+        )
+        # Identical requests in flight at the same time share one Gemini call
+        self.single_flight = SingleFlight()
         api_key = os.getenv("GOOGLE_API_KEY")
         if api_key:
             try:
@@ -36,62 +156,97 @@ class TranslationService:
         else:
             logger.warning("GOOGLE_API_KEY not found in environment. Using local fallback only.")
             self.model = None
+        
+        # Pace Gemini calls to the quota; requests that queue meanwhile share a prompt
+        self.dispatcher = None
+        if self.model and gemini_rpm > 0:
+            self.dispatcher = GeminiDispatcher(
+                single_call=self._call_gemini_once,
+                generate=self._generate_text,
+                rpm=gemini_rpm,
+                max_batch=gemini_max_prompt_batch,
+            )
+            logger.info(f"Gemini dispatcher: {gemini_rpm:g} RPM, up to {gemini_max_prompt_batch} sequences per prompt")
     
-    @retry(stop=stop_after_attempt(2), wait=wait_fixed(1))
-    def _call_gemini(self, glosses, tone):
+    def _call_gemini(self, glosses, tone, deadline: Optional[float] = None):
         """
-        Call Gemini 2.5 Flash API to translate glosses to both English and Filipino.
+        Call Gemini with retries, guarded by the circuit breaker and the caller's deadline.
         
         Args:
             glosses: List of gloss labels (e.g., ["EAT", "YOU"])
             tone: Tone tag (e.g., "/question", "/neutral")
+            deadline: Absolute time.monotonic() by which the caller needs an answer (None = no deadline)
             
         Returns:
             Tuple of (english_sentence, filipino_sentence)
             
         Raises:
-            Exception: If API call fails (will trigger retry)
+            CircuitOpenError: If the breaker is open
+            DeadlineExceededError: If too little time is left for an attempt
+            Exception: If the last attempt failed
         """
         if not self.model:
             raise Exception("No API Key configured")
         
-        # Construct prompt for FSL-to-bilingual translation
-        prompt = (
-            f"You are an FSL (Filipino Sign Language) interpreter. "
-            f"Translate the following glosses into natural sentences in BOTH English and Filipino. "
-            f"Use the provided facial tone for context. "
-            f"Output format must be exactly: 'English: [sentence] | Filipino: [sentence]'\n\n"
-            f"Glosses: {' '.join(glosses)}\n"
-            f"Tone: {tone}\n\n"
-            f"Output:"
+        def attempt_timeout() -> Optional[float]:
+            if deadline is None:
+                return None
+            return deadline - time.monotonic() - LOCAL_FALLBACK_RESERVE
+        
+        def should_stop(retry_state) -> bool:
+            if retry_state.attempt_number >= GEMINI_MAX_ATTEMPTS:
+                return True
+            # Stop early if the deadline leaves no room for the wait plus another attempt
+            remaining = attempt_timeout()
+            return remaining is not None and remaining < GEMINI_RETRY_WAIT + GEMINI_MIN_ATTEMPT_TIME
+        
+        # Breaker rejections and deadline checks are final - retrying them cannot help
+        retrying = Retrying(
+            stop=should_stop,
+            wait=wait_fixed(GEMINI_RETRY_WAIT),
+            retry=retry_if_exception(lambda e: not isinstance(e, (CircuitOpenError, DeadlineExceededError))),
+            reraise=True,
         )
+        for attempt in retrying:
+            with attempt:
+                timeout = attempt_timeout()
+                if timeout is not None and timeout < GEMINI_MIN_ATTEMPT_TIME:
+                    raise DeadlineExceededError(f"Only {max(timeout, 0.0):.2f}s left before the deadline")
+                if not self.breaker.allow_request():
+                    raise CircuitOpenError("Gemini circuit open")
+                try:
+                    if self.dispatcher is not None:
+                        result = self.dispatcher.translate(glosses, tone, timeout)
+                    else:
+                        result = self._call_gemini_once(glosses, tone, timeout)
+                except Exception as e:
+                    # A failed batched prompt raises the same exception in every caller; count it once
+                    if not getattr(e, "_breaker_counted", False):
+                        self.breaker.record_failure()
+                        e._breaker_counted = True
+                    raise
+                self.breaker.record_success()
+                return result
+    
+    def _call_gemini_once(self, glosses, tone, timeout: Optional[float] = None):
+        """
+        Call Gemini 2.5 Flash API to translate glosses to both English and Filipino.
         
-        try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            logger.info(f"Gemini translation successful: {response_text}")
-            
-            # Parse bilingual response
-            english_sentence = ""
-            filipino_sentence = ""
+        Args:
+            glosses: List of gloss labels (e.g., ["EAT", "YOU"])
+            tone: Tone tag (e.g., "/question", "/neutral")
+            timeout: Request timeout in seconds (None = client default)
             
-            if "English:" in response_text and "Filipino:" in response_text:
-                # Parse format: "English: [sentence] | Filipino: [sentence]"
-                parts = response_text.split("|")
-                for part in parts:
-                    part = part.strip()
-                    if part.startswith("English:"):
-                        english_sentence = part.replace("English:", "").strip()
-                    elif part.startswith("Filipino:"):
-                        filipino_sentence = part.replace("Filipino:", "").strip()
-            else:
-                # Fallback: if format doesn't match, use entire response as English
-                # and generate simple Filipino translation
-                english_sentence = response_text
-                filipino_sentence = self._simple_filipino_translation(glosses, tone)
-                logger.warning(f"Could not parse bilingual format, using fallback. Response: {response_text}")
+        Returns:
+            Tuple of (english_sentence, filipino_sentence)
             
-            return english_sentence, filipino_sentence
+        Raises:
+            Exception: If API call fails (may trigger a retry)
+        """
+        try:
+            response_text = self._generate_text(self._build_prompt(glosses, tone), timeout)
+            logger.info(f"Gemini translation successful: {response_text}")
+            return self._parse_response(response_text, glosses, tone)
         except Exception as e:
             # Log full error details including response if available
             error_details = f"Gemini API call failed: {type(e).__name__}: {str(e)}"
@@ -100,6 +255,65 @@ class TranslationService:
             logger.error(error_details)
             raise
     
+    @staticmethod
+    def _build_prompt(glosses, tone) -> str:
+        """Construct prompt for FSL-to-bilingual translation."""
+        return (
+            f"You are an FSL (Filipino Sign Language) interpreter. "
+            f"Translate the following glosses into natural sentences in BOTH English and Filipino. "
+            f"Use the provided facial tone for context. "
+            f"Output format must be exactly: 'English: [sentence] | Filipino: [sentence]'\n\n"
+            f"Glosses: {' '.join(glosses)}\n"
+            f"Tone: {tone}\n\n"
+            f"Output:"
+        )
+    
+    def _parse_response(self, response_text: str, glosses, tone):
+        """
+        Parse a complete Gemini response.
+        
+        Returns:
+            Tuple of (english_sentence, filipino_sentence)
+        """
+        english_sentence = ""
+        filipino_sentence = ""
+        
+        if "English:" in response_text and "Filipino:" in response_text:
+            # Parse format: "English: [sentence] | Filipino: [sentence]"
+            parts = response_text.split("|")
+            for part in parts:
+                part = part.strip()
+                if part.startswith("English:"):
+                    english_sentence = part.replace("English:", "").strip()
+                elif part.startswith("Filipino:"):
+                    filipino_sentence = part.replace("Filipino:", "").strip()
+        else:
+            # Fallback: if format doesn't match, use entire response as English
+            # and generate simple Filipino translation
+            english_sentence = response_text
+            filipino_sentence = self._simple_filipino_translation(glosses, tone)
+            logger.warning(f"Could not parse bilingual format, using fallback. Response: {response_text}")
+        
+        return english_sentence, filipino_sentence
+    
+    def _stream_text(self, prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        """Send a prompt to Gemini and yield the response text as it is generated."""
+        request_options = {"timeout": timeout} if timeout is not None else None
+        for chunk in self.model.generate_content(prompt, stream=True, request_options=request_options):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunk without text parts (e.g. only finish or safety metadata)
+                continue
+            if text:
+                yield text
+    
+    def _generate_text(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Send a prompt to Gemini and return the stripped response text."""
+        request_options = {"timeout": timeout} if timeout is not None else None
+        response = self.model.generate_content(prompt, request_options=request_options)
+        return response.text.strip()
+    
     def _simple_filipino_translation(self, glosses, tone):
         """
         Simple Filipino translation fallback when Gemini doesn't provide Filipino.
@@ -108,60 +322,11 @@ class TranslationService:
         if not glosses:
             return ""
         
-        # Simple word mapping (can be expanded)
-        word_map = {
-            "hello": "Kumusta",
-            "thank": "Salamat",
-            "you": "ikaw",
-            "yes": "oo",
-            "no": "hindi",
-            "please": "pakiusap",
-            "sorry": "pasensya",
-            "goodbye": "paalam",
-            "how": "paano",
-            "what": "ano",
-            "where": "saan",
-            "when": "kailan",
-            "why": "bakit",
-            "who": "sino",
-            "name": "pangalan",
-            "nice": "maganda",
-            "meet": "makilala",
-            "i": "ako",
-            "love": "mahal",
-            "friend": "kaibigan",
-            "family": "pamilya",
-            "home": "bahay",
-            "school": "paaralan",
-            "work": "trabaho",
-            "food": "pagkain",
-            "water": "tubig",
-            "help": "tulong",
-            "stop": "tigil",
-            "go": "pumunta",
-            "come": "dumating",
-            "see": "makita",
-            "hear": "marinig",
-            "know": "alam",
-            "think": "isip",
-            "feel": "pakiramdam",
-            "happy": "masaya",
-            "sad": "malungkot",
-            "angry": "galit",
-            "tired": "pagod"
-        }
-        
-        # Translate each gloss
-        filipino_words = []
-        for gloss in glosses:
-            gloss_lower = gloss.lower()
-            if gloss_lower in word_map:
-                filipino_words.append(word_map[gloss_lower])
-            else:
-                # Keep original if no mapping
-                filipino_words.append(gloss)
+        # Word-for-word (and known phrases) from the compiled lexicon; unknown glosses are kept
+        filipino_words = self.lexicon.to_filipino(glosses)
         
         filipino_text = " ".join(filipino_words)
+        filipino_text = filipino_text[:1].upper() + filipino_text[1:]
         
         # Apply tone
         if tone == "/question":
@@ -187,8 +352,8 @@ class TranslationService:
         if not glosses:
             return "", ""
         
-        # Convert glosses to lowercase for processing
-        text = " ".join(glosses).lower()
+        # English words from the lexicon (lower-cased glosses if unknown)
+        text = " ".join(self.lexicon.to_english(glosses))
         
         # Generate English sentence
         if tone == "/question":
@@ -207,26 +372,312 @@ class TranslationService:
         
         return english, filipino
     
-    def translate(self, glosses, tone):
+    def _call_offline(self, glosses, tone):
+        """
+        Offline translation: the T5 engine if loaded, otherwise the local rules.
+        
+        Returns:
+            Tuple of (english_sentence, filipino_sentence, source_string)
+        """
+        if self.offline is not None:
+            try:
+                # Both languages decode in the same batch
+                english, filipino = self.offline.translate_many([(glosses, "en"), (glosses, "fil")])
+                if english:
+                    return _apply_tone(english, tone), _apply_tone(filipino, tone), SOURCE_OFFLINE_MODEL
+            except Exception as e:
+                logger.warning(f"Offline T5 translation failed: {e}. Using local rules.")
+        english, filipino = self._call_local_rules(glosses, tone)
+        return english, filipino, SOURCE_LOCAL
+    
+    def translate(self, glosses, tone, deadline: Optional[float] = None):
         """
         Public method to translate glosses to both English and Filipino.
-        Tries Gemini first, falls back to local rules on failure.
+        Tries Gemini first, falls back to local rules on failure, while the
+        circuit breaker is open, or when the deadline leaves no time for Gemini.
         
         Args:
             glosses: List of gloss labels
             tone: Tone tag
+            deadline: Absolute time.monotonic() by which an answer is needed (None = no deadline)
             
         Returns:
             Tuple of (english_sentence, filipino_sentence, tone, source_string)
-            source_string is either "Cloud (Gemini)" or "Offline (Local)"
+            source_string is "Cloud (Gemini)", "Cloud (Gemini, Cached)", "Offline (Local)",
+            "Offline (T5)" when the offline model is loaded, and "..., Hedged)" variants
+            when hedged mode answered before Gemini
+        """
+        cached = self.lookup_cached(glosses, tone)
+        if cached is not None:
+            return cached
+        return self.translate_uncached(glosses, tone, deadline)
+    
+    def translate_stream(self, glosses, tone, deadline: Optional[float] = None):
         """
+        Progressive translation: an offline draft first, then Gemini's answer as it streams in.
+        
+        The draft comes from _call_offline and costs milliseconds. If Gemini can be used
+        (API key configured, breaker not open, rate limit and deadline allow a call),
+        the prompt is sent with streaming enabled and every change to the parsed text
+        is yielded as a refinement. The final item is Gemini's complete answer, or the
+        draft again if Gemini was skipped or failed. Cache hits yield only a final item.
+        
+        Args:
+            glosses: List of gloss labels
+            tone: Tone tag
+            deadline: Absolute time.monotonic() by which the final answer is needed (None = no deadline)
+            
+        Yields:
+            Tuples of (english_sentence, filipino_sentence, tone, source_string, final)
+        """
+        cached = self.lookup_cached(glosses, tone)
+        if cached is not None:
+            yield (*cached, True)
+            return
+        
+        draft_english, draft_filipino, draft_source = self._call_offline(glosses, tone)
+        draft = (draft_english, draft_filipino, tone, draft_source)
+        if not self.model:
+            self.fallback_no_model += 1
+            yield (*draft, True)
+            return
+        if self.breaker.state == OPEN:
+            self.fallback_skipped += 1
+            yield (*draft, True)
+            return
+        yield (*draft, False)
+        
+        def remaining() -> Optional[float]:
+            return None if deadline is None else deadline - time.monotonic() - LOCAL_FALLBACK_RESERVE
+        
+        # Same quota as every other Gemini call
+        if self.dispatcher is not None and not self.dispatcher.bucket.acquire(remaining()):
+            logger.info("Streaming translation: no Gemini quota before the deadline, keeping the draft")
+            self.fallback_skipped += 1
+            yield (*draft, True)
+            return
+        timeout = remaining()
+        if (timeout is not None and timeout < GEMINI_MIN_ATTEMPT_TIME) or not self.breaker.allow_request():
+            if self.dispatcher is not None:
+                self.dispatcher.bucket.refund()  # No call made with the token
+            self.fallback_skipped += 1
+            yield (*draft, True)
+            return
+        
+        text = ""
+        last_partial = None
+        succeeded = None  # Stays None if the caller closes the generator mid-stream
+        chunks = self._stream_text(self._build_prompt(glosses, tone), timeout)
+        try:
+            for chunk in chunks:
+                text += chunk
+                partial = _parse_partial_response(text)
+                if partial is not None and partial != last_partial:
+                    last_partial = partial
+                    # Keep the draft's Filipino until Gemini's starts arriving
+                    yield partial[0], partial[1] or draft_filipino, tone, SOURCE_CLOUD_PARTIAL, False
+            english, filipino = self._parse_response(text.strip(), glosses, tone)
+            succeeded = True
+        except Exception as e:
+            succeeded = False
+            self.breaker.record_failure()
+            self.fallback_failed += 1
+            logger.warning(f"Gemini streaming failed: {e}. Keeping the offline draft.")
+        finally:
+            chunks.close()
+            if succeeded is None:
+                # Abandoned (e.g. RPC cancelled): no verdict on Gemini, but free a half-open probe slot
+                self.breaker.release()
+        if not succeeded:
+            yield (*draft, True)
+            return
+        self.breaker.record_success()
+        logger.info(f"Gemini streaming translation complete: {text.strip()}")
+        
+        if self.cache is not None:
+            self.cache.put(glosses, tone, english, filipino)
+        yield english, filipino, tone, SOURCE_CLOUD, True
+    
+    def lookup_cached(self, glosses, tone):
+        """
+        Cache-only lookup (no Gemini call). May query the SQLite tier, so call it off the event loop.
+        
+        Returns:
+            Same tuple as translate(), or None on a miss or without a cache
+        """
+        if self.cache is None:
+            return None
+        cached = self.cache.get(glosses, tone)
+        if cached is None:
+            return None
+        return cached[0], cached[1], tone, SOURCE_CACHE
+    
+    def translate_offline(self, glosses, tone):
+        """
+        Translation that never calls Gemini: a cache hit, otherwise the offline path.
+        
+        Returns:
+            Same tuple as translate()
+        """
+        cached = self.lookup_cached(glosses, tone)
+        if cached is not None:
+            return cached
+        english, filipino, source = self._call_offline(glosses, tone)
+        return english, filipino, tone, source
+    
+    @property
+    def gemini_usable(self) -> bool:
+        """True when translate() would try Gemini (API key configured and breaker not open)."""
+        return bool(self.model) and self.breaker.state != OPEN
+    
+    def lookup_memory(self, glosses, tone):
+        """
+        Memory-tier cache lookup; never touches SQLite, so it is safe on the event loop.
+        
+        Returns:
+            Same tuple as translate(), or None if not in memory or without a cache
+        """
+        if self.cache is None:
+            return None
+        cached = self.cache.get_memory(glosses, tone)
+        if cached is None:
+            return None
+        return cached[0], cached[1], tone, SOURCE_CACHE
+    
+    def translate_uncached(self, glosses, tone, deadline: Optional[float] = None):
+        """
+        translate() without the cache lookup, for callers that already checked the cache.
+        Identical concurrent requests still share one Gemini call; a caller that joins
+        another's call waits only until its own deadline, then uses the offline fallback.
+        """
+        timeout = deadline - time.monotonic() - LOCAL_FALLBACK_RESERVE if deadline is not None else None
+        try:
+            (english, filipino, source), shared = self.single_flight.do(
+                make_key(glosses, tone), self._translate_uncached, glosses, tone, deadline, timeout=timeout
+            )
+        except FutureTimeoutError:
+            # Only followers time out: the shared call outlives this caller's deadline
+            self.fallback_skipped += 1
+            logger.info(f"Coalesced translation of {' '.join(glosses)} not done before the deadline. "
+                        f"Using offline fallback.")
+            english, filipino, source = self._call_offline(glosses, tone)
+            return english, filipino, tone, source
+        if shared:
+            logger.info(f"Coalesced translation of {' '.join(glosses)} with an in-flight request "
+                        f"({self.single_flight.coalesced} calls saved)")
+        return english, filipino, tone, source
+    
+    def _translate_uncached(self, glosses, tone, deadline: Optional[float] = None):
+        """
+        Gemini with local fallback; runs once per set of identical concurrent requests
+        (under the first caller's deadline).
+        
+        Returns:
+            Tuple of (english_sentence, filipino_sentence, source_string)
+        """
+        if self._hedge_executor is not None and self.model and self.breaker.state != OPEN:
+            return self._translate_hedged(glosses, tone, deadline)
+        
         try:
             # Try Cloud first
-            english, filipino = self._call_gemini(glosses, tone)
-            return english, filipino, tone, "Cloud (Gemini)"
+            english, filipino = self._call_gemini(glosses, tone, deadline)
+        except (CircuitOpenError, DeadlineExceededError) as e:
+            # Cloud path skipped without waiting
+            self.fallback_skipped += 1
+            logger.info(f"Skipping Gemini: {e}. Using offline fallback.")
+            return self._call_offline(glosses, tone)
         except (RetryError, Exception) as e:
             # Fallback to Local on any failure
-            logger.warning(f"Gemini failed: {e}. Switching to Local fallback.")
-            english, filipino = self._call_local_rules(glosses, tone)
-            return english, filipino, tone, "Offline (Local)"
+            if self.model:
+                self.fallback_failed += 1
+            else:
+                self.fallback_no_model += 1
+            logger.warning(f"Gemini failed: {e}. Switching to offline fallback.")
+            return self._call_offline(glosses, tone)
+        
+        # Only cloud results are cached: local rules are cheap, and caching them
+        # would keep serving the offline sentence after Gemini recovers
+        if self.cache is not None:
+            self.cache.put(glosses, tone, english, filipino)
+        return english, filipino, SOURCE_CLOUD
+    
+    def _translate_hedged(self, glosses, tone, deadline: Optional[float] = None):
+        """
+        Hedged translation: start Gemini in the background, compute the offline
+        translation meanwhile, and return Gemini's answer only if it arrives within the budget.
+        
+        A Gemini answer that misses the budget still lands in the cache, so the
+        next request for the same phrase gets the cloud translation. The budget is
+        counted from the start of the call, offline decoding included. When every
+        hedge thread is busy, Gemini is not called and the offline answer is returned.
+        
+        Returns:
+            Tuple of (english_sentence, filipino_sentence, source_string)
+        """
+        budget = self.hedge_budget
+        if deadline is not None:
+            budget = min(budget, deadline - time.monotonic() - LOCAL_FALLBACK_RESERVE)
+        cutoff = time.monotonic() + budget
+        
+        if not self._hedge_slots.acquire(blocking=False):
+            self.hedge_saturated += 1
+            return self._call_offline(glosses, tone)
+        try:
+            cloud = self._hedge_executor.submit(self._call_gemini, glosses, tone)
+        except RuntimeError:  # Executor shut down
+            self._hedge_slots.release()
+            return self._call_offline(glosses, tone)
+        cloud.add_done_callback(lambda _: self._hedge_slots.release())
+        local_english, local_filipino, local_source = self._call_offline(glosses, tone)
+        
+        try:
+            english, filipino = cloud.result(timeout=max(0.0, cutoff - time.monotonic()))
+        except FutureTimeoutError:
+            self.hedge_local_wins += 1
+            logger.info(f"Gemini missed the {budget * 1000:.0f} ms budget - returning local translation")
+            cloud.add_done_callback(lambda future: self._store_late_result(future, glosses, tone))
+            return local_english, local_filipino, HEDGED_SOURCES[local_source]
+        except Exception as e:
+            self.fallback_failed += 1
+            logger.warning(f"Gemini failed: {e}. Using offline fallback.")
+            return local_english, local_filipino, local_source
+        
+        self.hedge_cloud_wins += 1
+        if self.cache is not None:
+            self.cache.put(glosses, tone, english, filipino)
+        return english, filipino, SOURCE_CLOUD
+    
+    def _store_late_result(self, future, glosses, tone):
+        """Done-callback for Gemini calls that lost the hedge: cache the answer for next time."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.late_cloud_results += 1
+        if self.cache is not None:
+            english, filipino = future.result()
+            self.cache.put(glosses, tone, english, filipino)
+    
+    def hedge_stats(self) -> dict:
+        """Hedged mode counters for logging and monitoring."""
+        return {
+            "budget_ms": round(self.hedge_budget * 1000, 1),
+            "cloud_wins": self.hedge_cloud_wins,
+            "local_wins": self.hedge_local_wins,
+            "late_cloud_results": self.late_cloud_results,
+            "saturated": self.hedge_saturated,
+        }
+    
+    def fallback_stats(self) -> dict:
+        """Offline fallbacks by reason (hedged local wins are in hedge_stats())."""
+        return {
+            "no_model": self.fallback_no_model,
+            "skipped": self.fallback_skipped,
+            "failed": self.fallback_failed,
+        }
+    
+    def close(self):
+        """Stop background Gemini calls that have not started yet."""
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
 